@@ -0,0 +1,138 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dotenv import load_dotenv
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.insert(0, os.getcwd())
+load_dotenv(dotenv_path="../.env")
+
+from embedding_store import job_texts, normalize_embeddings
+from encoders import ENCODER_BACKENDS, create_embedding_model
+from extraction import extract_texts
+from job_matcher import iter_jobs_file, chunk_text
+from pipeline import list_pdf_files
+from vector_index import ExactIndex
+
+
+def peak_memory_mb():
+    """
+    Return the peak resident memory of this process in MB (Unix only).
+
+    Returns:
+    - float or None: The peak memory, or None where it cannot be measured.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def pooled_embeddings(model, cv_texts, batch_size):
+    """
+    Embed CVs like the embedding matching mode: encode the chunks of each CV and mean-pool them.
+    """
+    chunks = [chunk_text(cv_text) for cv_text in cv_texts]
+    chunk_embeddings = normalize_embeddings(
+        model.encode([chunk for cv_chunks in chunks for chunk in cv_chunks], batch_size=batch_size)
+    )
+    bounds = np.cumsum([0] + [len(cv_chunks) for cv_chunks in chunks])
+    return normalize_embeddings(
+        np.stack([chunk_embeddings[start:end].mean(axis=0) for start, end in zip(bounds[:-1], bounds[1:])])
+    )
+
+
+def run_backend(model_name, backend, jobs, cv_texts, k, batch_size, latency_queries):
+    """
+    Measure one backend in a fresh process: load time, memory, throughput on the job catalog, latency of
+    single queries and the top-K jobs found for each CV.
+
+    Returns:
+    - dict: The measurements, the job embeddings and the top-K rows of each CV.
+    """
+    memory_before = peak_memory_mb()
+    start = time.perf_counter()
+    model = create_embedding_model(model_name, backend)
+    model.encode(["warm-up"])
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    job_embeddings = normalize_embeddings(model.encode(jobs, batch_size=batch_size))
+    throughput = len(jobs) / (time.perf_counter() - start)
+
+    latencies = []
+    for query in jobs[:latency_queries]:
+        start = time.perf_counter()
+        model.encode([query])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    matches = ExactIndex(job_embeddings).search(pooled_embeddings(model, cv_texts, batch_size), k)
+    memory_after = peak_memory_mb()
+    return {
+        "load": load_seconds,
+        "throughput": throughput,
+        "latency": float(np.mean(latencies)),
+        "latency_p95": float(np.percentile(latencies, 95)),
+        "memory": memory_after - memory_before if memory_after is not None else None,
+        "embeddings": job_embeddings,
+        "rows": [[row for row, _ in cv_matches] for cv_matches in matches],
+    }
+
+
+def agreement(rows, baseline_rows):
+    """
+    Compare the jobs found for each CV with the ones found by the float baseline.
+
+    Returns:
+    - tuple: The fraction of CVs with the same best job and the mean top-K overlap.
+    """
+    top1 = np.mean([a[0] == b[0] for a, b in zip(rows, baseline_rows)])
+    topk = np.mean([len(set(a) & set(b)) / len(b) for a, b in zip(rows, baseline_rows)])
+    return float(top1), float(topk)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the encoder backends on the bundled data.")
+    parser.add_argument("--backends", nargs="+", default=list(ENCODER_BACKENDS), choices=ENCODER_BACKENDS)
+    parser.add_argument("-k", type=int, default=5, help="Number of jobs compared per CV.")
+    parser.add_argument("--cvs", type=int, default=20, help="Number of CVs used as queries.")
+    parser.add_argument("--latency-queries", type=int, default=50, help="Single-text queries timed per backend.")
+    parser.add_argument("--batch-size", type=int, default=int(os.getenv("EMBEDDINGS_BATCH_SIZE", 32)))
+    args = parser.parse_args()
+
+    model_name = os.getenv("MODEL_EMBEDDINGS")
+    column_names = json.loads(os.getenv("COLUMNS_EXCEL_EMBEDDINGS"))
+    jobs = [text for jobs_df in iter_jobs_file(os.getenv("PATH_EXCEL_DATASET")) for text in job_texts(jobs_df, column_names)]
+    input_directory = os.getenv("PATH_FOLDER_PDFS")
+    pdf_paths = [os.path.join(input_directory, file_name) for file_name in list_pdf_files(input_directory)][:args.cvs]
+    cv_texts = [text for _, text, error in sorted(extract_texts(pdf_paths)) if error is None]
+    print(f"Model: {model_name}, jobs: {len(jobs)}, CVs: {len(cv_texts)}")
+
+    results = {}
+    for backend in args.backends:
+        # Each backend runs in its own process so that load time and memory are measured from scratch.
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results[backend] = executor.submit(
+                run_backend, model_name, backend, jobs, cv_texts, args.k, args.batch_size, args.latency_queries
+            ).result()
+
+    baseline = results.get("torch") or results[args.backends[0]]
+    print(f"{'backend':>10} {'load s':>7} {'rows/s':>8} {'ms/query':>9} {'p95 ms':>7} {'mem MB':>7} "
+          f"{'cosine':>7} {'top-1':>6} {f'top-{args.k}':>6}")
+    for backend, result in results.items():
+        cosine = float(np.mean(np.sum(result["embeddings"] * baseline["embeddings"], axis=1)))
+        top1, topk = agreement(result["rows"], baseline["rows"])
+        memory = f"{result['memory']:7.0f}" if result["memory"] is not None else f"{'-':>7}"
+        print(f"{backend:>10} {result['load']:7.2f} {result['throughput']:8.1f} {result['latency']:9.2f} "
+              f"{result['latency_p95']:7.2f} {memory} {cosine:7.4f} {top1:6.1%} {topk:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
+from dotenv import load_dotenv
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.insert(0, os.getcwd())
+load_dotenv(dotenv_path="../.env")
+
+from embedding_store import job_texts
+from job_matcher import iter_jobs_file
+from parallel_encoding import EncoderPool, available_cores
+
+
+def sample_texts(jobs_file, column_names, sample_size):
+    """
+    Build a fixed sample of job texts, repeating the catalog if it has fewer rows than the sample.
+
+    Parameters:
+    - jobs_file (str): Path to the jobs file.
+    - column_names (list): Columns concatenated to build the texts.
+    - sample_size (int): Number of texts.
+
+    Returns:
+    - list: The texts.
+    """
+    texts = []
+    for jobs_df in iter_jobs_file(jobs_file):
+        texts.extend(job_texts(jobs_df, column_names))
+        if len(texts) >= sample_size:
+            break
+    return [texts[row % len(texts)] for row in range(sample_size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how embedding encoding scales with worker processes.")
+    parser.add_argument("--sample", type=int, default=1024, help="Number of postings encoded per run.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Worker counts to compare.")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="Torch threads per worker (the cores divided among the workers by default).")
+    parser.add_argument("--batch-size", type=int, default=int(os.getenv("EMBEDDINGS_BATCH_SIZE", 32)))
+    args = parser.parse_args()
+
+    model_name = os.getenv("MODEL_EMBEDDINGS")
+    texts = sample_texts(os.getenv("PATH_EXCEL_DATASET"), json.loads(os.getenv("COLUMNS_EXCEL_EMBEDDINGS")),
+                         args.sample)
+    print(f"Model: {model_name}, postings: {len(texts)}, cores: {available_cores()}")
+
+    print(f"{'workers':>8} {'threads':>8} {'seconds':>9} {'rows/s':>9} {'speedup':>8} {'max diff':>9}")
+    baseline_seconds = None
+    reference = None
+    for workers in args.workers:
+        with EncoderPool(model_name, workers, args.threads, args.batch_size) as pool:
+            # Model loading happens once per worker at startup and is not part of the measurement.
+            pool.start()
+            start = time.perf_counter()
+            embeddings = pool.encode(texts)
+            seconds = time.perf_counter() - start
+        if reference is None:
+            reference = embeddings
+            baseline_seconds = seconds
+        max_diff = float(np.abs(embeddings - reference).max())
+        print(f"{workers:>8} {pool.threads_per_worker:>8} {seconds:9.2f} {len(texts) / seconds:9.1f} "
+              f"{baseline_seconds / seconds:8.2f} {max_diff:9.2e}")
+
+
+if __name__ == "__main__":
+    main()
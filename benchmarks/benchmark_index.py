@@ -0,0 +1,123 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+from dotenv import load_dotenv
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.insert(0, os.getcwd())
+load_dotenv(dotenv_path="../.env")
+
+from embedding_store import normalize_embeddings
+from pipeline import load_job_matcher
+from vector_index import ExactIndex, IVFIndex
+from benchmark_lexical import sample_queries
+
+SPREAD = 3.5
+
+
+def synthetic_embeddings(n_rows, dimension, n_clusters, spread, seed):
+    """
+    Generate clustered normalized embeddings that look like a job catalog with many similar postings.
+    The clusters of text embeddings are not well separated, so by default the noise of each posting is large
+    enough for neighbouring clusters to overlap: with well separated clusters, probing a single partition
+    finds nearly every neighbour and the benchmark cannot tell n_probe values apart.
+
+    Parameters:
+    - n_rows (int): Number of embeddings.
+    - dimension (int): Size of each embedding.
+    - n_clusters (int): Number of clusters.
+    - spread (float): Standard deviation of the noise of each posting, relative to that of the cluster centers.
+    - seed (int): Seed of the random generator.
+
+    Returns:
+    - numpy array: The normalized float32 embeddings.
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dimension)).astype(np.float32)
+    labels = rng.integers(0, n_clusters, n_rows)
+    return normalize_embeddings(centers[labels] + spread * rng.standard_normal((n_rows, dimension)).astype(np.float32))
+
+
+def benchmark_data(args):
+    """
+    Build the catalog and the queries. On the embedding store, the queries are predicted-job-like texts
+    ("title, skill, skill, ...") built from random postings and encoded with the model, as in interactive
+    matching. On synthetic embeddings, the queries are held-out postings drawn from the same clusters, which
+    are not in the catalog.
+
+    Returns:
+    - tuple: The job embeddings and the normalized query embeddings.
+    """
+    if args.rows:
+        embeddings = synthetic_embeddings(
+            args.rows + args.queries, args.dimension, max(10, args.rows // 200), args.spread, args.seed
+        )
+        return embeddings[:args.rows], embeddings[args.rows:]
+    job_matcher = load_job_matcher()
+    queries, _ = sample_queries(job_matcher.jobs_df, args.queries, args.seed)
+    return job_matcher.embeddings, job_matcher.encode(queries)
+
+
+def recall_at_k(approximate, exact):
+    """
+    Compute the fraction of the exact top-K jobs that the approximate search also returned.
+
+    Parameters:
+    - approximate (list): For each query, the (row, score) tuples of the approximate search.
+    - exact (list): For each query, the (row, score) tuples of the exact search.
+
+    Returns:
+    - float: The mean recall@K over the queries.
+    """
+    hits = [len({row for row, _ in a} & {row for row, _ in e}) / max(1, len(e)) for a, e in zip(approximate, exact)]
+    return float(np.mean(hits))
+
+
+def timed_search(index, queries, k):
+    """
+    Search the queries one at a time, like interactive matching does.
+
+    Returns:
+    - tuple: The results and the mean latency per query in milliseconds.
+    """
+    start = time.perf_counter()
+    results = [index.search(query[np.newaxis], k)[0] for query in queries]
+    return results, (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall@K and latency of the IVF index against exact search.")
+    parser.add_argument("--rows", type=int, default=0,
+                        help="Number of synthetic embeddings; 0 uses the embedding store in PATH_EMBEDDINGS.")
+    parser.add_argument("--dimension", type=int, default=768)
+    parser.add_argument("--spread", type=float, default=SPREAD,
+                        help="Noise of the synthetic postings relative to their cluster centers; lower separates them more.")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--n-lists", type=int, nargs="+", default=[None],
+                        help="Numbers of partitions compared; the square root of the number of jobs by default.")
+    parser.add_argument("--n-probe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    embeddings, queries = benchmark_data(args)
+    exact, exact_latency = timed_search(ExactIndex(embeddings), queries, args.k)
+    print(f"Jobs: {len(embeddings)}  Queries: {len(queries)}  K: {args.k}")
+    print(f"{'backend':<22}{'recall@K':>10}{'ms/query':>12}{'speedup':>10}")
+    print(f"{'exact':<22}{1.0:>10.3f}{exact_latency:>12.3f}{1.0:>10.2f}")
+
+    for n_lists in args.n_lists:
+        start = time.perf_counter()
+        index = IVFIndex(embeddings, n_lists).build(seed=args.seed)
+        print(f"IVF build: {index.n_lists} lists in {time.perf_counter() - start:.2f} s")
+        for n_probe in args.n_probe:
+            index.n_probe = n_probe
+            results, latency = timed_search(index, queries, args.k)
+            label = f"ivf (n_probe={n_probe})"
+            print(f"{label:<22}{recall_at_k(results, exact):>10.3f}{latency:>12.3f}{exact_latency / latency:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+from dotenv import load_dotenv
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.insert(0, os.getcwd())
+load_dotenv(dotenv_path="../.env")
+
+from embedding_store import normalize_embeddings
+from lexical_index import LEXICAL_MODES, LexicalIndex, lexical_texts
+from pipeline import load_job_matcher
+from vector_index import load_or_build_index
+
+
+def sample_queries(jobs_df, n_queries, seed):
+    """
+    Build queries that look like the predicted jobs of `analyze_cv` ("title, skill, skill, ...") from random
+    postings, dropping one of the skills when there are several so that queries are not copies of a posting.
+
+    Parameters:
+    - jobs_df (pandas DataFrame): The job offers.
+    - n_queries (int): Number of queries.
+    - seed (int): Seed of the random generator.
+
+    Returns:
+    - tuple: The query texts and the row each query was built from.
+    """
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(jobs_df), min(n_queries, len(jobs_df)), replace=False)
+    queries = []
+    for row in rows:
+        skills = [skill.strip() for skill in str(jobs_df["Required Skills"].iloc[row]).split(",") if skill.strip()]
+        if len(skills) > 1:
+            skills.pop(rng.integers(len(skills)))
+        queries.append(", ".join([str(jobs_df["Job Title"].iloc[row]), *skills]))
+    return queries, rows
+
+
+def quality(results, relevant):
+    """
+    Score the jobs found for each query, counting as relevant the postings with the same title as the source.
+
+    Parameters:
+    - results (list): For each query, the (row, score) tuples found, best first.
+    - relevant (list): For each query, the set of relevant rows.
+
+    Returns:
+    - dict: Hit rate of the best job ("hit@1"), precision of the top K ("p@K") and mean reciprocal rank ("mrr").
+    """
+    hits, precisions, reciprocal_ranks = [], [], []
+    for matches, rows in zip(results, relevant):
+        found = [row in rows for row, _ in matches]
+        hits.append(found[0] if found else False)
+        precisions.append(sum(found) / max(1, len(found)))
+        reciprocal_ranks.append(next((1 / rank for rank, hit in enumerate(found, start=1) if hit), 0.0))
+    return {"hit@1": float(np.mean(hits)), "p@K": float(np.mean(precisions)), "mrr": float(np.mean(reciprocal_ranks))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency and quality of lexical pruning and fusion against dense search.")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--scale", type=int, default=1,
+                        help="Replicate the catalog this many times (with noisy embeddings) to measure large catalogs.")
+    parser.add_argument("--candidates", type=int, nargs="+", default=[100, 1000],
+                        help="LEXICAL_CANDIDATES values compared for pruning and fusion.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    job_matcher = load_job_matcher()
+    jobs_df = job_matcher.jobs_df
+    queries, source_rows = sample_queries(jobs_df, args.queries, args.seed)
+    query_embeddings = job_matcher.encode(queries)
+
+    if args.scale > 1:
+        rng = np.random.default_rng(args.seed + 1)
+        embeddings = np.asarray(job_matcher.embeddings, dtype=np.float32)
+        job_matcher.embeddings = normalize_embeddings(
+            np.tile(embeddings, (args.scale, 1)) + 0.02 * rng.standard_normal(
+                (len(embeddings) * args.scale, embeddings.shape[1])).astype(np.float32)
+        )
+        job_matcher.jobs_df = jobs_df.iloc[np.tile(np.arange(len(jobs_df)), args.scale)].reset_index(drop=True)
+        job_matcher.index = load_or_build_index(job_matcher.embeddings, os.getenv("INDEX_BACKEND", "exact"),
+                                                n_probe=int(os.getenv("IVF_N_PROBE", 8)))
+    titles = job_matcher.jobs_df["Job Title"].astype(str).str.lower().to_numpy()
+    relevant = [set(np.flatnonzero(titles == titles[row]).tolist()) for row in source_rows]
+
+    start = time.perf_counter()
+    job_matcher.lexical_index = LexicalIndex().build(lexical_texts(job_matcher.jobs_df))
+    print(f"Jobs: {len(job_matcher.jobs_df)}  Queries: {len(queries)}  K: {args.k}  "
+          f"Terms: {len(job_matcher.lexical_index.terms)}  Lexical index build: {time.perf_counter() - start:.2f} s")
+
+    print(f"{'search':<22}{'ms/query':>10}{'speedup':>9}{'hit@1':>8}{'p@K':>8}{'mrr':>8}")
+    dense_latency = None
+    runs = [("off", None)] + [(mode, n) for mode in LEXICAL_MODES[1:] for n in args.candidates]
+    for mode, candidates in runs:
+        job_matcher.lexical_mode = mode
+        job_matcher.lexical_candidates = candidates or 0
+        lexical_index = job_matcher.lexical_index
+        if mode == "off":
+            job_matcher.lexical_index = None
+        start = time.perf_counter()
+        # One query at a time, like interactive matching.
+        results = [job_matcher.retrieve([query], query_embeddings[i:i + 1], args.k)[0] for i, query in enumerate(queries)]
+        latency = (time.perf_counter() - start) * 1000 / len(queries)
+        job_matcher.lexical_index = lexical_index
+        dense_latency = dense_latency or latency
+        scores = quality(results, relevant)
+        label = "dense" if mode == "off" else f"{mode} ({candidates})"
+        print(f"{label:<22}{latency:>10.3f}{dense_latency / latency:>9.2f}"
+              f"{scores['hit@1']:>8.3f}{scores['p@K']:>8.3f}{scores['mrr']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+from dotenv import load_dotenv
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.insert(0, os.getcwd())
+load_dotenv(dotenv_path="../.env")
+
+from extraction import extract_texts
+from job_matcher import analyze_cv
+from pipeline import load_job_matcher, list_pdf_files
+
+
+def timed(function, *args):
+    """
+    Call a function and measure its wall time.
+
+    Returns:
+    - tuple: The result and the elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def agreement(llm_matches, embedding_matches):
+    """
+    Compare the jobs found by the two matching modes.
+
+    Parameters:
+    - llm_matches (list): For each CV, the (row, score) tuples found by searching with the predicted job.
+    - embedding_matches (list): For each CV, the (row, score) tuples found by searching with the CV embedding.
+
+    Returns:
+    - dict: The fraction of CVs with the same best job ("top1") and the mean overlap of the top-K jobs ("topk").
+    """
+    top1 = [a[0][0] == b[0][0] for a, b in zip(llm_matches, embedding_matches) if a and b]
+    topk = [len({row for row, _ in a} & {row for row, _ in b}) / max(1, len(a))
+            for a, b in zip(llm_matches, embedding_matches)]
+    return {"top1": float(np.mean(top1)) if top1 else 0.0, "topk": float(np.mean(topk)) if topk else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the llm and embedding matching modes on a folder of CVs.")
+    parser.add_argument("--input", default=None, help="Folder containing the PDF CVs (PATH_FOLDER_PDFS).")
+    parser.add_argument("--limit", type=int, default=20, help="Number of CVs to match.")
+    parser.add_argument("-k", type=int, default=5, help="Number of jobs compared per CV.")
+    args = parser.parse_args()
+
+    input_directory = args.input or os.getenv("PATH_FOLDER_PDFS")
+    pdf_paths = [os.path.join(input_directory, file_name) for file_name in list_pdf_files(input_directory)]
+    pdf_paths = pdf_paths[:args.limit]
+    texts = {pdf_path: text for pdf_path, text, error in extract_texts(pdf_paths) if error is None}
+    cv_texts = [texts[pdf_path] for pdf_path in pdf_paths if pdf_path in texts]
+    print(f"CVs: {len(cv_texts)}")
+
+    job_matcher = load_job_matcher()
+
+    # Embedding mode: one batched local encode of the CV chunks and one search, no API call.
+    embedding_matches, embedding_time = timed(job_matcher.top_k_cvs, cv_texts, args.k)
+
+    # LLM mode: one JSON-mode API call per CV (summary and predicted job) before the search.
+    def llm_top_k():
+        predicted_jobs = [analyze_cv(cv_text)["predicted_job"] for cv_text in cv_texts]
+        return job_matcher.top_k_batch(predicted_jobs, args.k)
+    llm_matches, llm_time = timed(llm_top_k)
+
+    print(f"{'mode':>10} {'total s':>9} {'ms/CV':>9} {'CVs/s':>9} {'API calls':>10}")
+    for mode, elapsed, calls in (("llm", llm_time, len(cv_texts)), ("embedding", embedding_time, 0)):
+        print(f"{mode:>10} {elapsed:9.2f} {elapsed * 1000 / max(1, len(cv_texts)):9.1f} "
+              f"{len(cv_texts) / max(elapsed, 1e-9):9.2f} {calls:>10}")
+
+    scores = agreement(llm_matches, embedding_matches)
+    print(f"Same best job: {scores['top1']:.1%}, top-{args.k} overlap: {scores['topk']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
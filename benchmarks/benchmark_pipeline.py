@@ -0,0 +1,336 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+from dotenv import load_dotenv
+
+INITIAL_DIRECTORY = os.getcwd()
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.insert(0, os.getcwd())
+load_dotenv(dotenv_path="../.env")
+
+from fake_gemini_server import FakeGeminiServer
+from synthetic_data import generate_jobs, generate_cv_pdfs
+from embedding_store import sync_embeddings
+from encoders import embedding_model_id, get_encoder_backend, load_embedding_model
+from job_matcher import JobMatcher, predict_job, generate_opinion_details
+from pdf import extract_text_from_pdf, summarize_text
+from pipeline import run_batch, write_report, report_column_widths
+
+MIN_REGRESSION_SECONDS = 0.05
+# No baseline is shipped: timings depend on the machine and the model, so each machine records its own.
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pipeline_baseline.json")
+# Settings of the environment that change the timings, recorded with the results.
+RECORDED_SETTINGS = (
+    "MODEL_EMBEDDINGS", "EMBEDDINGS_BACKEND", "EMBEDDINGS_DTYPE", "EMBEDDINGS_BATCH_SIZE", "INDEX_BACKEND",
+    "IVF_N_PROBE", "LEXICAL_SEARCH", "LEXICAL_CANDIDATES", "BATCH_WORKERS", "PDF_WORKERS", "PDF_MAX_PAGES"
+)
+
+
+def stage_stats(durations, items=None):
+    """
+    Summarize the timings of a stage.
+
+    Parameters:
+    - durations (list): The duration of each call, in seconds.
+    - items (int or None): Number of items processed, when the stage is a single call over many items;
+      one item per call by default.
+
+    Returns:
+    - dict: The number of items, the total seconds, the mean milliseconds per item and the items per
+      second, plus the median and 95th percentile milliseconds per call for stages timed call by call.
+    """
+    seconds = float(sum(durations))
+    stats = {"items": items or len(durations), "seconds": seconds}
+    stats["mean_ms"] = seconds * 1000 / max(1, stats["items"])
+    stats["per_second"] = stats["items"] / seconds if seconds > 0 else None
+    if items is None and durations:
+        stats["p50_ms"] = float(np.percentile(durations, 50) * 1000)
+        stats["p95_ms"] = float(np.percentile(durations, 95) * 1000)
+    return stats
+
+
+def time_calls(function, arguments):
+    """
+    Call a function once per argument, measuring each call.
+
+    Returns:
+    - tuple: The results and the duration of each call in seconds.
+    """
+    results, durations = [], []
+    for argument in arguments:
+        start = time.perf_counter()
+        results.append(function(argument))
+        durations.append(time.perf_counter() - start)
+    return results, durations
+
+
+def timed(function, *args, **kwargs):
+    """
+    Call a function and measure its wall time.
+
+    Returns:
+    - tuple: The result and the elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def random_encoder(dimension, seed=0):
+    """
+    Encoder returning random embeddings, to build large catalogs without paying for the model.
+    """
+    rng = np.random.default_rng(seed)
+    return lambda texts: rng.standard_normal((len(texts), dimension)).astype(np.float32)
+
+
+def build_catalog(rows, embeddings_file, encode_catalog, seed):
+    """
+    Build the embedding store of a synthetic catalog, streaming the generated rows.
+
+    Parameters:
+    - rows (int): Number of job offers.
+    - embeddings_file (str): Path of the embedding store.
+    - encode_catalog (bool): Whether to encode the offers with the embedding model, or use random embeddings
+      of the model dimension.
+    - seed (int): Seed of the generator.
+
+    Returns:
+    - numpy memmap: The embeddings.
+    """
+    model_name = os.getenv("MODEL_EMBEDDINGS")
+    backend = get_encoder_backend()
+    model = load_embedding_model(model_name, backend)
+    batch_size = int(os.getenv("EMBEDDINGS_BATCH_SIZE", 32))
+    chunk_rows = int(os.getenv("EMBEDDINGS_CHUNK_ROWS", 4096))
+    if encode_catalog:
+        model_id = embedding_model_id(model_name, backend)
+        encode = lambda texts: model.encode(texts, batch_size=batch_size)
+    else:
+        dimension = np.asarray(model.encode(["dimension"])).shape[1]
+        model_id = f"random-{dimension}"
+        encode = random_encoder(dimension, seed)
+    embeddings, _ = sync_embeddings(
+        generate_jobs(rows, seed, chunk_rows), embeddings_file, model_id,
+        json.loads(os.getenv("COLUMNS_EXCEL_EMBEDDINGS")), encode, f"synthetic-{rows}-{seed}",
+        os.getenv("EMBEDDINGS_DTYPE", "float32"), chunk_rows
+    )
+    return embeddings
+
+
+def run_stages(args, work_dir, server):
+    """
+    Time each stage of the pipeline on a synthetic catalog and synthetic CVs.
+
+    Returns:
+    - dict: The statistics of each stage, see stage_stats, in pipeline order.
+    """
+    stages = {}
+    embeddings_file = os.path.join(work_dir, "job_embeddings.npy")
+    embeddings, seconds = timed(build_catalog, args.jobs, embeddings_file, args.encode_catalog, args.seed)
+    stages["catalog_build"] = stage_stats([seconds], args.jobs)
+    job_matcher, seconds = timed(JobMatcher, None, embeddings, embeddings_file)
+    stages["matcher_load"] = stage_stats([seconds])
+
+    pdf_directory = os.path.join(work_dir, "cvs")
+    pdf_paths = generate_cv_pdfs(pdf_directory, args.cvs, args.pages, args.seed)
+    cv_texts, durations = time_calls(extract_text_from_pdf, pdf_paths)
+    stages["extract_text_from_pdf"] = stage_stats(durations)
+    summaries, durations = time_calls(summarize_text, cv_texts)
+    stages["summarize_text"] = stage_stats(durations)
+    predicted_jobs, durations = time_calls(predict_job, summaries)
+    stages["predict_job"] = stage_stats(durations)
+
+    query_embeddings, seconds = timed(job_matcher.encode, predicted_jobs)
+    stages["encode"] = stage_stats([seconds], len(predicted_jobs))
+    matches, seconds = timed(job_matcher.retrieve, predicted_jobs, query_embeddings, args.k)
+    stages["similarity"] = stage_stats([seconds], len(predicted_jobs))
+
+    best_jobs = [
+        "\n".join(f"{col}: {job_matcher.jobs_df.iloc[rows[0][0]][col]}" for col in job_matcher.opinion_columns)
+        for rows in matches
+    ]
+    opinions, durations = time_calls(lambda pair: generate_opinion_details(*pair), list(zip(summaries, best_jobs)))
+    stages["generate_opinion_details"] = stage_stats(durations)
+
+    report_rows = [
+        (f"cv_{row + 1}.pdf", 40 + row % 40, f"{best_jobs[row % len(best_jobs)]}\n\n{opinions[row % len(opinions)]}")
+        for row in range(args.report_rows)
+    ]
+    _, seconds = timed(
+        write_report, report_rows, os.path.join(work_dir, "report.xlsx"), report_column_widths(report_rows)
+    )
+    stages["write_report"] = stage_stats([seconds], len(report_rows))
+
+    if not args.skip_batch:
+        requests_before = server.stats["requests"]
+        report, seconds = timed(
+            run_batch, job_matcher, pdf_directory, os.path.join(work_dir, "batch.xlsx"), workers=args.workers,
+            resume=False, mode="llm", opinion=True, min_skills=0
+        )
+        stages["batch"] = stage_stats([seconds], args.cvs)
+        stages["batch"]["api_requests"] = server.stats["requests"] - requests_before
+        stages["batch"]["results"] = report["total"]
+    return stages
+
+
+def compare_with_baseline(results, baseline, tolerance, min_seconds=MIN_REGRESSION_SECONDS):
+    """
+    Compare the mean time per item of each stage with a baseline. A stage regresses when it is more than
+    `tolerance` slower per item and, so that the noise of very short stages is not reported, when it took
+    at least `min_seconds` longer in total.
+
+    Parameters:
+    - results (dict): The results of this run.
+    - baseline (dict): The results of the baseline run.
+    - tolerance (float): Relative slowdown allowed before a stage counts as a regression, e.g. 0.25 for 25%.
+    - min_seconds (float): Smallest total slowdown of a stage counted as a regression, in seconds.
+
+    Returns:
+    - dict: For each stage of both runs, the baseline and current "mean_ms", the relative "change" and
+      whether it is a "regression".
+    """
+    comparison = {}
+    for stage, stats in results["stages"].items():
+        baseline_stats = baseline.get("stages", {}).get(stage)
+        if not baseline_stats or not baseline_stats.get("mean_ms"):
+            continue
+        change = stats["mean_ms"] / baseline_stats["mean_ms"] - 1
+        comparison[stage] = {
+            "baseline_ms": baseline_stats["mean_ms"],
+            "current_ms": stats["mean_ms"],
+            "change": change,
+            "regression": change > tolerance and stats["seconds"] - baseline_stats["seconds"] >= min_seconds,
+        }
+    return comparison
+
+
+def print_results(results):
+    """
+    Print the stage timings, with the change from the baseline when there is one.
+    """
+    comparison = results.get("comparison") or {}
+    print(f"{'stage':>26} {'items':>8} {'total s':>9} {'ms/item':>10} {'p95 ms':>9} {'items/s':>10} {'vs base':>9}")
+    for stage, stats in results["stages"].items():
+        p95 = f"{stats['p95_ms']:9.1f}" if "p95_ms" in stats else f"{'':>9}"
+        per_second = f"{stats['per_second']:10.1f}" if stats["per_second"] else f"{'':>10}"
+        change = ""
+        if stage in comparison:
+            change = f"{comparison[stage]['change']:+.1%}" + (" !" if comparison[stage]["regression"] else "")
+        print(f"{stage:>26} {stats['items']:>8} {stats['seconds']:9.2f} {stats['mean_ms']:10.3f} {p95} {per_second} "
+              f"{change:>9}")
+    server = results["server"]
+    print(f"Fake API: {server['requests']} requests, {server['throttled']} throttled (429)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time each stage of the pipeline on synthetic jobs and CVs, against a local fake Gemini endpoint, "
+                    "and compare the timings with a baseline."
+    )
+    parser.add_argument("--jobs", type=int, default=10000, help="Number of synthetic job offers (e.g. 10000 to 1000000).")
+    parser.add_argument("--cvs", type=int, default=20, help="Number of synthetic CV PDFs.")
+    parser.add_argument("--pages", type=int, default=2, help="Pages per CV.")
+    parser.add_argument("--report-rows", type=int, default=1000, help="Rows of the report written by write_report.")
+    parser.add_argument("-k", type=int, default=5, help="Number of jobs retrieved per CV.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--encode-catalog", action="store_true",
+                        help="Encode the catalog with the embedding model instead of using random embeddings.")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("BATCH_WORKERS", 4)),
+                        help="CVs in flight in the batch stage.")
+    parser.add_argument("--skip-batch", action="store_true", help="Do not time the whole batch pipeline.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds the fake API takes to answer.")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Maximum random seconds added to the latency.")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of API requests refused with 429.")
+    parser.add_argument("--retry-after", type=float, default=0, help="Retry-After of the 429 responses, in seconds.")
+    parser.add_argument("--response-chars", type=int, default=400, help="Length of the API responses.")
+    parser.add_argument("--requests-per-minute", type=float, default=0,
+                        help="API_REQUESTS_PER_MINUTE for the run (0 disables the rate limiter).")
+    parser.add_argument("--output", help="Save the results to this JSON file.")
+    parser.add_argument("--baseline", default=None,
+                        help="JSON results of a previous run on this machine to compare with "
+                             "(benchmarks/pipeline_baseline.json by default, compared only if it exists).")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Record the results as the baseline; run it once on a machine before comparing.")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Relative slowdown per item allowed before a stage fails the comparison.")
+    parser.add_argument("--min-seconds", type=float, default=MIN_REGRESSION_SECONDS,
+                        help="Smallest total slowdown of a stage counted as a regression, in seconds.")
+    parser.add_argument("--work-dir", help="Folder for the generated files (a temporary folder, removed, by default).")
+    args = parser.parse_args()
+    output = os.path.join(INITIAL_DIRECTORY, args.output) if args.output else None
+    baseline_file = os.path.join(INITIAL_DIRECTORY, args.baseline) if args.baseline else DEFAULT_BASELINE
+    if args.baseline and not args.save_baseline and not os.path.exists(baseline_file):
+        parser.error(f"Baseline not found: {baseline_file} (record it on this machine first with --save-baseline)")
+
+    config = {name: value for name, value in vars(args).items()
+              if name not in ("output", "baseline", "save_baseline", "tolerance", "min_seconds", "work_dir")}
+    config.update({name: os.getenv(name) for name in RECORDED_SETTINGS})
+    work_dir = os.path.join(INITIAL_DIRECTORY, args.work_dir) if args.work_dir else tempfile.mkdtemp()
+    os.makedirs(work_dir, exist_ok=True)
+
+    with FakeGeminiServer(args.latency, args.jitter, args.throttle_rate, args.retry_after, args.response_chars,
+                          args.seed) as server:
+        # Every request reaches the fake endpoint and every PDF is parsed: the caches are bypassed, and each
+        # match gets an opinion whatever its similarity.
+        os.environ.update({
+            "GOOGLE_MODEL": server.url,
+            "API_KEY": "benchmark",
+            "API_CACHE_DISABLED": "true",
+            "EXTRACTION_CACHE_DISABLED": "true",
+            "API_REQUESTS_PER_MINUTE": str(args.requests_per_minute),
+            "OPINION_MIN_SIMILARITY": "0",
+        })
+        try:
+            stages = run_stages(args, work_dir, server)
+        finally:
+            if not args.work_dir:
+                shutil.rmtree(work_dir, ignore_errors=True)
+        server_stats = dict(server.stats)
+
+    results = {
+        "config": config,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cores": os.cpu_count(),
+        },
+        "stages": stages,
+        "server": server_stats,
+    }
+
+    regressions = []
+    if not args.save_baseline and not os.path.exists(baseline_file):
+        print(f"No baseline at {baseline_file}: the timings are not compared. "
+              f"Record one on this machine first with --save-baseline.")
+    elif not args.save_baseline:
+        with open(baseline_file, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        different = [name for name in config if baseline.get("config", {}).get(name) != config[name]]
+        if different:
+            print(f"Warning: the baseline was run with other settings: {', '.join(different)}")
+        results["comparison"] = compare_with_baseline(results, baseline, args.tolerance, args.min_seconds)
+        regressions = [stage for stage, change in results["comparison"].items() if change["regression"]]
+
+    print_results(results)
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if args.save_baseline:
+        with open(baseline_file, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"Baseline saved to {baseline_file}")
+    if regressions:
+        print(f"Regressions (more than {args.tolerance:.0%} slower per item): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
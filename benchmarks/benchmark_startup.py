@@ -0,0 +1,72 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+SRC_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+HEAVY_MODULES = ("torch", "sentence_transformers", "transformers", "sklearn", "pandas", "pyarrow")
+
+# Run in a fresh interpreter so that every measurement starts with an empty module cache.
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+imported = time.perf_counter() - start
+result = {{"import": imported, "heavy": [name for name in {heavy!r} if name in sys.modules]}}
+if {load}:
+    from dotenv import load_dotenv
+    load_dotenv(dotenv_path="../.env")
+    from pipeline import load_job_matcher
+    start = time.perf_counter()
+    load_job_matcher()
+    result["load_job_matcher"] = time.perf_counter() - start
+print(json.dumps(result))
+"""
+
+
+def measure(module, load, repeat):
+    """
+    Import a module in fresh interpreters and report the best import time.
+
+    Parameters:
+    - module (str): The module to import, e.g. "app".
+    - load (bool): Whether to also time loading the job matcher (embeddings and model) after the import.
+    - repeat (int): Number of runs; the fastest is kept.
+
+    Returns:
+    - dict: The import time, the heavy modules loaded by the import and, with `load`, the load time.
+    """
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES, load=load)],
+            cwd=SRC_DIRECTORY, capture_output=True, text=True, check=True
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return min(runs, key=lambda run: run["import"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the import time of the application modules.")
+    parser.add_argument("--modules", nargs="+", default=["job_matcher", "pipeline", "app"],
+                        help="Modules to import (app needs PyQt6).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module; the fastest is reported.")
+    parser.add_argument("--load", action="store_true",
+                        help="Also time loading the embeddings and the model in the background step.")
+    args = parser.parse_args()
+
+    print(f"{'module':>12} {'import ms':>10} {'load s':>8}  heavy modules imported")
+    for module in args.modules:
+        try:
+            result = measure(module, args.load, args.repeat)
+        except subprocess.CalledProcessError as e:
+            print(f"{module:>12} failed: {e.stderr.strip().splitlines()[-1]}")
+            continue
+        load_time = f"{result['load_job_matcher']:8.2f}" if "load_job_matcher" in result else f"{'-':>8}"
+        print(f"{module:>12} {result['import'] * 1000:10.1f} {load_time}  {', '.join(result['heavy']) or 'none'}")
+    print("The GUI prints its startup times (imports, first paint, ready) when it starts.")
+
+
+if __name__ == "__main__":
+    main()
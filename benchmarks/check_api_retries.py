@@ -0,0 +1,95 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.insert(0, os.getcwd())
+
+from fake_gemini_server import FakeGeminiServer
+from utils import send_request_to_api
+
+
+def check_retry_after(retry_after, max_retries):
+    """
+    Check that a request refused with 429 every time waits Retry-After seconds after each refusal, rather than
+    the exponential backoff (at least half a second, then doubling), and gives up after `max_retries` retries.
+
+    Returns:
+    - str or None: What went wrong, or None if the check passed.
+    """
+    with FakeGeminiServer(latency=0, jitter=0, throttle_rate=1.0, retry_after=retry_after) as server:
+        os.environ["GOOGLE_MODEL"] = server.url
+        start = time.perf_counter()
+        try:
+            send_request_to_api("always throttled", max_retries=max_retries)
+            return "the request succeeded although every attempt was throttled"
+        except Exception as e:
+            if "Maximum retries exceeded" not in str(e):
+                return f"unexpected error: {e}"
+        elapsed = time.perf_counter() - start
+        attempts = server.stats["requests"]
+    if attempts != max_retries + 1:
+        return f"{attempts} attempts instead of {max_retries + 1}"
+    expected = (max_retries + 1) * retry_after
+    if elapsed < expected:
+        return f"gave up after {elapsed:.2f}s, less than Retry-After ({retry_after}s) per attempt"
+    if elapsed > expected + 0.4:
+        return f"gave up after {elapsed:.2f}s instead of about {expected:.2f}s: Retry-After was not followed"
+    print(f"Retry-After: {attempts} attempts in {elapsed:.2f}s")
+    return None
+
+
+def check_concurrent_recovery(requests, workers, throttle_rate):
+    """
+    Check that concurrent requests sharing the pooled session all succeed when some attempts are throttled.
+
+    Returns:
+    - str or None: What went wrong, or None if the check passed.
+    """
+    with FakeGeminiServer(latency=0.02, jitter=0.02, throttle_rate=throttle_rate, retry_after=0) as server:
+        os.environ["GOOGLE_MODEL"] = server.url
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            responses = list(executor.map(lambda index: send_request_to_api(f"request {index}"), range(requests)))
+        elapsed = time.perf_counter() - start
+        stats = dict(server.stats)
+    if len(responses) != requests or not all(responses):
+        return "some requests returned no text"
+    if stats["requests"] != requests + stats["throttled"]:
+        return f"{stats['requests']} attempts for {requests} requests and {stats['throttled']} refusals"
+    print(f"Concurrent: {requests} requests with {workers} threads, {stats['throttled']} throttled, "
+          f"all answered in {elapsed:.2f}s")
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check the retry, Retry-After and connection pooling behaviour of send_request_to_api "
+                    "against the local fake Gemini endpoint."
+    )
+    parser.add_argument("--retry-after", type=float, default=0.2)
+    parser.add_argument("--max-retries", type=int, default=2)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--throttle-rate", type=float, default=0.3)
+    args = parser.parse_args()
+
+    # Every attempt must reach the server: no cache, no client-side rate limit.
+    os.environ.update({"API_KEY": "check", "API_CACHE_DISABLED": "true", "API_REQUESTS_PER_MINUTE": "0"})
+    failures = [
+        failure for failure in (
+            check_retry_after(args.retry_after, args.max_retries),
+            check_concurrent_recovery(args.requests, args.workers, args.throttle_rate),
+        ) if failure is not None
+    ]
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    if failures:
+        sys.exit(1)
+    print("All checks passed.")
+
+
+if __name__ == "__main__":
+    main()
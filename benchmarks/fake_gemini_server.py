@@ -0,0 +1,167 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SENIORITY_LEVELS = ("Internship", "Entry-Level", "Junior", "Mid-Level", "Senior")
+JOB_TITLES = (
+    "Software Engineer", "Data Analyst", "Network Engineer", "Cloud Architect", "DevOps Engineer",
+    "Data Scientist", "Security Analyst", "Frontend Developer", "Backend Developer", "IT Project Manager"
+)
+WORDS = (
+    "python", "java", "sql", "docker", "kubernetes", "aws", "azure", "react", "linux", "git", "agile",
+    "machine", "learning", "cloud", "networks", "security", "testing", "design", "data", "pipelines",
+    "experience", "projects", "team", "delivery", "systems", "development", "analysis", "automation"
+)
+
+
+class FakeGeminiServer:
+    """
+    Local HTTP server that answers like the generateContent endpoint of GOOGLE_MODEL, so that the pipeline
+    can be measured without network, quota or cost. Each response waits `latency` seconds (plus up to
+    `jitter`), a fraction `throttle_rate` of the requests is refused with 429 and a Retry-After header, and
+    the response text has about `response_chars` characters. Requests in JSON mode get a JSON object that
+    follows the response schema of the CV profile.
+    """
+
+    def __init__(self, latency=0.2, jitter=0.05, throttle_rate=0.0, retry_after=0, response_chars=400, seed=0,
+                 host="127.0.0.1", port=0):
+        """
+        Parameters:
+        - latency (float): Minimum time to answer, in seconds.
+        - jitter (float): Maximum random time added to the latency, in seconds.
+        - throttle_rate (float): Fraction of the requests answered with 429 (between 0 and 1).
+        - retry_after (float): Value of the Retry-After header of the 429 responses, in seconds.
+        - response_chars (int): Approximate length of the response texts.
+        - seed (int): Seed of the random latencies, refusals and texts.
+        - host (str): Address to listen on.
+        - port (int): Port to listen on; a free port if 0.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.response_chars = response_chars
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "throttled": 0, "json": 0, "bytes": 0}
+        self.server = ThreadingHTTPServer((host, port), self.handler_class())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        """
+        The URL to use as GOOGLE_MODEL.
+        """
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1beta/models/fake-gemini:generateContent"
+
+    def handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status, headers, payload = server.respond(json.loads(body or b"{}"))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def respond(self, request):
+        """
+        Build the response to a generateContent request.
+
+        Parameters:
+        - request (dict): The decoded request body.
+
+        Returns:
+        - tuple: The HTTP status, the extra headers and the body.
+        """
+        json_mode = "response_schema" in request.get("generation_config", {})
+        with self.lock:
+            self.stats["requests"] += 1
+            throttled = self.random.random() < self.throttle_rate
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            words = [self.random.choice(WORDS) for _ in range(max(1, self.response_chars // 8))]
+            job_title = self.random.choice(JOB_TITLES)
+            seniority = self.random.choice(SENIORITY_LEVELS)
+            if throttled:
+                self.stats["throttled"] += 1
+            elif json_mode:
+                self.stats["json"] += 1
+        time.sleep(delay)
+        if throttled:
+            payload = json.dumps({"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}}).encode()
+            return 429, {"Retry-After": str(self.retry_after)}, payload
+
+        text = " ".join(words)[:self.response_chars]
+        if json_mode:
+            text = json.dumps({"summary": text, "job_title": job_title, "skills": words[:6], "seniority": seniority})
+        else:
+            text = f"{job_title}, {text}"
+        payload = json.dumps({"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}}]}).encode()
+        with self.lock:
+            self.stats["bytes"] += len(payload)
+        return 200, {}, payload
+
+    def start(self):
+        """
+        Serve requests on a background thread.
+
+        Returns:
+        - FakeGeminiServer: The server itself.
+        """
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving and close the socket.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve fake Gemini responses, e.g. to try the app offline.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds before each response.")
+    parser.add_argument("--jitter", type=float, default=0.05, help="Maximum random seconds added to the latency.")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests refused with 429.")
+    parser.add_argument("--retry-after", type=float, default=0, help="Retry-After of the 429 responses, in seconds.")
+    parser.add_argument("--response-chars", type=int, default=400, help="Length of the response texts.")
+    args = parser.parse_args()
+
+    server = FakeGeminiServer(args.latency, args.jitter, args.throttle_rate, args.retry_after, args.response_chars,
+                              port=args.port)
+    print(f"Set GOOGLE_MODEL={server.url}")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+        print(f"Served: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
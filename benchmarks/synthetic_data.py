@@ -0,0 +1,193 @@
+import os
+import numpy as np
+import pandas as pd
+
+JOB_TITLES = [
+    "Software Engineer", "Data Analyst", "Network Engineer", "Cloud Architect", "DevOps Engineer", "Data Scientist",
+    "Security Analyst", "Frontend Developer", "Backend Developer", "Full Stack Developer", "IT Project Manager",
+    "Database Administrator", "Machine Learning Engineer", "Systems Administrator", "QA Engineer", "UX/UI Designer",
+    "Mobile Developer", "IT Support Specialist", "Data Engineer", "Solutions Architect"
+]
+VERBS = ["Develop", "Maintain", "Design", "Analyze", "Secure", "Automate", "Support", "Test", "Deploy", "Optimize"]
+OBJECTS = ["software", "data pipelines", "networks", "cloud solutions", "web applications", "databases",
+           "user interfaces", "infrastructure", "machine learning models", "APIs"]
+SKILLS = ["Python", "Java", "C++", "JavaScript", "SQL", "HTML", "CSS", "Go", "Linux", "Docker", "Kubernetes",
+          "AWS", "Azure", "TensorFlow", "PyTorch", "Git", "MongoDB", "Node.js", "React", "Spark", "MySQL",
+          "PostgreSQL", "Django", "Flask", "Excel", "Tableau", "Cisco", "Agile", "Terraform", "Jenkins"]
+LOCATIONS = ["London", "Manchester", "Birmingham", "Edinburgh", "Glasgow", "Leeds", "Bristol", "Newcastle",
+             "Sheffield", "Cardiff", "Remote"]
+COMPANIES = ["ABC Tech", "XYZ Analytics", "Network Solutions", "CloudWorks", "SecureIT", "DataCorp", "DevHouse",
+             "Pixel Studio", "InfraOps", "Quantum Labs"]
+EXPERIENCE_LEVELS = ["Internship", "Entry-Level", "Junior", "Mid-Level", "Senior"]
+INDUSTRIES = ["Technology", "Analytics", "Networking", "Cloud Computing", "Security", "Project Management",
+              "Data Science", "DevOps", "Support", "Design"]
+JOB_TYPES = ["Full-Time", "Part-Time", "Contract"]
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Robin", "Jamie", "Charlie", "Avery"]
+LAST_NAMES = ["Smith", "Jones", "Taylor", "Brown", "Williams", "Wilson", "Evans", "Thomas", "Roberts", "Walker"]
+FILLER_WORDS = ["delivered", "projects", "with", "the", "team", "using", "modern", "tools", "for", "clients",
+                "improved", "performance", "of", "systems", "and", "processes", "across", "several", "releases"]
+LINES_PER_PAGE = 50
+
+
+def pick(rng, values, rows):
+    """
+    Draw `rows` values from a list, as a pandas Series of strings.
+    """
+    return pd.Series(np.asarray(values, dtype=object)[rng.integers(0, len(values), rows)])
+
+
+def generate_jobs(rows, seed=0, chunk_rows=100000):
+    """
+    Generate a synthetic job catalog with the columns of the IT job opportunities dataset, one chunk at a time,
+    so that catalogs of millions of rows never have to be held in memory.
+
+    Parameters:
+    - rows (int): Number of job offers.
+    - seed (int): Seed of the generator; the same seed gives the same catalog.
+    - chunk_rows (int): Number of rows per chunk.
+
+    Returns:
+    - generator: The job offers as pandas DataFrames of at most `chunk_rows` rows.
+    """
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, chunk_rows):
+        size = min(chunk_rows, rows - start)
+        skills = pick(rng, SKILLS, size) + ", " + pick(rng, SKILLS, size) + ", " + pick(rng, SKILLS, size)
+        low = rng.integers(20, 90, size) * 1000
+        high = low + rng.integers(10, 40, size) * 1000
+        yield pd.DataFrame({
+            "Job Title": pick(rng, JOB_TITLES, size),
+            "Job Description": pick(rng, VERBS, size) + " " + pick(rng, OBJECTS, size),
+            "Required Skills": skills,
+            "Salary Range": [f"£{a:,} - £{b:,}" for a, b in zip(low.tolist(), high.tolist())],
+            "Location": pick(rng, LOCATIONS, size),
+            "Company": pick(rng, COMPANIES, size),
+            "Experience Level": pick(rng, EXPERIENCE_LEVELS, size),
+            "Industry": pick(rng, INDUSTRIES, size),
+            "Job Type": pick(rng, JOB_TYPES, size),
+            "Date Posted": pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 365, size), unit="D"),
+        })
+
+
+def write_jobs_file(path, rows, seed=0):
+    """
+    Save a synthetic job catalog as .xlsx, .csv or .parquet, following the extension of the path.
+
+    Parameters:
+    - path (str): Path of the file.
+    - rows (int): Number of job offers.
+    - seed (int): Seed of the generator.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".xlsx":
+        pd.concat(generate_jobs(rows, seed), ignore_index=True).to_excel(path, index=False)
+    elif extension == ".csv":
+        for index, jobs_df in enumerate(generate_jobs(rows, seed)):
+            jobs_df.to_csv(path, mode="a" if index else "w", header=not index, index=False)
+    elif extension == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            for jobs_df in generate_jobs(rows, seed):
+                table = pa.Table.from_pandas(jobs_df, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        raise ValueError(f"Unsupported jobs file format: {extension}")
+
+
+def cv_lines(rng, pages=1):
+    """
+    Generate the lines of a synthetic CV: a name, a job title, a skills section and experience entries.
+
+    Parameters:
+    - rng (numpy Generator): The random generator.
+    - pages (int): Approximate number of pages of the CV.
+
+    Returns:
+    - list: The lines of text.
+    """
+    title = rng.choice(JOB_TITLES)
+    skills = rng.choice(SKILLS, size=int(rng.integers(3, 9)), replace=False)
+    lines = [
+        f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        f"{rng.choice(EXPERIENCE_LEVELS)} {title}",
+        "",
+        "Skills: " + ", ".join(skills),
+        "",
+        "Experience",
+    ]
+    while len(lines) < pages * LINES_PER_PAGE:
+        lines.append(f"{int(rng.integers(2010, 2024))} - {title} at {rng.choice(COMPANIES)}")
+        words = list(rng.choice(FILLER_WORDS, size=14)) + list(rng.choice(skills, size=2))
+        lines.append(" ".join(words).capitalize() + ".")
+    return lines
+
+
+def escape_pdf_text(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path, lines):
+    """
+    Write a plain text PDF with one line of text per row, LINES_PER_PAGE rows per page, in Helvetica.
+    Only ASCII text is supported.
+
+    Parameters:
+    - path (str): Path of the PDF file.
+    - lines (list): The lines of text.
+    """
+    pages = [lines[start:start + LINES_PER_PAGE] for start in range(0, max(1, len(lines)), LINES_PER_PAGE)]
+    page_ids = [4 + 2 * index for index in range(len(pages))]
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{page_id} 0 R' for page_id in page_ids)}] /Count {len(pages)} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for page_id, page_lines in zip(page_ids, pages):
+        content = "BT /F1 10 Tf 14 TL 50 800 Td " + " ".join(
+            f"({escape_pdf_text(line)}) Tj T*" for line in page_lines
+        ) + " ET"
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>")
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    with open(path, "wb") as file:
+        file.write(output)
+
+
+def generate_cv_pdfs(directory, count, pages=1, seed=0):
+    """
+    Write synthetic CVs as PDF files named cv_<number>.pdf.
+
+    Parameters:
+    - directory (str): The folder of the PDF files, created if needed.
+    - count (int): Number of CVs.
+    - pages (int): Number of pages per CV.
+    - seed (int): Seed of the generator.
+
+    Returns:
+    - list: The paths of the PDF files.
+    """
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    paths = []
+    for number in range(1, count + 1):
+        path = os.path.join(directory, f"cv_{number}.pdf")
+        write_pdf(path, cv_lines(rng, pages))
+        paths.append(path)
+    return paths
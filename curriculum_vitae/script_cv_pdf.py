@@ -1,20 +1,12 @@
 import os
-import pdfplumber
-import re
 import shutil
+import sys
 
-it_keywords = [
-    "Python", "Java", "C++", "JavaScript", "SQL", "HTML", "CSS", "PHP", "Ruby",
-    "Go", "Linux", "Docker", "Kubernetes", "AWS", "Azure", "Machine Learning", "Data Science",
-    "Artificial Intelligence", "TensorFlow", "PyTorch", "Git", "MongoDB", "Node.js",
-    "React", "Vue.js", "Hadoop", "Spark", "NoSQL", "GitHub", "MySQL", "PostgreSQL", "Django",
-    "Flask", "DevOps", "Cloud Computing", "Developer", "Web Developer", "Frontend Developer", "Backend Developer",
-    "Full Stack Developer", "Software Engineer", "DevOps Engineer", "Mobile Developer", "Game Developer",
-    "UI/UX Designer", "App Developer", "Web Designer", "Systems Engineer", "IT Specialist",
-    "Network Engineer", "Database Administrator", "Cloud Engineer", "Embedded Systems Developer",
-    "Automation Engineer", "IT Consultant", "Security Engineer", "Data Analyst", "Data Engineer",
-    "Blockchain Developer", "AI Engineer", "Machine Learning Engineer", "Digital Transformation"
-]
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from extraction import extract_text
+from skill_scanner import IT_SKILLS, get_skill_scanner, scan_pdfs
+
+it_keywords = IT_SKILLS
 
 
 def extract_text_from_pdf(pdf_path):
@@ -27,33 +19,30 @@ def extract_text_from_pdf(pdf_path):
     Returns:
         str: The extracted text from the PDF.
     """
-    with pdfplumber.open(pdf_path) as pdf:
-        text = ""
-        for page in pdf.pages:
-            text += page.extract_text()
-    return text
+    return extract_text(pdf_path, extractor="pdfplumber")
 
 
 def find_it_skills(text):
     """
     Find IT skills in the given text and return a list of found skills.
 
+    The keywords are matched in a single pass by the shared skill scanner (SKILLS_VOCABULARY_FILE
+    replaces the built-in list).
+
     Parameters:
     text (str): The text in which IT skills will be searched.
 
     Returns:
     list: A list of IT skills found in the text.
     """
-    found_skills = []
-    for keyword in it_keywords:
-        if re.search(r'\b' + re.escape(keyword) + r'\b', text, re.IGNORECASE):
-            found_skills.append(keyword)
-    return found_skills
+    return get_skill_scanner().find(text)
 
 
 def analyze_pdfs_in_folder(folder_path, output_folder):
     """
     Analyzes PDF files in a folder and extracts IT skills from them.
+    The PDFs are parsed in a pool of worker processes, one per available core, and the skills of each
+    one are scanned as soon as it is parsed.
 
     Args:
         folder_path (str): The path to the folder containing PDF files.
@@ -64,42 +53,47 @@ def analyze_pdfs_in_folder(folder_path, output_folder):
     """
     results = []
     pdf_files = [f for f in os.listdir(folder_path) if f.endswith(".pdf")]
-    total_files = len(pdf_files)
+    pdf_paths = [os.path.join(folder_path, filename) for filename in pdf_files]
     last_progress = 0
-    for index, filename in enumerate(pdf_files):
-        pdf_path = os.path.join(folder_path, filename)
+
+    def progress(files_done, total_files):
+        nonlocal last_progress
+        percentage = files_done / total_files * 100
+        if int(percentage) % 10 == 0 and int(percentage) != last_progress:
+            print(f"Processed {files_done} of {total_files} files ({percentage:.2f}%)")
+            last_progress = int(percentage)
+
+    for pdf_path, skill_counts, error in scan_pdfs(pdf_paths, progress=progress, extractor="pdfplumber", timeout=60):
+        filename = os.path.basename(pdf_path)
         try:
-            text = extract_text_from_pdf(pdf_path)
-            skills = find_it_skills(text)
-            if skills:
-                if len(skills) >= 7:
-                    results.append((filename, skills))
-                    shutil.copy(pdf_path, os.path.join(output_folder, filename))
+            if error is not None:
+                raise error
+            skills = list(skill_counts)
+            if len(skills) >= 7:
+                results.append((filename, skills))
+                shutil.copy(pdf_path, os.path.join(output_folder, filename))
         except Exception as e:
             print(f"Error processing {filename}: {e}")
-        progress = (index + 1) / total_files * 100
-        if int(progress) % 10 == 0 and int(progress) != last_progress:
-            print(f"Processed {index + 1} of {total_files} files ({progress:.2f}%)")
-            last_progress = int(progress)
     results.sort(key=lambda x: x[0].lower())
     return results
 
 
-folder_path = 'pdf'
-output_folder = 'pdf_it'
+if __name__ == "__main__":
+    folder_path = 'pdf'
+    output_folder = 'pdf_it'
 
-os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
-if os.path.exists(output_folder):
-    shutil.rmtree(output_folder)
+    if os.path.exists(output_folder):
+        shutil.rmtree(output_folder)
 
-os.makedirs(output_folder)
+    os.makedirs(output_folder)
 
-matching_files = analyze_pdfs_in_folder(folder_path, output_folder)
+    matching_files = analyze_pdfs_in_folder(folder_path, output_folder)
 
-if matching_files:
-    print("\nThe following resumes have at least 7 IT skills:")
-    for file, skills in matching_files:
-        print(f"{file}: {', '.join(skills)}")
-else:
-    print("No resumes with at least 7 IT skills found.")
+    if matching_files:
+        print("\nThe following resumes have at least 7 IT skills:")
+        for file, skills in matching_files:
+            print(f"{file}: {', '.join(skills)}")
+    else:
+        print("No resumes with at least 7 IT skills found.")
@@ -1,24 +1,138 @@
-import pandas as pd
+import argparse
+import csv
 import os
+import sys
+import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from job_matcher import iter_jobs_file
+from embedding_store import jobs_table_chunk
+from job_dedup import JobDeduplicator, DEDUP_COLUMNS, NEAR_DUPLICATE_THRESHOLD, NUM_PERM, SHINGLE_SIZE
 
-def process_excel(path_file):
+CHUNK_ROWS = 10000
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class ChunkWriter:
+    """
+    Writes a table chunk by chunk, so that the cleaned catalog is never held in memory whole.
+    The format follows the extension of the output file: .xlsx, .csv or .parquet.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.extension = os.path.splitext(path)[1].lower()
+        self.writer = None
+        self.header_written = False
+
+    def write(self, df):
+        if self.extension == ".csv":
+            df.to_csv(self.path, mode="a" if self.header_written else "w", header=not self.header_written, index=False)
+        elif self.extension == ".parquet":
+            import pyarrow.parquet as pq
+            # Every chunk is written as strings, so that its schema does not depend on the values it holds.
+            table = jobs_table_chunk(df)
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.path, table.schema)
+            self.writer.write_table(table)
+        else:
+            self.open_workbook()
+            if not self.header_written:
+                self.sheet.append(list(df.columns))
+            for row in df.itertuples(index=False, name=None):
+                self.sheet.append([None if value != value else value for value in row])
+        self.header_written = True
+
+    def close(self):
+        if self.extension == ".parquet":
+            if self.writer is not None:
+                self.writer.close()
+        elif self.extension != ".csv":
+            self.open_workbook()
+            self.writer.save(self.path)
+
+    def open_workbook(self):
+        if self.writer is None:
+            from openpyxl import Workbook
+            self.writer = Workbook(write_only=True)
+            self.sheet = self.writer.create_sheet()
+
+
+def write_clusters(path, clusters):
+    """
+    Save the duplicate clusters: one line per duplicate, with the row kept in its place.
+
+    Parameters:
+    - path (str): Path of the CSV report.
+    - clusters (dict): The clusters returned by JobDeduplicator.clusters.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Cluster", "Kept Row", "Duplicate Row", "Kind", "Similarity"])
+        for cluster, (kept_row, duplicates) in enumerate(clusters.items(), start=1):
+            for row, kind, similarity in duplicates:
+                # Rows are numbered as in the spreadsheet: the header is row 1.
+                writer.writerow([cluster, kept_row + 2, row + 2, kind, f"{similarity:.3f}"])
+
+
+def remove_duplicates(input_file, output_file, report_file=None, chunk_rows=CHUNK_ROWS, **dedup_options):
+    """
+    Remove the exact and near duplicates of a job catalog, streaming it in chunks of rows.
+
+    Parameters:
+    - input_file (str): The job catalog (.xlsx, .csv or .parquet).
+    - output_file (str): Where to save the catalog without duplicates (.xlsx, .csv or .parquet).
+    - report_file (str or None): Where to save the duplicate clusters as CSV, if given.
+    - chunk_rows (int): Number of rows read at a time.
+    - dedup_options: Arguments of JobDeduplicator (threshold, num_perm, shingle_size, near_duplicates).
+
+    Returns:
+    - dict: The statistics of JobDeduplicator.stats and the time taken in seconds.
+    """
+    start_time = time.perf_counter()
+    deduplicator = JobDeduplicator(DEDUP_COLUMNS, **dedup_options)
+    writer = ChunkWriter(output_file)
     try:
-        df = pd.read_excel(path_file)
-    except Exception as e:
-        print(f"Error loading the file: {e}")
-        return
+        for jobs_df in iter_jobs_file(input_file, chunk_rows):
+            writer.write(deduplicator.process(jobs_df))
+    finally:
+        writer.close()
+    if report_file:
+        write_clusters(report_file, deduplicator.clusters())
+    return {**deduplicator.stats(), "elapsed": time.perf_counter() - start_time}
 
-    if 'Job Title' not in df.columns or 'Job Description' not in df.columns or 'Required Skills' not in df.columns:
-        print("The Excel file must contain the columns 'Job Title', 'Job Description', and 'Required Skills'.")
-        return
 
-    df_no_duplicates = df.drop_duplicates(subset=['Job Title', 'Job Description', 'Required Skills'], keep='first')
+def main():
+    parser = argparse.ArgumentParser(
+        description="Remove the duplicate job offers of a catalog: identical ones, and near duplicates with "
+                    "MinHash-LSH on the character shingles of 'Job Title', 'Job Description' and 'Required Skills'."
+    )
+    parser.add_argument("input", nargs="?", default=os.path.join(SCRIPT_DIR, "JobOpportunities.xlsx"), help="The job catalog.")
+    parser.add_argument("output", nargs="?", default=os.path.join(SCRIPT_DIR, "JobOpportunities_Cleaned.xlsx"), help="The cleaned catalog.")
+    parser.add_argument("--report", help="CSV file listing the duplicate clusters.")
+    parser.add_argument("--threshold", type=float, default=NEAR_DUPLICATE_THRESHOLD,
+                        help="Estimated Jaccard similarity from which two offers are near duplicates.")
+    parser.add_argument("--num-perm", type=int, default=NUM_PERM, help="Length of the MinHash signatures.")
+    parser.add_argument("--shingle-size", type=int, default=SHINGLE_SIZE, help="Characters per shingle.")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="Rows read at a time.")
+    parser.add_argument("--no-near", action="store_true", help="Only remove exact duplicates.")
+    args = parser.parse_args()
+
+    try:
+        stats = remove_duplicates(
+            args.input, args.output, args.report, args.chunk_rows, threshold=args.threshold,
+            num_perm=args.num_perm, shingle_size=args.shingle_size, near_duplicates=not args.no_near
+        )
+    except Exception as e:
+        print(f"Error processing the file: {e}")
+        return
 
-    cleaned_file_path = 'JobOpportunities_Cleaned.xlsx'
-    df_no_duplicates.to_excel(cleaned_file_path, index=False)
-    print(f"Data without duplicates saved to: {cleaned_file_path}")
+    print(f"Rows read: {stats['rows']}")
+    print(f"Exact duplicates removed: {stats['exact']}")
+    print(f"Near duplicates removed: {stats['near']}")
+    print(f"Duplicate clusters: {stats['clusters']}")
+    print(f"Data without duplicates saved to: {args.output} ({stats['kept']} rows, {stats['elapsed']:.2f}s)")
 
 
-os.chdir(os.path.dirname(os.path.abspath(__file__)))
-process_excel('JobOpportunities.xlsx')
+if __name__ == "__main__":
+    main()
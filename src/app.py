@@ -1,33 +1,41 @@
 import os
+import time
 from PyQt6.QtWidgets import (
     QMainWindow, QVBoxLayout, QWidget, QLabel, QTextEdit,
-    QPushButton, QHBoxLayout, QFileDialog, QMessageBox
+    QPushButton, QHBoxLayout, QFileDialog, QMessageBox, QComboBox
 )
-from pdf import extract_text_from_pdf, summarize_text
-from job_matcher import load_embeddings, calculate_and_save_embeddings, check_predicted_job_similarity
+from PyQt6.QtCore import Qt
+from pdf import extract_text_from_pdf
+from job_matcher import TOP_K_JOBS, MATCH_MODES, get_match_mode, analyze_cv
+from pipeline import load_job_matcher
 from pop_up import BatchProcessingDialog
+from filter_panel import JobFilterPanel
+from workers import Task
 
 class JobMatchingApp(QMainWindow):
-    def __init__(self):
+    def __init__(self, start_time=None, imports_time=None):
         """
         Initialize the Job Matching App.
 
-        This constructor sets up the main window and widgets for the app. It loads
-        the embeddings for the job offers from a file, or calculates them if the
-        file does not exist. It also sets up the events for the buttons.
+        This constructor sets up the main window and widgets for the app and sets up
+        the events for the buttons. In the background, it loads the embeddings for
+        the job offers from a file, encoding only the job offers that were added or
+        changed since the file was saved, and creates the job matcher shared with
+        the batch processing dialog; matching is enabled once it is ready.
+
+        Parameters:
+        - start_time (float or None): time.perf_counter() at process start, to report the startup times.
+        - imports_time (float or None): Time spent importing the application modules, in seconds.
 
         :return: None
         """
+        self.start_time = time.perf_counter() if start_time is None else start_time
+        self.startup_times = {"imports": imports_time}
         self.jobs_excel = os.getenv("PATH_EXCEL_DATASET")
-        embeddings_file = os.getenv("PATH_EMBEDDINGS")
-
-        if os.path.exists(embeddings_file):
-            self.embeddings = load_embeddings(embeddings_file)
-        else:
-            print("Calculating embeddings...")
-            calculate_and_save_embeddings(self.jobs_excel, embeddings_file)
-            print("Embeddings calculation completed.")
-            self.embeddings = load_embeddings(embeddings_file)
+        self.job_matcher = None
+        self.embeddings = None
+        # Job predicted along with the summary of the uploaded CV, reused while the summary is matched as is.
+        self.predicted_jobs = {}
 
         super().__init__()
         self.setWindowTitle("Job Matching System")
@@ -80,15 +88,75 @@ class JobMatchingApp(QMainWindow):
         self.layout.addLayout(section1_layout)
 
         self.layout.addWidget(QLabel("Compare with Job Offers", self))
+        compare_layout = QHBoxLayout()
         self.compare_button = QPushButton("Match CV", self)
         self.compare_button.clicked.connect(self.handle_match)
-        self.layout.addWidget(self.compare_button)
+        compare_layout.addWidget(self.compare_button)
+        # "llm" searches with the job predicted by Gemini, "embedding" with the CV itself.
+        self.mode_combo = QComboBox(self)
+        self.mode_combo.addItems(MATCH_MODES)
+        self.mode_combo.setCurrentText(get_match_mode())
+        compare_layout.addWidget(self.mode_combo)
+        compare_layout.setStretch(0, 1)
+        self.layout.addLayout(compare_layout)
+
+        self.filter_panel = JobFilterPanel(self)
+        self.layout.addWidget(self.filter_panel)
 
         self.layout.addWidget(QLabel("Best Match", self))
         self.result_area = QTextEdit(self)
         self.result_area.setReadOnly(True)
         self.layout.addWidget(self.result_area)
 
+        self.compare_button.setEnabled(False)
+        self.batch_button.setEnabled(False)
+        self.statusBar().showMessage("Loading the job offers and the embedding model...")
+        Task(load_job_matcher).start(self.job_matcher_loaded, self.job_matcher_failed)
+
+    def job_matcher_loaded(self, job_matcher):
+        """
+        Enables matching once the job matcher has been loaded in the background.
+
+        Parameters:
+        - job_matcher (JobMatcher): The loaded matching engine.
+        """
+        self.job_matcher = job_matcher
+        self.embeddings = job_matcher.embeddings
+        self.filter_panel.set_job_filters(job_matcher.job_filters)
+        self.compare_button.setEnabled(True)
+        self.batch_button.setEnabled(True)
+        self.startup_times["ready"] = time.perf_counter() - self.start_time
+        self.statusBar().showMessage(f"Ready ({self.format_startup_times()})", 10000)
+        print(f"Startup: {self.format_startup_times()}")
+
+    def record_first_paint(self):
+        """
+        Records the time at which the main window was first painted.
+        """
+        self.startup_times["first paint"] = time.perf_counter() - self.start_time
+        print(f"Startup: {self.format_startup_times()}")
+
+    def format_startup_times(self):
+        """
+        Formats the startup times measured so far.
+
+        Returns:
+        - str: The imports, first paint and ready times, e.g. "imports 0.31s, first paint 0.52s".
+        """
+        return ", ".join(
+            f"{name} {seconds:.2f}s" for name, seconds in self.startup_times.items() if seconds is not None
+        )
+
+    def job_matcher_failed(self, message):
+        """
+        Reports an error while loading the job matcher.
+
+        Parameters:
+        - message (str): The error message.
+        """
+        self.statusBar().showMessage("Job offers not loaded")
+        QMessageBox.critical(self, "Error", f"Error loading the job offers: {message}")
+
     def clear_summary_text(self):
         """
         Clears the content of the CV Summary box.
@@ -97,8 +165,9 @@ class JobMatchingApp(QMainWindow):
 
     def handle_match(self):
         """
-        Combines the CV summary and manual input for matching with job offers.
-        Displays the best match in the results area.
+        Combines the CV summary and manual input for matching with job offers, in the background,
+        among the job offers that pass the selected filters. The best match and the runner-up jobs are
+        displayed in the results area by `show_match`.
         """
         summary_content = self.summary_text.toPlainText().strip()
         cv_text_content = self.cv_text.toPlainText().strip()
@@ -110,16 +179,39 @@ class JobMatchingApp(QMainWindow):
         if self.embeddings is None or self.embeddings.size == 0:
             QMessageBox.critical(self, "Error", "Embeddings are not calculated!")
             return
-        try:
-            result = check_predicted_job_similarity(combined_text, self.jobs_excel, self.embeddings)
-            self.result_area.setPlainText(result)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error during matching: {e}")
+        self.compare_button.setEnabled(False)
+        self.statusBar().showMessage("Matching...")
+        Task(
+            self.job_matcher.match, combined_text, TOP_K_JOBS, mode=self.mode_combo.currentText(),
+            predicted_job=self.predicted_jobs.get(combined_text), filters=self.filter_panel.filters()
+        ).start(self.show_match, self.match_failed)
+
+    def show_match(self, result):
+        """
+        Displays the result of a match computed in the background.
+
+        Parameters:
+        - result (dict): The match result.
+        """
+        self.compare_button.setEnabled(True)
+        self.statusBar().clearMessage()
+        self.result_area.setPlainText(result["text"])
+
+    def match_failed(self, message):
+        """
+        Reports an error during matching.
+
+        Parameters:
+        - message (str): The error message.
+        """
+        self.compare_button.setEnabled(True)
+        self.statusBar().clearMessage()
+        QMessageBox.critical(self, "Error", f"Error during matching: {message}")
 
     def handle_file_upload(self):
         """
-        Opens a file dialog to upload a CV file, extracts text, and summarizes it.
-        Displays the summary in the CV Summary box.
+        Opens a file dialog to upload a CV file, then extracts its text and summarizes it
+        in the background. The summary is displayed in the CV Summary box by `show_summary`.
         """
         file_path, _ = QFileDialog.getOpenFileName(
             self,
@@ -128,15 +220,32 @@ class JobMatchingApp(QMainWindow):
             "PDF Files (*.pdf)"
         )
         if file_path:
-            try:
-                text = extract_text_from_pdf(file_path)
-                try:
-                    summary = summarize_text(text)
-                    self.summary_text.setPlainText(summary)
-                except Exception as e:
-                    QMessageBox.critical(self, "Error", f"Error summarizing the text: {e}")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error loading the document: {e}")
+            self.upload_button.setEnabled(False)
+            self.statusBar().showMessage("Reading and summarizing the CV...")
+            Task(lambda: analyze_cv(extract_text_from_pdf(file_path))).start(self.show_summary, self.upload_failed)
+
+    def show_summary(self, profile):
+        """
+        Displays the summary of an uploaded CV analyzed in the background.
+
+        Parameters:
+        - profile (dict): The CV profile returned by analyze_cv.
+        """
+        self.upload_button.setEnabled(True)
+        self.statusBar().clearMessage()
+        self.predicted_jobs = {profile["summary"].strip(): profile["predicted_job"]}
+        self.summary_text.setPlainText(profile["summary"])
+
+    def upload_failed(self, message):
+        """
+        Reports an error while loading or summarizing a CV.
+
+        Parameters:
+        - message (str): The error message.
+        """
+        self.upload_button.setEnabled(True)
+        self.statusBar().clearMessage()
+        QMessageBox.critical(self, "Error", f"Error loading the document: {message}")
 
     def open_batch_processing(self):
         """
@@ -149,6 +258,7 @@ class JobMatchingApp(QMainWindow):
 
         :return: None
         """
-        batch_dialog = BatchProcessingDialog(self.embeddings, self.jobs_excel)
+        batch_dialog = BatchProcessingDialog(self.job_matcher, self)
+        batch_dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         batch_dialog.exec()
 
@@ -0,0 +1,138 @@
+import json
+import os
+
+
+def file_fingerprint(path):
+    """
+    Identify the version of a file by its size and modification time, without reading it.
+
+    Parameters:
+    - path (str): Path of the file.
+
+    Returns:
+    - str: The fingerprint.
+    """
+    stat = os.stat(path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+class BatchJournal:
+    """
+    Append-only JSONL journal of a batch run. Each CV is recorded as soon as it is prepared (summary and
+    predicted job) and as soon as it is done (similarity and result), so that an interrupted run can be
+    resumed without repeating finished work and the report can be streamed from disk.
+    """
+
+    def __init__(self, path):
+        """
+        Open the journal and read the entries of a previous run, if any.
+
+        Parameters:
+        - path (str): Path of the journal file.
+        """
+        self.path = path
+        self.prepared = {}
+        self.done = {}
+        self.load()
+
+    def load(self):
+        """
+        Read the journal, keeping the latest entry of each file (of each file and mode for the prepared stage).
+        A truncated last line (left by a crash in the middle of a write) is ignored.
+        """
+        self.prepared = {}
+        self.done = {}
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as file:
+            offset = file.tell()
+            for line in iter(file.readline, b""):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    offset = file.tell()
+                    continue
+                if entry["stage"] == "prepared":
+                    self.prepared[entry["file"], entry.get("mode")] = entry
+                elif entry["stage"] == "done":
+                    self.done[entry["file"]] = (entry["fingerprint"], offset)
+                offset = file.tell()
+
+    def reset(self):
+        """
+        Delete the journal to start a new run.
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.prepared = {}
+        self.done = {}
+
+    def is_done(self, file_name, fingerprint):
+        """
+        Check whether a file was already fully processed in its current version.
+        """
+        return file_name in self.done and self.done[file_name][0] == fingerprint
+
+    def get_prepared(self, file_name, fingerprint, mode):
+        """
+        Return the summary and predicted job recorded for a file in its current version and matching mode.
+
+        Returns:
+        - tuple or None: The CV text and the predicted job, or None if the file was not prepared in this mode.
+        """
+        entry = self.prepared.get((file_name, mode))
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return None
+        return entry["cv_text"], entry["predicted_job"]
+
+    def append(self, entry):
+        """
+        Append an entry and flush it to disk before returning.
+
+        Parameters:
+        - entry (dict): The entry to record.
+
+        Returns:
+        - int: The offset of the entry in the journal.
+        """
+        with open(self.path, "ab") as file:
+            offset = file.tell()
+            file.write(json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n")
+            file.flush()
+            os.fsync(file.fileno())
+        return offset
+
+    def record_prepared(self, file_name, fingerprint, cv_text, predicted_job, mode):
+        """
+        Record the summary and predicted job of a file, and the matching mode they were prepared for.
+        """
+        entry = {"stage": "prepared", "file": file_name, "fingerprint": fingerprint, "mode": mode,
+                 "cv_text": cv_text, "predicted_job": predicted_job}
+        self.append(entry)
+        self.prepared[file_name, mode] = entry
+
+    def record_done(self, file_name, fingerprint, similarity, result):
+        """
+        Record the final result of a file.
+        """
+        entry = {"stage": "done", "file": file_name, "fingerprint": fingerprint,
+                 "similarity": similarity, "result": result}
+        self.done[file_name] = (fingerprint, self.append(entry))
+
+    def iter_done(self, file_names):
+        """
+        Stream the results of the given files from disk, in the given order.
+
+        Parameters:
+        - file_names (list): The files to read, in report order; files without a result are skipped.
+
+        Returns:
+        - generator: Tuples (file name, similarity, result).
+        """
+        with open(self.path, "rb") as file:
+            for file_name in file_names:
+                if file_name not in self.done:
+                    continue
+                file.seek(self.done[file_name][1])
+                entry = json.loads(file.readline())
+                yield entry["file"], entry["similarity"], entry["result"]
@@ -0,0 +1,217 @@
+import sqlite3
+import hashlib
+import json
+import os
+import time
+import threading
+
+_response_cache = None
+_extraction_cache = None
+_lock = threading.Lock()
+# Expired entries are purged every EXPIRE_EVERY writes; they are never returned in between.
+EXPIRE_EVERY = 1000
+# A full cache is trimmed to this fraction of max_entries, so that the next writes do not each evict again.
+EVICT_TO = 0.9
+
+
+def make_key(*parts):
+    """
+    Build a content-addressed cache key from JSON-serializable parts.
+
+    Parameters:
+    - parts: The values identifying the cached content (e.g. model URL, generation config, prompt).
+
+    Returns:
+    - str: The SHA-256 hex digest of the parts.
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    Persistent key-value cache stored in SQLite, with TTL and size-based eviction and hit/miss counters.
+    Values are stored as JSON and the cache can be shared by several threads.
+
+    Eviction scans the table, so it does not run on every write: the cache counts its entries and only evicts
+    once it holds more than max_entries, trimming them to EVICT_TO of the limit, and purges the expired
+    entries every EXPIRE_EVERY writes.
+    """
+
+    def __init__(self, path, ttl_seconds=None, max_entries=None):
+        """
+        Open (or create) the cache database and drop the expired entries.
+
+        Parameters:
+        - path (str): Path of the SQLite database file.
+        - ttl_seconds (float or None): Entries older than this are ignored and evicted; None keeps them forever.
+        - max_entries (int or None): Maximum number of entries; the least recently used are evicted beyond it.
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.entries = 0
+        self.writes = 0
+        self.lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+        self.evict()
+
+    def get(self, key):
+        """
+        Return the cached value for a key.
+
+        Parameters:
+        - key (str): The cache key.
+
+        Returns:
+        - The cached value, or None if it is missing or expired.
+        """
+        now = time.time()
+        with self.lock, self.connection:
+            row = self.connection.execute("SELECT value, created FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None or (self.ttl_seconds is not None and now - row[1] > self.ttl_seconds):
+                self.misses += 1
+                return None
+            self.connection.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        """
+        Store a value, evicting the least recently used entries if the cache is full.
+
+        Parameters:
+        - key (str): The cache key.
+        - value: The JSON-serializable value to store.
+        """
+        now = time.time()
+        with self.lock, self.connection:
+            if self.connection.execute("SELECT 1 FROM cache WHERE key = ?", (key,)).fetchone() is None:
+                self.entries += 1
+            self.connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            self.writes += 1
+            full = self.max_entries is not None and self.entries > self.max_entries
+            expiring = self.ttl_seconds is not None and self.writes % EXPIRE_EVERY == 0
+        if full or expiring:
+            self.evict()
+
+    def evict(self):
+        """
+        Remove the expired entries and, above max_entries, the least recently used ones down to EVICT_TO of
+        the limit.
+        """
+        with self.lock, self.connection:
+            if self.ttl_seconds is not None:
+                self.connection.execute("DELETE FROM cache WHERE created < ?", (time.time() - self.ttl_seconds,))
+            self.entries = self.connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            if self.max_entries is not None and self.entries > self.max_entries:
+                self.connection.execute(
+                    "DELETE FROM cache WHERE key IN "
+                    "(SELECT key FROM cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (int(self.max_entries * EVICT_TO),)
+                )
+                self.entries = self.connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def clear(self):
+        """
+        Remove every entry and reset the counters.
+        """
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM cache")
+            self.entries = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Return the cache counters.
+
+        Returns:
+        - dict: Number of entries, hits and misses.
+        """
+        with self.lock:
+            entries = self.connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            return {"entries": entries, "hits": self.hits, "misses": self.misses}
+
+
+def cache_disabled(env_name):
+    """
+    Check whether a cache is bypassed through an environment variable.
+
+    Parameters:
+    - env_name (str): Name of the environment variable.
+
+    Returns:
+    - bool: True if the variable is set to a true value (1, true, yes).
+    """
+    return os.getenv(env_name, "").strip().lower() in ("1", "true", "yes")
+
+
+def open_cache(prefix, default_path, default_ttl_days, default_max_entries):
+    """
+    Open a cache configured with the environment variables PATH_<prefix>, <prefix>_TTL_DAYS and
+    <prefix>_MAX_ENTRIES (0 disables the TTL or the size limit).
+
+    Parameters:
+    - prefix (str): Prefix of the environment variables, e.g. "API_CACHE".
+    - default_path (str): Path of the database when PATH_<prefix> is not set.
+    - default_ttl_days (float): TTL in days when <prefix>_TTL_DAYS is not set.
+    - default_max_entries (int): Maximum number of entries when <prefix>_MAX_ENTRIES is not set.
+
+    Returns:
+    - DiskCache: The cache.
+    """
+    ttl_days = float(os.getenv(f"{prefix}_TTL_DAYS", default_ttl_days))
+    max_entries = int(os.getenv(f"{prefix}_MAX_ENTRIES", default_max_entries))
+    return DiskCache(
+        os.getenv(f"PATH_{prefix}", default_path),
+        ttl_seconds=ttl_days * 86400 if ttl_days > 0 else None,
+        max_entries=max_entries if max_entries > 0 else None
+    )
+
+
+def get_response_cache():
+    """
+    Return the cache of LLM responses configured with PATH_API_CACHE, API_CACHE_TTL_DAYS and API_CACHE_MAX_ENTRIES.
+
+    Returns:
+    - DiskCache or None: The shared cache, or None if it is disabled with API_CACHE_DISABLED.
+    """
+    global _response_cache
+    if cache_disabled("API_CACHE_DISABLED"):
+        return None
+    with _lock:
+        if _response_cache is None:
+            _response_cache = open_cache("API_CACHE", "../api_cache.sqlite", 30, 100000)
+        return _response_cache
+
+
+def get_extraction_cache():
+    """
+    Return the cache of extracted PDF text configured with PATH_EXTRACTION_CACHE, EXTRACTION_CACHE_TTL_DAYS
+    and EXTRACTION_CACHE_MAX_ENTRIES.
+
+    Returns:
+    - DiskCache or None: The shared cache, or None if it is disabled with EXTRACTION_CACHE_DISABLED.
+    """
+    global _extraction_cache
+    if cache_disabled("EXTRACTION_CACHE_DISABLED"):
+        return None
+    with _lock:
+        if _extraction_cache is None:
+            _extraction_cache = open_cache("EXTRACTION_CACHE", "../extraction_cache.sqlite", 90, 20000)
+        return _extraction_cache
@@ -0,0 +1,156 @@
+import argparse
+import os
+import sys
+import time
+from dotenv import load_dotenv
+
+
+def format_duration(seconds):
+    """
+    Format a duration in seconds as minutes and seconds.
+
+    Parameters:
+    - seconds (float): The duration.
+
+    Returns:
+    - str: The formatted duration, e.g. "2m 05s".
+    """
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}m {seconds:02d}s" if minutes else f"{seconds}s"
+
+
+def print_progress(start_time):
+    """
+    Build a progress callback that writes the progress and the estimated remaining time on stderr.
+
+    Parameters:
+    - start_time (float): Time at which the processing started.
+
+    Returns:
+    - callable: The callback, called as progress(steps_done, total_steps).
+    """
+    def progress(steps_done, total_steps):
+        if total_steps == 0:
+            return
+        elapsed_time = time.time() - start_time
+        remaining_time = elapsed_time / max(1, steps_done) * (total_steps - steps_done)
+        sys.stderr.write(
+            f"\r[{steps_done}/{total_steps}] {steps_done / total_steps:.0%} "
+            f"elapsed {format_duration(elapsed_time)}, remaining {format_duration(remaining_time)}   "
+        )
+        if steps_done == total_steps:
+            sys.stderr.write("\n")
+        sys.stderr.flush()
+    return progress
+
+
+def batch_filters(args):
+    """
+    Collect the job filters given on the command line.
+
+    Parameters:
+    - args (argparse.Namespace): The parsed command line arguments.
+
+    Returns:
+    - dict: The filters, see JobFilters.select.
+    """
+    return {
+        "Location": args.location,
+        "Experience Level": args.experience_level,
+        "Industry": args.industry,
+        "min_salary": args.min_salary,
+        "max_salary": args.max_salary,
+    }
+
+
+def run_batch_command(args):
+    """
+    Run the batch pipeline over a folder of CVs without the GUI.
+
+    Parameters:
+    - args (argparse.Namespace): The parsed command line arguments.
+
+    Returns:
+    - int: The exit code.
+    """
+    from pipeline import load_job_matcher, run_batch, format_report
+
+    if not os.path.isdir(args.input):
+        print(f"Error: the input folder {args.input} does not exist.", file=sys.stderr)
+        return 2
+    try:
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    except OSError as e:
+        print(f"Error: cannot create the output folder of {args.output}: {e}", file=sys.stderr)
+        return 2
+    print("Loading job matcher...", file=sys.stderr)
+    job_matcher = load_job_matcher()
+    start_time = time.time()
+    report = run_batch(
+        job_matcher, args.input, args.output, args.workers, print_progress(start_time), resume=not args.restart,
+        mode=args.mode, opinion=not args.no_opinion, filters=batch_filters(args), min_skills=args.min_skills
+    )
+    print(format_report(report))
+    print(f"Time taken: {format_duration(report['elapsed'])}", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    """
+    Parse the command line and run the requested command.
+
+    Usage:
+        python src/cli.py batch --input ../curriculum_vitae/pdf_it --output results.xlsx --workers 4
+
+    Parameters:
+    - argv (list or None): The command line arguments; sys.argv by default.
+
+    Returns:
+    - int: The exit code.
+    """
+    parser = argparse.ArgumentParser(prog="cli.py", description="Headless CV to job matching.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    batch_parser = subparsers.add_parser("batch", help="Match every PDF CV of a folder and write an Excel report.")
+    batch_parser.add_argument("--input", default=None, help="Folder containing the PDF CVs (PATH_FOLDER_PDFS).")
+    batch_parser.add_argument("--output", default=None,
+                              help="Excel file to write (FILE_EXCEL_RESULTS inside the input folder).")
+    batch_parser.add_argument("--workers", type=int, default=None, help="CVs processed concurrently (BATCH_WORKERS).")
+    batch_parser.add_argument("--restart", action="store_true",
+                              help="Ignore the journal of a previous run and process every CV again.")
+    batch_parser.add_argument("--mode", choices=("llm", "embedding"), default=None,
+                              help="Search with the job predicted by Gemini or with the CV embedding (MATCH_MODE).")
+    batch_parser.add_argument("--no-opinion", action="store_true",
+                              help="Do not ask Gemini for an opinion on the matches.")
+    batch_parser.add_argument("--location", action="append", default=None,
+                              help="Only match jobs in this location (repeat the option to accept several).")
+    batch_parser.add_argument("--experience-level", action="append", default=None,
+                              help="Only match jobs with this experience level, e.g. Junior (repeatable).")
+    batch_parser.add_argument("--industry", action="append", default=None,
+                              help="Only match jobs in this industry (repeatable).")
+    batch_parser.add_argument("--min-salary", type=float, default=None,
+                              help="Only match jobs whose salary range reaches this amount.")
+    batch_parser.add_argument("--max-salary", type=float, default=None,
+                              help="Only match jobs whose salary range starts at or below this amount.")
+    batch_parser.add_argument("--min-skills", type=int, default=None,
+                              help="Skip, before any API call, the CVs mentioning fewer skills of the skill "
+                                   "vocabulary (BATCH_MIN_SKILLS; 0 processes every CV).")
+    batch_parser.set_defaults(handler=run_batch_command)
+
+    args = parser.parse_args(argv)
+
+    # Paths given on the command line are relative to the caller, paths in .env to the src folder.
+    for name in ("input", "output"):
+        if getattr(args, name, None):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    load_dotenv(dotenv_path="../.env")
+    if args.command == "batch":
+        args.input = args.input or os.path.abspath(os.getenv("PATH_FOLDER_PDFS"))
+        args.output = args.output or os.path.join(args.input, os.getenv("FILE_EXCEL_RESULTS"))
+
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
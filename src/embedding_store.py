@@ -0,0 +1,405 @@
+import numpy as np
+import hashlib
+import json
+import os
+
+STORE_VERSION = 2
+EMBEDDINGS_DTYPES = ("float32", "float16")
+BUILD_CHUNK_ROWS = 4096
+
+
+def normalize_embeddings(embeddings):
+    """
+    L2-normalize embeddings as float32 so that cosine similarity becomes a dot product.
+
+    Parameters:
+    - embeddings (numpy array): Embeddings with one row per text.
+
+    Returns:
+    - numpy array: The normalized float32 embeddings.
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+    norms[norms == 0] = 1
+    return embeddings / norms
+
+
+def job_texts(jobs_df, column_names):
+    """
+    Build the text embedded for each job by joining the given columns.
+
+    Parameters:
+    - jobs_df (pandas DataFrame): The job offers.
+    - column_names (list): The columns to join.
+
+    Returns:
+    - list: One text per job row.
+    """
+    return jobs_df[column_names].fillna("").astype(str).agg(" ".join, axis=1).tolist()
+
+
+def text_hash(text):
+    """
+    Compute the content hash of the text embedded for a job row.
+
+    Parameters:
+    - text (str): The concatenated job columns.
+
+    Returns:
+    - bytes: The SHA-256 digest of the text.
+    """
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+def file_hash(path):
+    """
+    Compute the content hash of a file, reading it in blocks.
+
+    Parameters:
+    - path (str): Path of the file.
+
+    Returns:
+    - str: The SHA-256 hex digest of the file bytes.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def store_paths(output_file):
+    """
+    Return the paths of the files that make up an embedding store.
+
+    Besides the embeddings matrix, the store has a small JSON metadata file, the content hash of every
+    row and a Parquet table with the job columns, all aligned by row id.
+
+    Parameters:
+    - output_file (str): Path of the embeddings file.
+
+    Returns:
+    - dict: The paths of the "embeddings", "metadata", "hashes" and "jobs" files.
+    """
+    base = os.path.splitext(output_file)[0]
+    return {
+        "embeddings": output_file,
+        "metadata": base + ".meta.json",
+        "hashes": base + ".hashes.npy",
+        "jobs": base + ".jobs.parquet",
+    }
+
+
+def build_paths(output_file):
+    """
+    Return the paths of the files written while an embedding store is being built. They replace the
+    store files once the build is complete, so an interrupted build never leaves a broken store.
+
+    Parameters:
+    - output_file (str): Path of the embeddings file.
+
+    Returns:
+    - dict: The paths of the partial "embeddings", "hashes" and "jobs" files and of the build "state".
+    """
+    base = os.path.splitext(output_file)[0]
+    return {
+        "embeddings": base + ".build.npy",
+        "hashes": base + ".build.hashes.npy",
+        "jobs": base + ".build.jobs.parquet",
+        "state": base + ".build.json",
+    }
+
+
+def load_metadata(output_file):
+    """
+    Load the metadata (version, model, columns, dimension, dtype and dataset hash) of an embedding store.
+
+    Parameters:
+    - output_file (str): Path of the embeddings file.
+
+    Returns:
+    - dict or None: The metadata, or None if the file is missing or unreadable.
+    """
+    try:
+        with open(store_paths(output_file)["metadata"], "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def store_is_current(output_file, source_hash, model_name, column_names, dtype="float32"):
+    """
+    Check whether an embedding store was built from the given dataset file with the same settings,
+    without reading the dataset or the embeddings.
+
+    Parameters:
+    - output_file (str): Path of the embeddings file.
+    - source_hash (str): Content hash of the jobs dataset file.
+    - model_name (str): Name of the embedding model.
+    - column_names (list): Columns concatenated to build the embedded texts.
+    - dtype (str): Data type of the stored embeddings.
+
+    Returns:
+    - bool: True if the store can be used as it is.
+    """
+    metadata = load_metadata(output_file)
+    return (metadata is not None
+            and metadata.get("version") == STORE_VERSION
+            and metadata.get("source_hash") == source_hash
+            and metadata.get("model") == model_name
+            and metadata.get("columns") == column_names
+            and metadata.get("dtype") == dtype
+            and all(os.path.exists(path) for path in store_paths(output_file).values()))
+
+
+def open_embeddings(output_file):
+    """
+    Memory-map the embeddings of a store, so that only the pages actually used are read and several
+    processes share them through the OS cache.
+
+    Parameters:
+    - output_file (str): Path of the embeddings file.
+
+    Returns:
+    - numpy memmap: The read-only L2-normalized embeddings, one row per job.
+    """
+    return np.load(output_file, mmap_mode="r")
+
+
+def load_jobs_table(output_file, columns=None):
+    """
+    Load the job columns stored alongside the embeddings, aligned by row id.
+
+    Parameters:
+    - output_file (str): Path of the embeddings file.
+    - columns (list or None): The columns to read; None reads all of them.
+
+    Returns:
+    - pandas DataFrame: The job offers, one row per embedding.
+    """
+    import pandas as pd
+    return pd.read_parquet(store_paths(output_file)["jobs"], columns=columns)
+
+
+def save_array(path, array):
+    """
+    Save a numpy array, replacing the previous file atomically.
+
+    Parameters:
+    - path (str): Path of the .npy file.
+    - array (numpy array): The array to save.
+    """
+    temporary_file = path + ".tmp.npy"
+    np.save(temporary_file, array)
+    os.replace(temporary_file, path)
+
+
+def save_metadata(path, metadata):
+    """
+    Save the store metadata as JSON, replacing the previous file atomically.
+
+    Parameters:
+    - path (str): Path of the metadata file.
+    - metadata (dict): The metadata to save.
+    """
+    temporary_file = path + ".tmp"
+    with open(temporary_file, "w", encoding="utf-8") as file:
+        json.dump(metadata, file)
+    os.replace(temporary_file, path)
+
+
+
+def jobs_table_chunk(jobs_df):
+    """
+    Convert a chunk of job offers to an Arrow table of strings, keeping missing values as nulls, so that
+    every chunk of the Parquet sidecar has the same schema whatever types the chunk was read with.
+
+    Parameters:
+    - jobs_df (pandas DataFrame): A chunk of the job offers.
+
+    Returns:
+    - pyarrow Table: The chunk with one string column per job column.
+    """
+    import pyarrow as pa
+    return pa.table({
+        str(column): pa.array([None if value is None or value != value else str(value)
+                               for value in jobs_df[column].tolist()], type=pa.string())
+        for column in jobs_df.columns
+    })
+
+
+def load_old_store(output_file, model_name, column_names):
+    """
+    Open the embeddings and row hashes of an existing store, if it was built with the same model and columns.
+
+    Parameters:
+    - output_file (str): Path of the embeddings file.
+    - model_name (str): Name of the embedding model.
+    - column_names (list): Columns concatenated to build the texts.
+
+    Returns:
+    - tuple: The memory-mapped embeddings and the row hashes, or (None, None) if they cannot be reused.
+    """
+    paths = store_paths(output_file)
+    metadata = load_metadata(output_file)
+    if (metadata is None or not os.path.exists(output_file) or not os.path.exists(paths["hashes"])
+            or metadata.get("version") != STORE_VERSION
+            or metadata.get("model") != model_name
+            or metadata.get("columns") != column_names):
+        return None, None
+    old_embeddings = open_embeddings(output_file)
+    old_hashes = np.load(paths["hashes"])
+    if old_embeddings.shape != (len(old_hashes), metadata["dimension"]):
+        return None, None
+    return old_embeddings, old_hashes
+
+
+def sync_embeddings(chunks, output_file, model_name, column_names, encode, source_hash=None, dtype="float32",
+                    chunk_rows=BUILD_CHUNK_ROWS, progress=None):
+    """
+    Bring an embedding store in line with the job dataset, re-encoding only the rows that were added or
+    changed. Rows are matched by the content hash of their text, so deleted rows are dropped and
+    reordered rows are reindexed without being encoded again.
+
+    The build streams: a first pass reads the dataset chunk by chunk, hashing the texts and writing the
+    Parquet sidecar; a second pass reads the sidecar back `chunk_rows` rows at a time, copies the reusable
+    embeddings, encodes the others and writes them into a preallocated memory-mapped matrix. Memory use
+    depends on the chunk size, not on the size of the catalog. Progress is saved after each chunk, so an
+    interrupted build of the same dataset resumes where it stopped; the store files are only replaced once
+    the build is complete.
+
+    Embeddings are stored L2-normalized in the requested dtype. The store is rebuilt from scratch if it
+    has no metadata or was built with another model or columns.
+
+    Parameters:
+    - chunks (iterable): The job offers as pandas DataFrames, in dataset order.
+    - output_file (str): Path of the embeddings file.
+    - model_name (str): Name of the embedding model.
+    - column_names (list): Columns concatenated to build the texts.
+    - encode (callable): Function that encodes a list of texts into a numpy array of embeddings.
+    - source_hash (str or None): Content hash of the jobs dataset file, used to skip the next sync and to
+      resume an interrupted build.
+    - dtype (str): Data type of the stored embeddings, "float32" or "float16".
+    - chunk_rows (int): Number of rows encoded and written at a time.
+    - progress (callable or None): Called as progress(rows_done, total_rows, rows_encoded, rows_reused) after
+      each chunk, with the rows encoded and reused by this run.
+
+    Returns:
+    - tuple: The memory-mapped embeddings aligned with the dataset rows and a dict with the number of
+      reused, encoded and removed rows.
+    """
+    import pyarrow.parquet as pq
+    if dtype not in EMBEDDINGS_DTYPES:
+        raise ValueError(f"Unsupported embeddings dtype: {dtype}")
+    paths = store_paths(output_file)
+    partial = build_paths(output_file)
+    settings = {"version": STORE_VERSION, "model": model_name, "columns": column_names, "dtype": dtype,
+                "source_hash": source_hash}
+
+    state = None
+    if source_hash is not None and all(os.path.exists(partial[name]) for name in ("state", "hashes", "jobs")):
+        with open(partial["state"], "r", encoding="utf-8") as file:
+            state = json.load(file)
+        if any(state.get(name) != value for name, value in settings.items()):
+            state = None
+
+    if state is None:
+        # First pass: hash the texts and write the Parquet sidecar, one chunk at a time. The texts are hashed
+        # from the sidecar columns, which the second pass encodes.
+        if os.path.exists(partial["state"]):
+            os.remove(partial["state"])
+        hashes = []
+        writer = None
+        try:
+            for chunk in chunks:
+                table = jobs_table_chunk(chunk)
+                texts = job_texts(table.select(column_names).to_pandas(), column_names)
+                hashes.append(np.array([text_hash(text) for text in texts], dtype="S32"))
+                if writer is None:
+                    writer = pq.ParquetWriter(partial["jobs"], table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        hashes = np.concatenate(hashes) if hashes else np.empty(0, dtype="S32")
+        if len(hashes) == 0:
+            raise ValueError("The jobs dataset is empty.")
+        save_array(partial["hashes"], hashes)
+        state = {**settings, "rows": len(hashes), "dimension": None, "done": 0}
+        save_metadata(partial["state"], state)
+    hashes = np.load(partial["hashes"])
+
+    old_embeddings, old_hashes = load_old_store(output_file, model_name, column_names)
+    if old_hashes is not None:
+        # Sorted old hashes: each chunk is looked up with a binary search instead of a dict of every row.
+        old_order = np.argsort(old_hashes, kind="stable")
+        sorted_old_hashes = old_hashes[old_order]
+
+    embeddings = None
+    if state["done"] and os.path.exists(partial["embeddings"]):
+        embeddings = np.load(partial["embeddings"], mmap_mode="r+")
+    else:
+        state["done"] = 0
+    dimension = state["dimension"]
+
+    reused = encoded = 0
+    start = 0
+    for batch in pq.ParquetFile(partial["jobs"]).iter_batches(batch_size=chunk_rows, columns=column_names):
+        end = start + batch.num_rows
+        if end <= state["done"]:
+            start = end
+            continue
+        chunk_hashes = hashes[start:end]
+        old_rows = np.full(len(chunk_hashes), -1)
+        if old_hashes is not None:
+            positions = np.minimum(np.searchsorted(sorted_old_hashes, chunk_hashes), len(sorted_old_hashes) - 1)
+            found = sorted_old_hashes[positions] == chunk_hashes
+            old_rows[found] = old_order[positions[found]]
+        present = np.flatnonzero(old_rows >= 0)
+        missing = np.flatnonzero(old_rows < 0)
+
+        new_embeddings = None
+        if len(missing):
+            texts = job_texts(batch.to_pandas(), column_names)
+            new_embeddings = normalize_embeddings(encode([texts[row] for row in missing]))
+        if embeddings is None:
+            dimension = new_embeddings.shape[1] if new_embeddings is not None else old_embeddings.shape[1]
+            embeddings = np.lib.format.open_memmap(partial["embeddings"], mode="w+", dtype=dtype,
+                                                   shape=(len(hashes), dimension))
+            state["dimension"] = dimension
+        if len(present):
+            embeddings[start + present] = old_embeddings[old_rows[present]]
+        if new_embeddings is not None:
+            embeddings[start + missing] = new_embeddings
+        embeddings.flush()
+
+        reused += len(present)
+        encoded += len(missing)
+        state["done"] = end
+        save_metadata(partial["state"], state)
+        if progress is not None:
+            progress(end, len(hashes), encoded, reused)
+        start = end
+
+    removed = 0
+    if old_hashes is not None:
+        removed = int(np.count_nonzero(~np.isin(np.unique(old_hashes), hashes)))
+    embeddings = old_embeddings = None
+
+    # Drop the metadata first: a crash while the files are replaced leaves a store that is rebuilt, not a wrong one.
+    if os.path.exists(paths["metadata"]):
+        os.remove(paths["metadata"])
+    os.replace(partial["embeddings"], paths["embeddings"])
+    os.replace(partial["hashes"], paths["hashes"])
+    os.replace(partial["jobs"], paths["jobs"])
+    save_metadata(paths["metadata"], {
+        "version": STORE_VERSION,
+        "model": model_name,
+        "columns": column_names,
+        "dimension": dimension,
+        "dtype": dtype,
+        "rows": len(hashes),
+        "source_hash": source_hash,
+    })
+    os.remove(partial["state"])
+    return open_embeddings(output_file), {"reused": reused, "encoded": encoded, "removed": removed}
@@ -0,0 +1,159 @@
+import os
+import threading
+
+ENCODER_BACKENDS = ("torch", "onnx", "onnx-int8")
+QUANTIZATION_CONFIGS = ("avx2", "avx512", "avx512_vnni", "arm64")
+
+_models = {}
+_lock = threading.Lock()
+
+
+def get_encoder_backend(backend=None):
+    """
+    Resolve the backend used to run the sentence encoder.
+
+    Parameters:
+    - backend (str or None): "torch" (PyTorch, full precision), "onnx" (ONNX Runtime) or "onnx-int8"
+      (ONNX Runtime with dynamically int8-quantized weights); EMBEDDINGS_BACKEND (default "torch") if None.
+
+    Returns:
+    - str: The backend.
+    """
+    backend = backend or os.getenv("EMBEDDINGS_BACKEND") or "torch"
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"Unsupported encoder backend: {backend}. Expected one of {ENCODER_BACKENDS}.")
+    return backend
+
+
+def embedding_model_id(model_name, backend=None):
+    """
+    Identify the embeddings produced by a model and backend, so that a store built with one backend, or with
+    another ONNX_QUANTIZATION for "onnx-int8", is rebuilt when another one is selected (quantized embeddings
+    differ slightly from the float ones, and from one quantization config to another).
+
+    Parameters:
+    - model_name (str): The model name or path.
+    - backend (str or None): The encoder backend, see get_encoder_backend.
+
+    Returns:
+    - str: The model name, with the backend (and the quantization config) appended for the ONNX backends.
+    """
+    backend = get_encoder_backend(backend)
+    if backend == "onnx-int8":
+        return f"{model_name} [{backend} {quantization_config()}]"
+    return model_name if backend == "torch" else f"{model_name} [{backend}]"
+
+
+def onnx_model_dir(model_name):
+    """
+    Return the folder where the ONNX export of a model is kept (ONNX_MODEL_DIR, ../models by default).
+
+    Parameters:
+    - model_name (str): The model name or path.
+
+    Returns:
+    - str: The folder of the exported model.
+    """
+    safe_name = model_name.strip("/").replace("/", "__")
+    return os.path.join(os.getenv("ONNX_MODEL_DIR") or "../models", f"{safe_name}-onnx")
+
+
+def quantization_config():
+    """
+    Return the instruction set the int8 model is quantized for (ONNX_QUANTIZATION, "avx2" by default, which
+    runs on any recent x86 CPU).
+
+    Returns:
+    - str: The quantization config.
+    """
+    config = os.getenv("ONNX_QUANTIZATION") or "avx2"
+    if config not in QUANTIZATION_CONFIGS:
+        raise ValueError(f"Unsupported quantization config: {config}. Expected one of {QUANTIZATION_CONFIGS}.")
+    return config
+
+
+def quantized_file_name():
+    """
+    Return the file name of the int8 model for the configured instruction set, see quantization_config.
+
+    Returns:
+    - str: The path of the quantized model inside the exported model folder.
+    """
+    return f"onnx/model_qint8_{quantization_config()}.onnx"
+
+
+def export_onnx_model(model_name, quantized=False):
+    """
+    Export a model to ONNX (and optionally quantize it to int8) in the local model folder, once.
+
+    Parameters:
+    - model_name (str): The model name or path.
+    - quantized (bool): Whether the int8 model is also needed.
+
+    Returns:
+    - str: The folder of the exported model.
+    """
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    model_dir = onnx_model_dir(model_name)
+    if not os.path.exists(os.path.join(model_dir, "onnx", "model.onnx")):
+        print(f"Exporting {model_name} to ONNX in {model_dir}...")
+        SentenceTransformer(model_name, backend="onnx").save_pretrained(model_dir)
+    file_name = quantized_file_name()
+    if quantized and not os.path.exists(os.path.join(model_dir, file_name)):
+        print(f"Quantizing {model_name} to int8 in {model_dir}...")
+        export_dynamic_quantized_onnx_model(
+            SentenceTransformer(model_dir, backend="onnx"), quantization_config(), model_dir, push_to_hub=False
+        )
+    return model_dir
+
+
+def create_embedding_model(model_name, backend=None, threads=None):
+    """
+    Load a SentenceTransformer model with the given backend, exporting it to ONNX first if needed.
+
+    Parameters:
+    - model_name (str): The model name or path.
+    - backend (str or None): The encoder backend, see get_encoder_backend.
+    - threads (int or None): Number of threads the ONNX Runtime session may use; all the cores by default.
+
+    Returns:
+    - SentenceTransformer: The model.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    backend = get_encoder_backend(backend)
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+
+    model_kwargs = {"provider": "CPUExecutionProvider"}
+    if threads:
+        import onnxruntime
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = threads
+        model_kwargs["session_options"] = session_options
+    if backend == "onnx-int8":
+        model_kwargs["file_name"] = quantized_file_name()
+    model_dir = export_onnx_model(model_name, quantized=backend == "onnx-int8")
+    return SentenceTransformer(model_dir, backend="onnx", model_kwargs=model_kwargs)
+
+
+def load_embedding_model(model_name, backend=None):
+    """
+    Return the embedding model with the given name and backend, loading it on first use.
+
+    sentence-transformers (and torch) are imported here rather than at module level, so that importing
+    the application modules, and starting the GUI, does not pay for them.
+
+    Parameters:
+    - model_name (str): The model name or path.
+    - backend (str or None): The encoder backend, see get_encoder_backend.
+
+    Returns:
+    - SentenceTransformer: The shared model.
+    """
+    key = (model_name, get_encoder_backend(backend))
+    with _lock:
+        if key not in _models:
+            _models[key] = create_embedding_model(*key)
+        return _models[key]
@@ -0,0 +1,250 @@
+import os
+import signal
+import time
+import hashlib
+import unicodedata
+from importlib import metadata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from cache import get_extraction_cache, make_key
+
+EXTRACTORS = ("pypdf2", "pdfplumber")
+EXTRACTOR_PACKAGES = {"pypdf2": "PyPDF2", "pdfplumber": "pdfplumber"}
+
+
+def iter_pdf_pages(pdf_path, extractor="pypdf2", max_pages=None):
+    """
+    Yield the text of the pages of a PDF file one at a time.
+
+    Parameters:
+    - pdf_path (str): The path to the PDF file.
+    - extractor (str): The library used to parse the PDF, "pypdf2" or "pdfplumber".
+    - max_pages (int or None): Maximum number of pages to read.
+
+    Returns:
+    - generator: The text of each page (empty for pages without text).
+    """
+    if extractor == "pypdf2":
+        import PyPDF2
+        with open(pdf_path, "rb") as file:
+            reader = PyPDF2.PdfReader(file)
+            for index, page in enumerate(reader.pages):
+                if max_pages is not None and index >= max_pages:
+                    return
+                yield page.extract_text() or ""
+    elif extractor == "pdfplumber":
+        import pdfplumber
+        with pdfplumber.open(pdf_path) as pdf:
+            for index, page in enumerate(pdf.pages):
+                if max_pages is not None and index >= max_pages:
+                    return
+                yield page.extract_text() or ""
+    else:
+        raise ValueError(f"Unsupported PDF extractor: {extractor}. Expected one of {EXTRACTORS}.")
+
+
+def normalize_text(text):
+    """
+    Normalize extracted text: Unicode NFC form, without NUL characters and surrounding whitespace.
+
+    Parameters:
+    - text (str): The extracted text.
+
+    Returns:
+    - str: The normalized text.
+    """
+    return unicodedata.normalize("NFC", text).replace("\x00", "").strip()
+
+
+def extract_document(pdf_path, extractor="pypdf2", max_pages=None, max_chars=None):
+    """
+    Extract the text of a PDF file, joining the pages once instead of concatenating them one by one.
+
+    Parameters:
+    - pdf_path (str): The path to the PDF file.
+    - extractor (str): The library used to parse the PDF, "pypdf2" or "pdfplumber".
+    - max_pages (int or None): Maximum number of pages to read.
+    - max_chars (int or None): Stop reading pages once this many characters have been extracted.
+
+    Returns:
+    - dict: The normalized "text", the number of "pages" read and the extraction time in "seconds".
+    """
+    start_time = time.perf_counter()
+    pages = []
+    length = 0
+    for page_text in iter_pdf_pages(pdf_path, extractor, max_pages):
+        pages.append(page_text)
+        length += len(page_text)
+        if max_chars is not None and length >= max_chars:
+            break
+    text = normalize_text("".join(pages))
+    if max_chars is not None:
+        text = text[:max_chars]
+    return {"text": text, "pages": len(pages), "seconds": time.perf_counter() - start_time}
+
+
+def extractor_version(extractor):
+    """
+    Return the installed version of the library behind an extractor.
+
+    Parameters:
+    - extractor (str): The extractor name.
+
+    Returns:
+    - str: The library version, or "unknown" if it is not installed.
+    """
+    try:
+        return metadata.version(EXTRACTOR_PACKAGES[extractor])
+    except (KeyError, metadata.PackageNotFoundError):
+        return "unknown"
+
+
+def extraction_key(pdf_path, extractor, max_pages, max_chars):
+    """
+    Build the extraction cache key of a PDF file from the SHA-256 of its bytes, the extractor name and
+    version and the extraction limits.
+
+    Parameters:
+    - pdf_path (str): The path to the PDF file.
+    - extractor (str): The extractor name.
+    - max_pages (int or None): Maximum number of pages read.
+    - max_chars (int or None): Maximum number of characters extracted.
+
+    Returns:
+    - str: The cache key.
+    """
+    digest = hashlib.sha256()
+    with open(pdf_path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return make_key("pdf-text", digest.hexdigest(), extractor, extractor_version(extractor), max_pages, max_chars)
+
+
+def extract_text(pdf_path, extractor="pypdf2", max_pages=None, max_chars=None, use_cache=True):
+    """
+    Extract the text of a PDF file, reusing the cached text if the same file was already extracted.
+
+    Parameters:
+    - pdf_path (str): The path to the PDF file.
+    - extractor (str): The library used to parse the PDF, "pypdf2" or "pdfplumber".
+    - max_pages (int or None): Maximum number of pages to read.
+    - max_chars (int or None): Stop reading pages once this many characters have been extracted.
+    - use_cache (bool): Whether to read and write the extraction cache (also disabled by EXTRACTION_CACHE_DISABLED).
+
+    Returns:
+    - str: The extracted text.
+    """
+    cache = get_extraction_cache() if use_cache else None
+    if cache is None:
+        return extract_document(pdf_path, extractor, max_pages, max_chars)["text"]
+    key = extraction_key(pdf_path, extractor, max_pages, max_chars)
+    document = cache.get(key)
+    if document is None:
+        document = extract_document(pdf_path, extractor, max_pages, max_chars)
+        cache.set(key, document)
+    return document["text"]
+
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError("PDF extraction timed out.")
+
+
+def _extract_with_timeout(pdf_path, extractor, max_pages, max_chars, timeout):
+    """
+    Extract the text of a PDF file in a worker process, aborting it after `timeout` seconds where
+    SIGALRM is available (Unix).
+    """
+    use_alarm = timeout and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return extract_document(pdf_path, extractor, max_pages, max_chars)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+
+def extraction_settings():
+    """
+    Read the extraction settings from the environment.
+
+    Returns:
+    - dict: The "max_pages", "timeout" and "workers" settings (PDF_MAX_PAGES, PDF_TIMEOUT, PDF_WORKERS).
+    """
+    max_pages = os.getenv("PDF_MAX_PAGES")
+    timeout = os.getenv("PDF_TIMEOUT")
+    workers = os.getenv("PDF_WORKERS")
+    return {
+        "max_pages": int(max_pages) if max_pages else None,
+        "timeout": float(timeout) if timeout else None,
+        "workers": int(workers) if workers else None,
+    }
+
+
+def extract_texts(pdf_paths, extractor="pypdf2", workers=None, timeout=None, max_pages=None, max_chars=None,
+                  use_cache=True):
+    """
+    Extract the text of many PDF files in a pool of worker processes, yielding each result as soon
+    as it is ready.
+
+    Files whose bytes were already extracted with the same extractor version are served from the
+    extraction cache without being parsed. A malformed PDF cannot stall the batch: its extraction is
+    aborted after `timeout` seconds and reported as an error.
+
+    Parameters:
+    - pdf_paths (list): The paths of the PDF files.
+    - extractor (str): The library used to parse the PDFs, "pypdf2" or "pdfplumber".
+    - workers (int or None): Number of worker processes; the number of available cores by default.
+    - timeout (float or None): Maximum extraction time per file, in seconds.
+    - max_pages (int or None): Maximum number of pages read per file.
+    - max_chars (int or None): Stop reading pages of a file once this many characters have been extracted.
+    - use_cache (bool): Whether to read and write the extraction cache (also disabled by EXTRACTION_CACHE_DISABLED).
+
+    Returns:
+    - generator: Tuples (pdf_path, text, error) in completion order, where either text or error is None.
+      Closing the generator early cancels the files not started yet.
+    """
+    cache = get_extraction_cache() if use_cache else None
+    keys = {}
+    pending = []
+    for pdf_path in pdf_paths:
+        if cache is None:
+            pending.append(pdf_path)
+            continue
+        try:
+            keys[pdf_path] = extraction_key(pdf_path, extractor, max_pages, max_chars)
+        except OSError as e:
+            yield pdf_path, None, e
+            continue
+        document = cache.get(keys[pdf_path])
+        if document is None:
+            pending.append(pdf_path)
+        else:
+            yield pdf_path, document["text"], None
+    if not pending:
+        return
+
+    if workers is None:
+        workers = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    workers = max(1, min(workers, len(pending)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_extract_with_timeout, pdf_path, extractor, max_pages, max_chars, timeout): pdf_path
+            for pdf_path in pending
+        }
+        try:
+            for future in as_completed(futures):
+                pdf_path = futures[future]
+                try:
+                    document = future.result()
+                except Exception as e:
+                    yield pdf_path, None, e
+                    continue
+                if cache is not None:
+                    cache.set(keys[pdf_path], document)
+                yield pdf_path, document["text"], None
+        finally:
+            # If the caller stops early, do not parse the files still queued.
+            for future in futures:
+                future.cancel()
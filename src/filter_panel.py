@@ -0,0 +1,80 @@
+from PyQt6.QtWidgets import QGroupBox, QGridLayout, QLabel, QComboBox, QSpinBox
+
+from job_filters import FILTER_COLUMNS
+
+ANY_VALUE = "Any"
+MAX_SALARY = 10_000_000
+
+
+class JobFilterPanel(QGroupBox):
+    """
+    Filters on the job metadata (location, experience level, industry and salary), shared by the main
+    window and the batch dialog. The choices come from the precomputed JobFilters of the job matcher.
+    """
+
+    def __init__(self, parent=None):
+        """
+        Create the filter widgets; the value lists stay empty until `set_job_filters` is called.
+
+        Parameters:
+        - parent (QWidget or None): The parent widget.
+        """
+        super().__init__("Filter Job Offers", parent)
+        layout = QGridLayout(self)
+        self.value_combos = {}
+        for position, column in enumerate(FILTER_COLUMNS):
+            combo = QComboBox(self)
+            combo.addItem(ANY_VALUE)
+            layout.addWidget(QLabel(f"{column}:", self), 0, 2 * position)
+            layout.addWidget(combo, 0, 2 * position + 1)
+            self.value_combos[column] = combo
+
+        self.min_salary = self.salary_spin_box()
+        self.max_salary = self.salary_spin_box()
+        layout.addWidget(QLabel("Salary from:", self), 1, 0)
+        layout.addWidget(self.min_salary, 1, 1)
+        layout.addWidget(QLabel("Salary up to:", self), 1, 2)
+        layout.addWidget(self.max_salary, 1, 3)
+
+    def salary_spin_box(self):
+        """
+        Create a salary input where 0 means no limit.
+
+        Returns:
+        - QSpinBox: The input.
+        """
+        spin_box = QSpinBox(self)
+        spin_box.setRange(0, MAX_SALARY)
+        spin_box.setSingleStep(5000)
+        spin_box.setSpecialValueText(ANY_VALUE)
+        return spin_box
+
+    def set_job_filters(self, job_filters):
+        """
+        Fill the value lists with the values found in the job offers.
+
+        Parameters:
+        - job_filters (JobFilters): The precomputed metadata of the job matcher.
+        """
+        for column, combo in self.value_combos.items():
+            combo.clear()
+            combo.addItem(ANY_VALUE)
+            combo.addItems(job_filters.choices(column))
+            combo.setEnabled(combo.count() > 1)
+
+    def filters(self):
+        """
+        Return the filters selected by the user.
+
+        Returns:
+        - dict: The filters, see JobFilters.select.
+        """
+        filters = {
+            column: [combo.currentText()] for column, combo in self.value_combos.items()
+            if combo.currentText() != ANY_VALUE
+        }
+        if self.min_salary.value():
+            filters["min_salary"] = self.min_salary.value()
+        if self.max_salary.value():
+            filters["max_salary"] = self.max_salary.value()
+        return filters
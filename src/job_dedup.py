@@ -0,0 +1,233 @@
+import hashlib
+import re
+import numpy as np
+
+DEDUP_COLUMNS = ["Job Title", "Job Description", "Required Skills"]
+NEAR_DUPLICATE_THRESHOLD = 0.85
+NUM_PERM = 128
+SHINGLE_SIZE = 5
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_job_text(values):
+    """
+    Join the deduplicated columns of a job into one text, ignoring case, spacing and missing values.
+
+    Parameters:
+    - values (iterable): The values of the columns.
+
+    Returns:
+    - str: The normalized text.
+    """
+    text = " ".join(str(value) for value in values if value is not None and value == value)
+    return WHITESPACE.sub(" ", text).strip().casefold()
+
+
+def lsh_parameters(num_perm, threshold):
+    """
+    Choose how the MinHash signature is split into LSH bands. Two jobs become candidates when all the rows
+    of at least one band agree, which happens with probability 1 - (1 - s^rows)^bands for a Jaccard
+    similarity s; the split is chosen so that this curve is steepest around the threshold.
+
+    Parameters:
+    - num_perm (int): Length of the signatures.
+    - threshold (float): Jaccard similarity above which jobs are near duplicates.
+
+    Returns:
+    - tuple: The number of bands and the number of rows per band.
+    """
+    options = [(num_perm // rows, rows) for rows in range(1, num_perm + 1)]
+    return min(options, key=lambda option: (abs((1 / option[0]) ** (1 / option[1]) - threshold), -option[0]))
+
+
+class MinHasher:
+    """
+    MinHash signatures of the character shingles of a text: the fraction of equal positions in the
+    signatures of two texts estimates the Jaccard similarity of their sets of shingles.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE, seed=1):
+        """
+        Parameters:
+        - num_perm (int): Number of hash functions, i.e. length of the signatures.
+        - shingle_size (int): Number of characters per shingle.
+        - seed (int): Seed of the hash functions; signatures are only comparable with the same seed.
+        """
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.multipliers = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self.offsets = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+
+    def shingle_hashes(self, text):
+        """
+        Hash every shingle of a text with a rolling polynomial hash over its UTF-8 bytes.
+
+        Parameters:
+        - text (str): The normalized text.
+
+        Returns:
+        - numpy array: The distinct 64-bit shingle hashes (one for the whole text if it is shorter than a shingle).
+        """
+        data = np.frombuffer(text.encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+        if len(data) <= self.shingle_size:
+            digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+            return np.array([int.from_bytes(digest, "little")], dtype=np.uint64)
+        count = len(data) - self.shingle_size + 1
+        hashes = np.zeros(count, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for offset in range(self.shingle_size):
+                hashes = hashes * np.uint64(1099511628211) + data[offset:offset + count]
+        return np.unique(hashes)
+
+    def signature(self, text):
+        """
+        Compute the MinHash signature of a text.
+
+        Parameters:
+        - text (str): The normalized text.
+
+        Returns:
+        - numpy array: The signature, num_perm 32-bit values.
+        """
+        hashes = self.shingle_hashes(text)
+        with np.errstate(over="ignore"):
+            # Multiply-shift hashing: the high 32 bits of a*x + b for each of the num_perm (a, b).
+            permuted = (hashes[:, np.newaxis] * self.multipliers + self.offsets) >> np.uint64(32)
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+class JobDeduplicator:
+    """
+    Streaming deduplication of a job catalog, one chunk of rows at a time.
+
+    Exact duplicates (same normalized text) are found with a set of content hashes. Near duplicates are
+    found with MinHash-LSH: the signature of every kept job is split into bands stored in hash buckets,
+    a new job is only compared with the kept jobs sharing one of its buckets, and it is dropped when their
+    estimated Jaccard similarity reaches the threshold. Each job is hashed once and compared with a
+    handful of candidates, so the run time grows about linearly with the catalog.
+    The first job of each cluster is kept, and the others are reported as its duplicates.
+    """
+
+    def __init__(self, columns=None, threshold=NEAR_DUPLICATE_THRESHOLD, num_perm=NUM_PERM,
+                 shingle_size=SHINGLE_SIZE, near_duplicates=True):
+        """
+        Parameters:
+        - columns (list or None): The columns compared; DEDUP_COLUMNS by default.
+        - threshold (float): Estimated Jaccard similarity of the shingles from which two jobs are near duplicates.
+        - num_perm (int): Length of the MinHash signatures; longer signatures estimate the similarity better.
+        - shingle_size (int): Number of characters per shingle.
+        - near_duplicates (bool): Whether to look for near duplicates, or only for exact ones.
+        """
+        self.columns = columns or DEDUP_COLUMNS
+        self.threshold = threshold
+        self.near_duplicates = near_duplicates
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.bands, self.band_rows = lsh_parameters(num_perm, threshold)
+        self.exact_keys = {}
+        self.buckets = {}
+        self.signatures = np.empty((1024, num_perm), dtype=np.uint32)
+        self.kept_rows = []
+        self.rows_read = 0
+        self.duplicates = []
+
+    def band_keys(self, signature):
+        """
+        Return the bucket of each band of a signature.
+        """
+        bands = signature[:self.bands * self.band_rows].reshape(self.bands, self.band_rows)
+        return [hash((band, values.tobytes())) for band, values in enumerate(bands)]
+
+    def find_near_duplicate(self, signature, keys):
+        """
+        Return the most similar kept job among the ones sharing a bucket with a signature.
+
+        Returns:
+        - tuple or None: The position of the kept job and the estimated similarity, or None below the threshold.
+        """
+        candidates = sorted({kept for key in keys for kept in self.buckets.get(key, ())})
+        if not candidates:
+            return None
+        similarities = (self.signatures[candidates] == signature).mean(axis=1)
+        best = int(np.argmax(similarities))
+        return (candidates[best], float(similarities[best])) if similarities[best] >= self.threshold else None
+
+    def keep(self, row, signature, keys):
+        """
+        Index a kept job.
+        """
+        position = len(self.kept_rows)
+        if position == len(self.signatures):
+            self.signatures = np.concatenate([self.signatures, np.empty_like(self.signatures)])
+        self.signatures[position] = signature
+        self.kept_rows.append(row)
+        for key in keys:
+            self.buckets.setdefault(key, []).append(position)
+
+    def process(self, jobs_df):
+        """
+        Deduplicate the next chunk of the catalog against itself and the chunks already processed.
+
+        Parameters:
+        - jobs_df (pandas DataFrame): The next rows of the catalog.
+
+        Returns:
+        - pandas DataFrame: The rows of the chunk that are not duplicates, in order.
+        """
+        missing = [column for column in self.columns if column not in jobs_df.columns]
+        if missing:
+            raise ValueError(f"The jobs file must contain the columns {self.columns}; missing {missing}.")
+        keep_mask = np.ones(len(jobs_df), dtype=bool)
+        for index, values in enumerate(jobs_df[self.columns].itertuples(index=False, name=None)):
+            row = self.rows_read + index
+            text = normalize_job_text(values)
+            digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+            if digest in self.exact_keys:
+                self.duplicates.append((self.exact_keys[digest], row, "exact", 1.0))
+                keep_mask[index] = False
+                continue
+            if not self.near_duplicates:
+                self.exact_keys[digest] = row
+                continue
+            signature = self.hasher.signature(text)
+            keys = self.band_keys(signature)
+            match = self.find_near_duplicate(signature, keys)
+            if match is not None:
+                kept_row = self.kept_rows[match[0]]
+                self.duplicates.append((kept_row, row, "near", match[1]))
+                # Later copies of this text are duplicates of the job that was kept, not of this dropped one.
+                self.exact_keys[digest] = kept_row
+                keep_mask[index] = False
+            else:
+                self.exact_keys[digest] = row
+                self.keep(row, signature, keys)
+        self.rows_read += len(jobs_df)
+        return jobs_df[keep_mask]
+
+    def clusters(self):
+        """
+        Group the duplicates found so far by the job that was kept.
+
+        Returns:
+        - dict: For each kept row with duplicates, the list of (row, "exact" or "near", similarity), in row order.
+        """
+        clusters = {}
+        for kept_row, row, kind, similarity in sorted(self.duplicates):
+            clusters.setdefault(kept_row, []).append((row, kind, similarity))
+        return clusters
+
+    def stats(self):
+        """
+        Summarize the deduplication.
+
+        Returns:
+        - dict: The number of rows read and kept, of exact and near duplicates, and of clusters.
+        """
+        exact = sum(1 for duplicate in self.duplicates if duplicate[2] == "exact")
+        return {
+            "rows": self.rows_read,
+            "kept": self.rows_read - len(self.duplicates),
+            "exact": exact,
+            "near": len(self.duplicates) - exact,
+            "clusters": len({duplicate[0] for duplicate in self.duplicates}),
+        }
@@ -0,0 +1,188 @@
+import numpy as np
+import re
+
+FILTER_COLUMNS = ("Location", "Experience Level", "Industry")
+SALARY_COLUMN = "Salary Range"
+SALARY_PATTERN = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*([kK])?")
+
+
+def normalize_value(value):
+    """
+    Normalize a metadata value so that filters ignore case and surrounding spaces.
+
+    Parameters:
+    - value: The value of a job column.
+
+    Returns:
+    - str: The normalized value.
+    """
+    return str(value).strip().casefold()
+
+
+def parse_salary_range(text):
+    """
+    Parse a salary range such as "£40,000 - £60,000" or "$50k-$70k" into numbers. The currency is ignored.
+
+    Parameters:
+    - text (str): The salary range.
+
+    Returns:
+    - tuple: The lowest and highest salary of the range (equal for a single amount), or (nan, nan)
+      if the text has no amount.
+    """
+    amounts = [float(number.replace(",", "")) * (1000 if thousands else 1)
+               for number, thousands in SALARY_PATTERN.findall(str(text))]
+    if not amounts:
+        return np.nan, np.nan
+    return min(amounts), max(amounts)
+
+
+def describe_filters(filters):
+    """
+    Describe filters in a canonical form, e.g. for reports and to tell apart results obtained with other filters.
+
+    Parameters:
+    - filters (dict or None): The filters, see JobFilters.select.
+
+    Returns:
+    - str: The description, empty when nothing is filtered.
+    """
+    filters = filters or {}
+    parts = []
+    for column in FILTER_COLUMNS:
+        if filters.get(column):
+            parts.append(f"{column}: {', '.join(sorted(str(value) for value in filters[column]))}")
+    for name, label in (("min_salary", "Salary from"), ("max_salary", "Salary up to")):
+        if filters.get(name) is not None:
+            parts.append(f"{label}: {filters[name]:g}")
+    return "; ".join(parts)
+
+
+class JobFilters:
+    """
+    Metadata of the jobs precomputed once, so that filters are resolved without scanning the job table.
+
+    For each of FILTER_COLUMNS the rows are grouped by value: the row ids of every value are stored
+    contiguously and sorted, so the rows of a value are a slice. The salary ranges are parsed once and
+    kept sorted by their bounds, so a salary filter is a binary search.
+    """
+
+    def __init__(self, jobs_df):
+        """
+        Build the row-id lists and the salary bounds.
+
+        Parameters:
+        - jobs_df (pandas DataFrame): The job offers.
+        """
+        import pandas as pd
+
+        self.n_rows = len(jobs_df)
+        self.columns = {}
+        for column in FILTER_COLUMNS:
+            if column not in jobs_df.columns:
+                continue
+            values = jobs_df[column]
+            codes, uniques = pd.factorize(values.astype(str).str.strip().str.casefold().where(values.notna()))
+            # Values are shown as first written in the dataset.
+            first_rows = np.unique(codes[codes >= 0], return_index=True)[1]
+            first_rows = np.flatnonzero(codes >= 0)[first_rows]
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            self.columns[column] = {
+                "codes": {value: code for code, value in enumerate(uniques)},
+                "labels": [str(value).strip() for value in values.iloc[first_rows]],
+                "order": np.argsort(np.where(codes >= 0, codes, len(uniques)), kind="stable")[:counts.sum()],
+                "offsets": np.concatenate(([0], np.cumsum(counts))),
+            }
+
+        self.salary_min = self.salary_max = None
+        if SALARY_COLUMN in jobs_df.columns:
+            # Salary ranges repeat across postings, so each distinct text is parsed once.
+            codes, uniques = pd.factorize(jobs_df[SALARY_COLUMN].astype(str))
+            bounds = np.array([parse_salary_range(text) for text in uniques], dtype=np.float64).reshape(-1, 2)
+            self.salary_min, self.salary_max = bounds[codes, 0], bounds[codes, 1]
+            self.by_salary_min = np.argsort(self.salary_min, kind="stable")
+            self.by_salary_max = np.argsort(self.salary_max, kind="stable")
+            self.sorted_salary_min = self.salary_min[self.by_salary_min]
+            self.sorted_salary_max = self.salary_max[self.by_salary_max]
+
+    def choices(self, column):
+        """
+        Return the values a column can be filtered on.
+
+        Parameters:
+        - column (str): One of FILTER_COLUMNS.
+
+        Returns:
+        - list: The distinct values of the column, sorted; empty if the dataset has no such column.
+        """
+        if column not in self.columns:
+            return []
+        return sorted(self.columns[column]["labels"], key=str.casefold)
+
+    def rows_with_values(self, column, values):
+        """
+        Return the rows whose column has one of the given values.
+
+        Parameters:
+        - column (str): One of FILTER_COLUMNS.
+        - values (list): The accepted values (case-insensitive).
+
+        Returns:
+        - numpy array: The sorted row ids.
+        """
+        if column not in self.columns:
+            raise ValueError(f"The dataset has no {column} column to filter on.")
+        index = self.columns[column]
+        codes = {index["codes"].get(normalize_value(value)) for value in values} - {None}
+        slices = [index["order"][index["offsets"][code]:index["offsets"][code + 1]] for code in codes]
+        return np.sort(np.concatenate(slices)) if slices else np.empty(0, dtype=np.int64)
+
+    def rows_with_salary(self, min_salary=None, max_salary=None):
+        """
+        Return the rows whose salary range overlaps [min_salary, max_salary]. Jobs without a salary are excluded.
+
+        Parameters:
+        - min_salary (float or None): Lowest acceptable salary.
+        - max_salary (float or None): Highest acceptable salary.
+
+        Returns:
+        - numpy array: The sorted row ids.
+        """
+        if self.salary_min is None:
+            raise ValueError(f"The dataset has no {SALARY_COLUMN} column to filter on.")
+        rows = None
+        if min_salary is not None:
+            # NaN bounds sort last, so they fall outside both searches.
+            start = np.searchsorted(self.sorted_salary_max, min_salary, side="left")
+            end = np.searchsorted(self.sorted_salary_max, np.inf, side="right")
+            rows = self.by_salary_max[start:end]
+        if max_salary is not None:
+            below = self.by_salary_min[:np.searchsorted(self.sorted_salary_min, max_salary, side="right")]
+            rows = below if rows is None else np.intersect1d(rows, below, assume_unique=True)
+        return np.sort(rows)
+
+    def select(self, filters):
+        """
+        Resolve filters into the rows that satisfy all of them.
+
+        Parameters:
+        - filters (dict or None): For each of FILTER_COLUMNS, a list of accepted values (any of them matches),
+          plus optional "min_salary" and "max_salary" amounts. Empty or None entries are ignored.
+
+        Returns:
+        - numpy array or None: The sorted row ids, or None if nothing is filtered.
+        """
+        filters = filters or {}
+        unknown = set(filters) - set(FILTER_COLUMNS) - {"min_salary", "max_salary"}
+        if unknown:
+            raise ValueError(f"Unsupported job filters: {sorted(unknown)}. Expected {FILTER_COLUMNS} or a salary.")
+        selections = [self.rows_with_values(column, filters[column]) for column in FILTER_COLUMNS if filters.get(column)]
+        if filters.get("min_salary") is not None or filters.get("max_salary") is not None:
+            selections.append(self.rows_with_salary(filters.get("min_salary"), filters.get("max_salary")))
+        if not selections:
+            return None
+        rows = min(selections, key=len)
+        for selection in selections:
+            if selection is not rows:
+                rows = np.intersect1d(rows, selection, assume_unique=True)
+        return rows
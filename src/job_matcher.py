@@ -1,40 +1,195 @@
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
-import pandas as pd
 import os
+import sys
+import time
 import json
 from utils import send_request_to_api
+from pdf import summarize_text
+from embedding_store import (
+    sync_embeddings, normalize_embeddings, file_hash, store_is_current, open_embeddings, load_jobs_table,
+    load_metadata, BUILD_CHUNK_ROWS
+)
+from vector_index import ExactIndex, load_or_build_index, top_k_indices
+from lexical_index import get_lexical_mode, load_or_build_lexical_index, reciprocal_rank_fusion
+from job_filters import JobFilters
+from parallel_encoding import EncoderPool, encoding_settings
+from encoders import load_embedding_model, embedding_model_id, get_encoder_backend
 
+TOP_K_JOBS = 5
+ENCODE_BATCH_SIZE = 32
+MATCH_MODES = ("llm", "embedding")
+CV_CHUNK_WORDS = 200
+CV_CHUNK_OVERLAP = 50
+LOW_SIMILARITY = 50
+HIGH_SIMILARITY = 60
+SENIORITY_LEVELS = ("Internship", "Entry-Level", "Junior", "Mid-Level", "Senior")
+CV_PROFILE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "summary": {"type": "STRING"},
+        "job_title": {"type": "STRING"},
+        "skills": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "seniority": {"type": "STRING", "enum": list(SENIORITY_LEVELS)},
+    },
+    "required": ["summary", "job_title", "skills", "seniority"],
+}
 
-def calculate_and_save_embeddings(jobs_file, output_file):
+
+def read_jobs_file(jobs_file):
     """
-    Generate embeddings for job descriptions, required skills, and titles using a pre-trained SentenceTransformer model,
-    then save the embeddings to a specified file.
+    Read the Excel file containing the job offers.
 
     Parameters:
     - jobs_file (str): Path to the Excel file containing job information.
-    - output_file (str): Path to save the calculated embeddings.
 
     Returns:
-    - None
+    - pandas DataFrame: The job offers.
     """
-    model = SentenceTransformer(os.getenv("MODEL_EMBEDDINGS"))
-    column_names = os.getenv("COLUMNS_EXCEL_EMBEDDINGS")
-    column_names = json.loads(column_names)
     try:
-        jobs_df = pd.read_excel(jobs_file)
+        import pandas as pd
+        return pd.read_excel(jobs_file)
     except FileNotFoundError:
         raise FileNotFoundError(f"The jobs file {jobs_file} was not found.")
     except Exception as e:
         raise RuntimeError(f"Error reading jobs file: {str(e)}") from e
+
+
+def get_dataset_columns(jobs_df, env_name):
+    """
+    Read a list of column names from an environment variable and check they exist in the dataset.
+
+    Parameters:
+    - jobs_df (pandas DataFrame): The job offers.
+    - env_name (str): Name of the environment variable holding a JSON list of columns.
+
+    Returns:
+    - list: The column names.
+    """
+    column_names = json.loads(os.getenv(env_name))
     missing_columns = [col for col in column_names if col not in jobs_df.columns]
     if missing_columns:
-        raise ValueError(f"Missing columns in the dataset for COLUMNS_EXCEL_EMBEDDINGS: {missing_columns}")
-    texts = jobs_df[column_names].agg(" ".join, axis=1).tolist()
-    embeddings = model.encode(texts)
-    np.save(output_file, embeddings)
+        raise ValueError(f"Missing columns in the dataset for {env_name}: {missing_columns}")
+    return column_names
+
+
+def iter_jobs_file(jobs_file, chunk_rows=BUILD_CHUNK_ROWS):
+    """
+    Read the job offers in chunks of rows, so that large catalogs are never loaded whole. Excel files
+    are streamed with openpyxl in read-only mode; CSV and Parquet files are also supported.
+
+    Parameters:
+    - jobs_file (str): Path to the file containing job information (.xlsx, .csv or .parquet).
+    - chunk_rows (int): Number of rows per chunk.
+
+    Returns:
+    - generator: The job offers as pandas DataFrames of at most `chunk_rows` rows, in file order.
+    """
+    import pandas as pd
+    extension = os.path.splitext(jobs_file)[1].lower()
+    if extension == ".csv":
+        yield from pd.read_csv(jobs_file, chunksize=chunk_rows)
+        return
+    if extension == ".parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(jobs_file).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+        return
+
+    from openpyxl import load_workbook
+    workbook = load_workbook(jobs_file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(value) if value is not None else f"Unnamed: {index}" for index, value in enumerate(next(rows))]
+        chunk = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            chunk.append(row)
+            if len(chunk) == chunk_rows:
+                yield pd.DataFrame(chunk, columns=header)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=header)
+    finally:
+        workbook.close()
+
+
+def print_build_progress(start_time):
+    """
+    Build a progress callback that writes the embedding build progress and speed on stderr.
+
+    Parameters:
+    - start_time (float): time.perf_counter() when the build started.
+
+    Returns:
+    - callable: The callback, called as progress(rows_done, total_rows, rows_encoded, rows_reused).
+    """
+    def progress(rows_done, total_rows, rows_encoded, rows_reused):
+        elapsed_time = max(time.perf_counter() - start_time, 1e-9)
+        # The speed counts every row finished by this run, copied from the old store or encoded.
+        sys.stderr.write(f"\rEmbeddings: {rows_done}/{total_rows} rows, {rows_encoded} encoded, "
+                         f"{rows_reused} reused ({(rows_encoded + rows_reused) / elapsed_time:.0f} rows/s)   ")
+        if rows_done == total_rows:
+            sys.stderr.write("\n")
+        sys.stderr.flush()
+    return progress
+
+
+def calculate_and_save_embeddings(jobs_file, output_file):
+    """
+    Generate embeddings for job descriptions, required skills, and titles using a pre-trained SentenceTransformer model,
+    then save the embeddings to a specified file. The model runs on the EMBEDDINGS_BACKEND backend; switching
+    backend rebuilds the store.
+
+    The embeddings file keeps a content hash of every row, the model name and the dimension, so that when the
+    dataset changes only the added or changed rows are encoded again and deleted rows are dropped. Next to it,
+    the job columns are saved as a Parquet table aligned by row id. When the jobs file has not changed, the
+    store is memory-mapped without parsing the jobs file. Otherwise the jobs file is streamed in chunks of
+    EMBEDDINGS_CHUNK_ROWS rows, encoded EMBEDDINGS_BATCH_SIZE texts at a time (split across EMBEDDINGS_WORKERS
+    processes when it is more than 1), and an interrupted build resumes on the next run.
+
+    Parameters:
+    - jobs_file (str): Path to the Excel file containing job information.
+    - output_file (str): Path to save the calculated embeddings.
 
+    Returns:
+    - numpy memmap: The L2-normalized embeddings, aligned with the rows of the jobs file.
+    """
+    model_name = os.getenv("MODEL_EMBEDDINGS")
+    backend = get_encoder_backend()
+    model_id = embedding_model_id(model_name, backend)
+    column_names = json.loads(os.getenv("COLUMNS_EXCEL_EMBEDDINGS"))
+    dtype = os.getenv("EMBEDDINGS_DTYPE", "float32")
+    if not os.path.exists(jobs_file):
+        raise FileNotFoundError(f"The jobs file {jobs_file} was not found.")
+    source_hash = file_hash(jobs_file)
+    if store_is_current(output_file, source_hash, model_id, column_names, dtype):
+        return open_embeddings(output_file)
+
+    batch_size = int(os.getenv("EMBEDDINGS_BATCH_SIZE", ENCODE_BATCH_SIZE))
+    chunk_rows = int(os.getenv("EMBEDDINGS_CHUNK_ROWS", BUILD_CHUNK_ROWS))
+
+    def chunks():
+        for index, jobs_df in enumerate(iter_jobs_file(jobs_file, chunk_rows)):
+            if index == 0:
+                get_dataset_columns(jobs_df, "COLUMNS_EXCEL_EMBEDDINGS")
+            yield jobs_df
+
+    settings = encoding_settings()
+    with EncoderPool(model_name, settings["workers"], settings["threads"], batch_size, backend) as pool:
+        def encode(texts):
+            if settings["workers"] > 1:
+                return pool.encode(texts)
+            return load_embedding_model(model_name, backend).encode(texts, batch_size=batch_size)
+
+        embeddings, changes = sync_embeddings(
+            chunks(), output_file, model_id, column_names, encode, source_hash, dtype, chunk_rows,
+            print_build_progress(time.perf_counter())
+        )
+    if changes["encoded"] or changes["removed"]:
+        print(f"Embeddings updated: {changes['reused']} reused, {changes['encoded']} encoded, "
+              f"{changes['removed']} removed.")
+    return embeddings
 
 
 def load_embeddings(output_file):
@@ -45,10 +200,66 @@ def load_embeddings(output_file):
     output_file (str): The path to the file containing the embeddings.
 
     Returns:
-    numpy array: The loaded embeddings.
+    numpy memmap: The loaded embeddings, memory-mapped read-only.
     """
-    embeddings = np.load(output_file)
-    return embeddings
+    return open_embeddings(output_file)
+
+
+def get_match_mode(mode=None):
+    """
+    Resolve the matching mode of a run.
+
+    "llm" asks Gemini to predict the job from the CV and searches with the predicted job; "embedding"
+    embeds the CV itself with the local model and skips the prediction round trip.
+
+    Parameters:
+    - mode (str or None): The requested mode; MATCH_MODE (default "llm") if None.
+
+    Returns:
+    - str: The matching mode.
+    """
+    mode = mode or os.getenv("MATCH_MODE") or "llm"
+    if mode not in MATCH_MODES:
+        raise ValueError(f"Unsupported matching mode: {mode}. Expected one of {MATCH_MODES}.")
+    return mode
+
+
+def chunk_text(text, chunk_words=CV_CHUNK_WORDS, overlap=CV_CHUNK_OVERLAP):
+    """
+    Split a text into overlapping chunks of words that fit in the embedding model's input length.
+
+    Parameters:
+    - text (str): The text to split.
+    - chunk_words (int): Number of words per chunk.
+    - overlap (int): Number of words shared by consecutive chunks.
+
+    Returns:
+    - list: The chunks (a single empty string for an empty text).
+    """
+    words = text.split()
+    if len(words) <= chunk_words:
+        return [" ".join(words)]
+    step = max(1, chunk_words - overlap)
+    return [" ".join(words[start:start + chunk_words]) for start in range(0, len(words) - overlap, step)]
+
+
+def similarity_level(similarity_percentage):
+    """
+    Classify a similarity percentage as low (< 50%), medium (50%-60%) or high (>= 60%).
+
+    Parameters:
+    - similarity_percentage (int or None): The similarity percentage.
+
+    Returns:
+    - str or None: "low", "medium" or "high", or None if the percentage is unknown.
+    """
+    if similarity_percentage is None:
+        return None
+    if similarity_percentage < LOW_SIMILARITY:
+        return "low"
+    if similarity_percentage < HIGH_SIMILARITY:
+        return "medium"
+    return "high"
 
 
 def generate_opinion_details(cv_text, best_job):
@@ -96,51 +307,414 @@ def predict_job(cv_text):
         raise RuntimeError(f"An unexpected error occurred: {str(e)}") from e
 
 
-def check_predicted_job_similarity(cv_text, jobs_file, embeddings):
+def validate_cv_profile(profile):
     """
-    Check the similarity between the predicted job and job embeddings from a file.
+    Check that a CV profile returned by the API follows CV_PROFILE_SCHEMA.
 
     Parameters:
-    - predicted_job (str): The predicted job title or description.
-    - jobs_file (str): Path to the Excel file containing job offers.
-    - embeddings (list): Precomputed embeddings for the job offers.
+    - profile: The decoded JSON response.
 
     Returns:
-    - str: The most similar job's details and similarity score.
+    - dict: The profile, with surrounding whitespace stripped and empty skills dropped.
+
+    Raises:
+    - ValueError: If a field is missing, has the wrong type or is empty.
+    """
+    if not isinstance(profile, dict):
+        raise ValueError("The CV profile is not a JSON object.")
+    for field in ("summary", "job_title", "seniority"):
+        if not isinstance(profile.get(field), str) or not profile[field].strip():
+            raise ValueError(f"The CV profile has no valid '{field}'.")
+    skills = profile.get("skills")
+    if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        raise ValueError("The CV profile has no valid 'skills'.")
+    if profile["seniority"].strip() not in SENIORITY_LEVELS:
+        raise ValueError(f"Unknown seniority in the CV profile: {profile['seniority']}")
+    return {
+        "summary": profile["summary"].strip(),
+        "job_title": profile["job_title"].strip(),
+        "skills": [skill.strip() for skill in skills if skill.strip()],
+        "seniority": profile["seniority"].strip(),
+    }
+
+
+def analyze_cv(cv_text):
+    """
+    Summarize a CV and predict the most suitable job with a single JSON-mode API call.
+
+    The response must follow CV_PROFILE_SCHEMA and is only cached once validated; if the call fails or the
+    response is not valid, the separate summarize and predict calls are used instead.
+
+    Parameters:
+    - cv_text (str): The text of the CV.
+
+    Returns:
+    - dict: The "summary", the "predicted_job" used for matching (job title and skills), and the
+      "job_title", "skills" and "seniority" (None when the fallback was used).
     """
-    os.environ["TOKENIZERS_PARALLELISM"] = "false"
-    model = SentenceTransformer(os.getenv("MODEL_EMBEDDINGS"))
+    prompt = ("Summarize the following CV and predict the most suitable job for it. Return the summary, "
+              "the job title, the list of the main skills and the seniority of the candidate "
+              f"({', '.join(SENIORITY_LEVELS)}): {cv_text}")
     try:
-        jobs_df = pd.read_excel(jobs_file)
-    except FileNotFoundError:
-        raise FileNotFoundError(f"The jobs file {jobs_file} was not found.")
+        profile = send_request_to_api(
+            prompt, response_schema=CV_PROFILE_SCHEMA, validate=lambda text: validate_cv_profile(json.loads(text))
+        )
     except Exception as e:
-        raise RuntimeError(f"Error reading jobs file: {str(e)}") from e
-    predicted_job = predict_job(cv_text)
-    predicted_job_embedding = model.encode([predicted_job])
-    jobs_df["Similarity"] = cosine_similarity(predicted_job_embedding, embeddings)[0]
-    best_match = jobs_df.sort_values(by="Similarity", ascending=False).iloc[0]
-    # similarity_score = best_match["Similarity"] * 100
-
-    column_names = os.getenv("COLUMNS_EXCEL_BEST_JOB")
-    column_names = json.loads(column_names)
-    missing_columns = [col for col in column_names if col not in jobs_df.columns]
-    if missing_columns:
-        raise ValueError(f"Missing columns in the dataset for COLUMNS_EXCEL_BEST_JOB: {missing_columns}")
-    best_job_details = "\n".join(
-        [f"{col}: {best_match[col]}" for col in column_names]
-    )
+        print(f"JSON CV analysis failed, using separate calls: {e}")
+        summary = summarize_text(cv_text)
+        return {"summary": summary, "predicted_job": predict_job(summary),
+                "job_title": None, "skills": None, "seniority": None}
+    profile["predicted_job"] = ", ".join([profile["job_title"], *profile["skills"]])
+    return profile
 
-    column_names = os.getenv("COLUMNS_EXCEL_GENERATE_OPINION")
-    column_names = json.loads(column_names)
-    missing_columns = [col for col in column_names if col not in jobs_df.columns]
-    if missing_columns:
-        raise ValueError(f"Missing columns in the dataset for COLUMNS_EXCEL_GENERATE_OPINION: {missing_columns}")
-    best_match_details = "\n".join(
-        [f"{col}: {best_match[col]}" for col in column_names]
-    )
 
-    additional_details = generate_opinion_details(cv_text, best_match_details)
+class JobMatcher:
+    """
+    Long-lived matching engine that keeps the SentenceTransformer model, the parsed job table
+    and the job embeddings in memory, so that each match only pays for encoding and scoring.
+    """
+
+    def __init__(self, jobs_file, embeddings, embeddings_file=None):
+        """
+        Load the embedding model and the job dataset once.
+
+        Parameters:
+        - jobs_file (str): Path to the Excel file containing job offers.
+        - embeddings (numpy array): Precomputed embeddings for the job offers.
+        - embeddings_file (str or None): Path of the embedding store the embeddings come from. When given, the
+          embeddings are used as stored (already normalized) and the job columns are read from the store's
+          Parquet sidecar instead of the Excel file.
+        """
+        os.environ["TOKENIZERS_PARALLELISM"] = "false"
+        self.jobs_file = jobs_file
+        self.model = load_embedding_model(os.getenv("MODEL_EMBEDDINGS"), get_encoder_backend())
+        signature = ""
+        source_hash = ""
+        if embeddings_file is not None:
+            self.embeddings = embeddings
+            self.jobs_df = load_jobs_table(embeddings_file)
+            metadata = load_metadata(embeddings_file) or {}
+            source_hash = metadata.get("source_hash") or ""
+            # The IVF index is rebuilt when the dataset or the model (and backend) of the embeddings change.
+            signature = f"{metadata.get('source_hash') or ''}:{metadata.get('model') or ''}"
+        else:
+            self.embeddings = normalize_embeddings(embeddings)
+            self.jobs_df = read_jobs_file(jobs_file)
+        n_lists = os.getenv("IVF_N_LISTS")
+        self.index = load_or_build_index(
+            self.embeddings,
+            os.getenv("INDEX_BACKEND", "exact"),
+            embeddings_file,
+            signature,
+            int(n_lists) if n_lists else None,
+            int(os.getenv("IVF_N_PROBE", 8))
+        )
+        self.lexical_mode = get_lexical_mode()
+        self.lexical_candidates = int(os.getenv("LEXICAL_CANDIDATES", 1000))
+        self.lexical_index = None
+        if self.lexical_mode != "off":
+            self.lexical_index = load_or_build_lexical_index(self.jobs_df, embeddings_file, source_hash)
+        self.job_filters = JobFilters(self.jobs_df)
+        self.best_job_columns = get_dataset_columns(self.jobs_df, "COLUMNS_EXCEL_BEST_JOB")
+        self.opinion_columns = get_dataset_columns(self.jobs_df, "COLUMNS_EXCEL_GENERATE_OPINION")
+
+    def encode(self, texts, batch_size=None):
+        """
+        Encode texts into normalized float32 embeddings with a single batched model call.
+
+        Parameters:
+        - texts (list): The texts to encode.
+        - batch_size (int): Number of texts the model encodes at once (EMBEDDINGS_BATCH_SIZE by default).
+
+        Returns:
+        - numpy array: One normalized embedding per text.
+        """
+        if batch_size is None:
+            batch_size = int(os.getenv("EMBEDDINGS_BATCH_SIZE", ENCODE_BATCH_SIZE))
+        return normalize_embeddings(self.model.encode(texts, batch_size=batch_size))
+
+    def retrieve(self, query_texts, query_embeddings, k=TOP_K_JOBS, filters=None):
+        """
+        Search the jobs for many queries, using the lexical index as LEXICAL_SEARCH says: not at all ("off"),
+        to restrict the dense scoring to the jobs sharing terms with the query ("prune"), or to fuse the
+        lexical and dense rankings ("fusion").
+
+        Parameters:
+        - query_texts (list): The query texts, e.g. the predicted job titles and skills.
+        - query_embeddings (numpy array): Matrix with the normalized embedding of each query.
+        - k (int): Number of jobs to return per query.
+        - filters (dict or None): Metadata filters the jobs must satisfy, see JobFilters.select.
+
+        Returns:
+        - list: For each query, a list of tuples (row index in the jobs dataset, cosine similarity), best first;
+          empty if no job satisfies the filters.
+        """
+        rows = self.job_filters.select(filters)
+        if rows is not None and len(rows) == 0:
+            return [[] for _ in query_texts]
+        if self.lexical_index is None:
+            return self.dense_search(query_embeddings, k, rows)
+        if self.lexical_mode == "prune":
+            return [
+                self.pruned_search(text, embedding, k, rows) for text, embedding in zip(query_texts, query_embeddings)
+            ]
+        dense_matches = self.dense_search(query_embeddings, max(k, self.lexical_candidates), rows)
+        return [
+            self.fused_search(text, embedding, matches, k, rows)
+            for text, embedding, matches in zip(query_texts, query_embeddings, dense_matches)
+        ]
+
+    def dense_search(self, query_embeddings, k=TOP_K_JOBS, rows=None):
+        """
+        Search the jobs with the query embeddings only, over all the jobs or over a subset of them.
+
+        Parameters:
+        - query_embeddings (numpy array): Matrix with the normalized embedding of each query.
+        - k (int): Number of jobs to return per query.
+        - rows (numpy array or None): Sorted row ids of the jobs to score (e.g. the ones passing the filters);
+          all the jobs, through the search index, if None.
+
+        Returns:
+        - list: For each query, a list of tuples (row index in the jobs dataset, cosine similarity), best first.
+        """
+        if rows is None:
+            return self.index.search(query_embeddings, k)
+        # Only the rows that pass the filters are read and scored, exactly.
+        matches = ExactIndex(self.embeddings[rows]).search(query_embeddings, k)
+        return [[(int(rows[i]), score) for i, score in query_matches] for query_matches in matches]
+
+    def pruned_search(self, query_text, query_embedding, k=TOP_K_JOBS, rows=None):
+        """
+        Score with the embeddings only the LEXICAL_CANDIDATES jobs with the best BM25 score for the query.
+        Falls back to the dense search when fewer than k jobs share a term with the query.
+
+        Parameters:
+        - query_text (str): The query text.
+        - query_embedding (numpy array): The normalized embedding of the query.
+        - k (int): Number of jobs to return.
+        - rows (numpy array or None): Sorted row ids the jobs are restricted to; all if None.
+
+        Returns:
+        - list: Tuples of (row index in the jobs dataset, cosine similarity), best first.
+        """
+        candidates, lexical_scores = self.lexical_index.score(query_text, rows)
+        if len(candidates) < k:
+            return self.dense_search(query_embedding[np.newaxis], k, rows)[0]
+        candidates = np.sort(candidates[top_k_indices(lexical_scores, self.lexical_candidates)])
+        scores = np.asarray(self.embeddings[candidates], dtype=np.float32) @ query_embedding
+        return [(int(candidates[i]), float(scores[i])) for i in top_k_indices(scores, k)]
+
+    def fused_search(self, query_text, query_embedding, dense_matches, k=TOP_K_JOBS, rows=None):
+        """
+        Rank the jobs by reciprocal rank fusion of the dense ranking and the BM25 ranking of the query.
+        The similarity reported for each job is still its cosine similarity.
+
+        Parameters:
+        - query_text (str): The query text.
+        - query_embedding (numpy array): The normalized embedding of the query.
+        - dense_matches (list): Tuples of (row index, cosine similarity) of the dense search, best first.
+        - k (int): Number of jobs to return.
+        - rows (numpy array or None): Sorted row ids the jobs are restricted to; all if None.
+
+        Returns:
+        - list: Tuples of (row index in the jobs dataset, cosine similarity), best first by fused rank.
+        """
+        lexical_matches = self.lexical_index.search(query_text, self.lexical_candidates, rows)
+        rows = reciprocal_rank_fusion([[row for row, _ in dense_matches], [row for row, _ in lexical_matches]])[:k]
+        cosines = dict(dense_matches)
+        missing = [row for row in rows if row not in cosines]
+        if missing:
+            scores = np.asarray(self.embeddings[missing], dtype=np.float32) @ query_embedding
+            cosines.update(zip(missing, scores.tolist()))
+        return [(int(row), float(cosines[row])) for row in rows]
+
+    def top_k(self, predicted_job, k=TOP_K_JOBS, filters=None):
+        """
+        Return the k jobs most similar to a predicted job.
+
+        Parameters:
+        - predicted_job (str): The predicted job title or description.
+        - k (int): Number of jobs to return.
+        - filters (dict or None): Metadata filters the jobs must satisfy, see JobFilters.select.
+
+        Returns:
+        - list: Tuples of (row index in the jobs dataset, cosine similarity), best first.
+        """
+        return self.retrieve([predicted_job], self.encode([predicted_job]), k, filters)[0]
+
+    def top_k_batch(self, predicted_jobs, k=TOP_K_JOBS, batch_size=None, filters=None):
+        """
+        Return the k jobs most similar to each of many predicted jobs.
+
+        All the predicted jobs are encoded in one batched model call and, with the exact index,
+        scored against the jobs with a single (M x D) . (D x N) matrix product.
 
-    best_job_details += f"\n\nOpinion on matched job:\n{additional_details}"
-    return best_job_details
+        Parameters:
+        - predicted_jobs (list): The predicted job titles or descriptions.
+        - k (int): Number of jobs to return per predicted job.
+        - batch_size (int): Number of texts the model encodes at once.
+        - filters (dict or None): Metadata filters the jobs must satisfy, see JobFilters.select.
+
+        Returns:
+        - list: For each predicted job, a list of tuples (row index in the jobs dataset, cosine similarity), best first.
+        """
+        if not predicted_jobs:
+            return []
+        return self.retrieve(predicted_jobs, self.encode(predicted_jobs, batch_size), k, filters)
+
+    def embed_cvs(self, cv_texts, batch_size=None):
+        """
+        Embed CV texts directly: each CV is split into chunks, all the chunks of all the CVs are encoded
+        in one batched call, and the chunk embeddings of each CV are mean-pooled and normalized.
+
+        Parameters:
+        - cv_texts (list): The texts of the CVs.
+        - batch_size (int): Number of chunks the model encodes at once.
+
+        Returns:
+        - numpy array: One normalized embedding per CV.
+        """
+        chunks = [chunk_text(cv_text) for cv_text in cv_texts]
+        chunk_embeddings = self.encode([chunk for cv_chunks in chunks for chunk in cv_chunks], batch_size)
+        bounds = np.cumsum([0] + [len(cv_chunks) for cv_chunks in chunks])
+        return normalize_embeddings(
+            np.stack([chunk_embeddings[start:end].mean(axis=0) for start, end in zip(bounds[:-1], bounds[1:])])
+        )
+
+    def top_k_cvs(self, cv_texts, k=TOP_K_JOBS, batch_size=None, filters=None):
+        """
+        Return the k jobs most similar to each CV, searching with the CV embeddings instead of a predicted job.
+
+        Parameters:
+        - cv_texts (list): The texts of the CVs.
+        - k (int): Number of jobs to return per CV.
+        - batch_size (int): Number of chunks the model encodes at once.
+        - filters (dict or None): Metadata filters the jobs must satisfy, see JobFilters.select.
+
+        Returns:
+        - list: For each CV, a list of tuples (row index in the jobs dataset, cosine similarity), best first.
+        """
+        if not cv_texts:
+            return []
+        return self.retrieve(cv_texts, self.embed_cvs(cv_texts, batch_size), k, filters)
+
+    def match(self, cv_text, k=1, mode=None, opinion=True, predicted_job=None, filters=None):
+        """
+        Find the job offers most similar to a CV and describe the best one.
+
+        Parameters:
+        - cv_text (str): The text of the CV.
+        - k (int): Number of jobs to retrieve; the ones after the best are listed as alternatives.
+        - mode (str or None): "llm" to search with the job predicted by Gemini, "embedding" to search with
+          the CV embedding (MATCH_MODE by default).
+        - opinion (bool): Whether to ask Gemini for an opinion on the match.
+        - predicted_job (str or None): The job already predicted for this CV (e.g. by `analyze_cv`), so that
+          "llm" mode does not ask for it again.
+        - filters (dict or None): Metadata filters the jobs must satisfy, see JobFilters.select.
+
+        Returns:
+        - dict: The match result, see `describe_match`.
+        """
+        if get_match_mode(mode) == "embedding":
+            matches = self.top_k_cvs([cv_text], k, filters=filters)[0]
+        else:
+            matches = self.top_k(predicted_job or predict_job(cv_text), k, filters)
+        return self.describe_match(cv_text, matches, opinion)
+
+    def describe_match(self, cv_text, matches, opinion=True, opinion_min_similarity=0):
+        """
+        Describe the best job for a CV: its details, the cosine similarity, the opinion of Gemini on the
+        match and the alternatives.
+
+        The similarity reported (and used to classify the match) is the cosine similarity computed by the
+        search. The opinion costs one API call, so it is skipped when the similarity is below
+        `opinion_min_similarity`: a clear mismatch does not need an explanation.
+
+        Parameters:
+        - cv_text (str): The text of the CV.
+        - matches (list): Tuples of (row index in the jobs dataset, cosine similarity), best first.
+        - opinion (bool): Whether to ask Gemini for an opinion.
+        - opinion_min_similarity (float): Minimum similarity percentage for the opinion, on the scale of the
+          cosine similarity (0 asks for an opinion on every match).
+
+        Returns:
+        - dict: The "row" and cosine "score" of the best job, its "similarity" percentage and "level",
+          its "details", the "opinion" (None if skipped), the "alternatives" as (row, score) tuples
+          and the whole result as "text".
+        """
+        if not matches:
+            raise ValueError("No job matches the filters.")
+        row, score = matches[0]
+        best_match = self.jobs_df.iloc[row]
+        similarity_percentage = round(score * 100)
+
+        best_job_details = "\n".join(
+            [f"{col}: {best_match[col]}" for col in self.best_job_columns]
+        )
+        additional_details = None
+        if opinion and similarity_percentage >= opinion_min_similarity:
+            best_match_details = "\n".join(
+                [f"{col}: {best_match[col]}" for col in self.opinion_columns]
+            )
+            additional_details = generate_opinion_details(cv_text, best_match_details)
+
+        text = f"{best_job_details}\n\nSimilarity score: {similarity_percentage}%"
+        if additional_details is not None:
+            text += f"\n\nOpinion on matched job:\n{additional_details}"
+        if len(matches) > 1:
+            text += "\n\nOther matching jobs:\n" + "\n".join(
+                [f"- {self.jobs_df.iloc[row][self.best_job_columns[0]]} ({score * 100:.1f}%)" for row, score in matches[1:]]
+            )
+        return {
+            "row": int(row),
+            "score": float(score),
+            "similarity": similarity_percentage,
+            "level": similarity_level(similarity_percentage),
+            "details": best_job_details,
+            "opinion": additional_details,
+            "alternatives": [(int(row), float(score)) for row, score in matches[1:]],
+            "text": text,
+        }
+
+
+_job_matchers = {}
+
+
+def get_job_matcher(jobs_file, embeddings, embeddings_file=None):
+    """
+    Return the shared JobMatcher for a jobs file and embeddings, creating it on first use.
+
+    Parameters:
+    - jobs_file (str): Path to the Excel file containing job offers.
+    - embeddings (numpy array): Precomputed embeddings for the job offers.
+    - embeddings_file (str or None): Path of the embedding store the embeddings come from.
+
+    Returns:
+    - JobMatcher: The cached matching engine.
+    """
+    # The entry keeps the embeddings it was built with: an id() could be reused by another array once that one
+    # is collected, so the cached matcher is only reused for the very same array.
+    key = (jobs_file, embeddings_file)
+    cached = _job_matchers.get(key)
+    if cached is None or cached[0] is not embeddings:
+        cached = _job_matchers[key] = (embeddings, JobMatcher(jobs_file, embeddings, embeddings_file))
+    return cached[1]
+
+
+def check_predicted_job_similarity(cv_text, jobs_file, embeddings, embeddings_file=None):
+    """
+    Check the similarity between the predicted job and job embeddings from a file.
+
+    Parameters:
+    - cv_text (str): The text of the CV.
+    - jobs_file (str): Path to the Excel file containing job offers.
+    - embeddings (list): Precomputed embeddings for the job offers.
+    - embeddings_file (str or None): Path of the embedding store the embeddings come from (PATH_EMBEDDINGS by
+      default), whose job table keeps the rows aligned with the embeddings.
+
+    Returns:
+    - str: The most similar job's details and similarity score.
+    """
+    if embeddings_file is None:
+        embeddings_file = os.getenv("PATH_EMBEDDINGS")
+    return get_job_matcher(jobs_file, embeddings, embeddings_file).match(cv_text)["text"]
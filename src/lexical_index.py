@@ -0,0 +1,254 @@
+import numpy as np
+import os
+import re
+from collections import Counter
+from vector_index import index_path, top_k_indices
+
+LEXICAL_MODES = ("off", "prune", "fusion")
+LEXICAL_COLUMNS = ["Job Title", "Required Skills"]
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOP_WORDS = frozenset(["a", "an", "and", "as", "at", "by", "for", "in", "of", "on", "or", "the", "to", "with"])
+RRF_K = 60
+
+
+def tokenize(text):
+    """
+    Split a text into lowercase terms, keeping skill names such as "c++", "c#" and "node.js" whole.
+
+    Parameters:
+    - text (str): The text to tokenize.
+
+    Returns:
+    - list: The terms, stop words removed.
+    """
+    return [term for term in TOKEN_PATTERN.findall(str(text).lower()) if term not in STOP_WORDS]
+
+
+def get_lexical_mode(mode=None):
+    """
+    Resolve how the lexical index is used by the matcher.
+
+    Parameters:
+    - mode (str or None): "off" (dense search only), "prune" (dense scoring of the lexical candidates only)
+      or "fusion" (reciprocal rank fusion of the lexical and dense rankings); LEXICAL_SEARCH (default "off") if None.
+
+    Returns:
+    - str: The mode.
+    """
+    mode = mode or os.getenv("LEXICAL_SEARCH") or "off"
+    if mode not in LEXICAL_MODES:
+        raise ValueError(f"Unsupported lexical search mode: {mode}. Expected one of {LEXICAL_MODES}.")
+    return mode
+
+
+def reciprocal_rank_fusion(rankings, k=RRF_K):
+    """
+    Fuse several rankings of the same jobs: each job scores the sum of 1 / (k + rank) over the rankings it
+    appears in, so jobs ranked well by both the lexical and the dense search come first.
+
+    Parameters:
+    - rankings (list): Lists of row indices, best first.
+    - k (int): Smoothing constant; larger values flatten the difference between the top ranks.
+
+    Returns:
+    - list: The row indices ordered by fused score, best first.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking, start=1):
+            scores[row] = scores.get(row, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=lambda row: -scores[row])
+
+
+class LexicalIndex:
+    """
+    Inverted index over the terms of the job titles and required skills, scored with BM25.
+
+    The postings of every term are stored contiguously (CSR layout) with their precomputed BM25 weight,
+    so scoring a query only touches the postings of its terms and costs nothing for the other jobs.
+    """
+
+    name = "bm25"
+
+    def __init__(self, k1=1.2, b=0.75):
+        """
+        Parameters:
+        - k1 (float): BM25 term frequency saturation.
+        - b (float): BM25 document length normalization.
+        """
+        self.k1 = k1
+        self.b = b
+        self.terms = {}
+        self.offsets = None
+        self.rows = None
+        self.weights = None
+        self.n_rows = 0
+
+    def build(self, texts):
+        """
+        Tokenize the job texts and build the postings.
+
+        Parameters:
+        - texts (list): One text per job row.
+
+        Returns:
+        - LexicalIndex: The index itself.
+        """
+        term_ids, rows, frequencies, lengths = [], [], [], []
+        # Catalogs repeat the same title and skills many times, so each distinct text is tokenized once.
+        postings = {}
+        for row, text in enumerate(texts):
+            if text not in postings:
+                counts = Counter(tokenize(text))
+                postings[text] = ([self.terms.setdefault(term, len(self.terms)) for term in counts],
+                                  list(counts.values()))
+            text_terms, text_frequencies = postings[text]
+            lengths.append(sum(text_frequencies))
+            term_ids.extend(text_terms)
+            rows.extend([row] * len(text_terms))
+            frequencies.extend(text_frequencies)
+        self.n_rows = len(texts)
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        rows = np.asarray(rows, dtype=np.int64)
+        frequencies = np.asarray(frequencies, dtype=np.float32)
+        lengths = np.asarray(lengths, dtype=np.float32)
+
+        document_frequencies = np.bincount(term_ids, minlength=len(self.terms))
+        idf = np.log1p((self.n_rows - document_frequencies + 0.5) / (document_frequencies + 0.5))
+        average_length = max(float(lengths.mean()), 1e-9) if len(lengths) else 1.0
+        norms = self.k1 * (1 - self.b + self.b * lengths / average_length)
+        weights = idf[term_ids] * frequencies * (self.k1 + 1) / (frequencies + norms[rows])
+
+        order = np.argsort(term_ids, kind="stable")
+        self.rows = rows[order].astype(np.int32)
+        self.weights = weights[order].astype(np.float32)
+        self.offsets = np.concatenate(([0], np.cumsum(document_frequencies))).astype(np.int64)
+        return self
+
+    def score(self, query, rows=None):
+        """
+        Compute the BM25 score of the jobs that share at least one term with the query.
+
+        Parameters:
+        - query (str): The query text, e.g. the predicted job title and skills.
+        - rows (numpy array or None): Sorted row ids the jobs are restricted to (e.g. by filters); all if None.
+
+        Returns:
+        - tuple: The matching row indices and their BM25 scores (both empty if no term matches).
+        """
+        term_ids = sorted({self.terms[term] for term in tokenize(query) if term in self.terms})
+        if not term_ids:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        postings = [slice(self.offsets[term_id], self.offsets[term_id + 1]) for term_id in term_ids]
+        matched = np.concatenate([self.rows[p] for p in postings])
+        weights = np.concatenate([self.weights[p] for p in postings])
+        if len(matched) * 8 > self.n_rows:
+            # Frequent terms: accumulating over all the rows is cheaper than sorting the postings.
+            scores = np.bincount(matched, weights=weights, minlength=self.n_rows)
+            matched = np.flatnonzero(scores)
+            scores = scores[matched]
+        else:
+            matched, inverse = np.unique(matched, return_inverse=True)
+            scores = np.bincount(inverse, weights=weights)
+        if rows is not None:
+            keep = np.isin(matched, rows, assume_unique=True)
+            matched, scores = matched[keep], scores[keep]
+        return matched.astype(np.int64), scores.astype(np.float32)
+
+    def search(self, query, k, rows=None):
+        """
+        Return the k jobs with the highest BM25 score for a query.
+
+        Parameters:
+        - query (str): The query text.
+        - k (int): Number of jobs to return.
+        - rows (numpy array or None): Sorted row ids the jobs are restricted to; all if None.
+
+        Returns:
+        - list: Tuples of (row index, BM25 score), best first; fewer than k if fewer jobs share a term with the query.
+        """
+        rows, scores = self.score(query, rows)
+        return [(int(rows[i]), float(scores[i])) for i in top_k_indices(scores, k)]
+
+    def save(self, path, signature=""):
+        """
+        Save the index.
+
+        Parameters:
+        - path (str): Path of the .npz file.
+        - signature (str): Identifier of the job table the index was built from, checked when loading.
+        """
+        terms = np.array(sorted(self.terms, key=self.terms.get), dtype=str)
+        temporary_file = path + ".tmp.npz"
+        np.savez(temporary_file, terms=terms, offsets=self.offsets, rows=self.rows, weights=self.weights,
+                 parameters=np.array([self.k1, self.b, self.n_rows]), signature=np.array(signature))
+        os.replace(temporary_file, path)
+
+    @classmethod
+    def load(cls, path, n_rows, signature=""):
+        """
+        Load a saved index.
+
+        Parameters:
+        - path (str): Path of the .npz file.
+        - n_rows (int): Number of jobs the index must cover.
+        - signature (str): Expected identifier of the job table.
+
+        Returns:
+        - LexicalIndex or None: The index, or None if the file is missing or was built from other jobs.
+        """
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            k1, b, saved_rows = data["parameters"]
+            if str(data["signature"]) != signature or int(saved_rows) != n_rows:
+                return None
+            index = cls(float(k1), float(b))
+            index.terms = {term: term_id for term_id, term in enumerate(data["terms"].tolist())}
+            index.offsets = data["offsets"]
+            index.rows = data["rows"]
+            index.weights = data["weights"]
+            index.n_rows = n_rows
+        return index
+
+
+def lexical_texts(jobs_df, column_names=None):
+    """
+    Build the text indexed for each job from its title and required skills.
+
+    Parameters:
+    - jobs_df (pandas DataFrame): The job offers.
+    - column_names (list or None): The indexed columns; LEXICAL_COLUMNS by default, restricted to the ones present.
+
+    Returns:
+    - list: One text per job row.
+    """
+    column_names = [column for column in column_names or LEXICAL_COLUMNS if column in jobs_df.columns]
+    if not column_names:
+        raise ValueError(f"None of the lexical index columns {LEXICAL_COLUMNS} is in the dataset.")
+    columns = jobs_df[column_names].fillna("").astype(str)
+    texts = columns[column_names[0]]
+    for column in column_names[1:]:
+        texts = texts + " " + columns[column]
+    return texts.tolist()
+
+
+def load_or_build_lexical_index(jobs_df, embeddings_file=None, signature=""):
+    """
+    Return the lexical index of the jobs, loading the one saved next to the embeddings when it is current.
+
+    Parameters:
+    - jobs_df (pandas DataFrame): The job offers, aligned with the embeddings.
+    - embeddings_file (str or None): Path of the embedding store; the index is saved next to it.
+    - signature (str): Identifier of the job table, used to detect a stale saved index.
+
+    Returns:
+    - LexicalIndex: The index.
+    """
+    path = index_path(embeddings_file, LexicalIndex.name) if embeddings_file else None
+    index = LexicalIndex.load(path, len(jobs_df), signature) if path else None
+    if index is None:
+        index = LexicalIndex().build(lexical_texts(jobs_df))
+        if path:
+            index.save(path, signature)
+    return index
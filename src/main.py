@@ -1,12 +1,19 @@
+import time
+start_time = time.perf_counter()
+
 import sys, os
 from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
 from dotenv import load_dotenv
 from app import JobMatchingApp
 
 if __name__ == "__main__":
+    imports_time = time.perf_counter() - start_time
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
     load_dotenv(dotenv_path="../.env")
     app = QApplication(sys.argv)
-    window = JobMatchingApp()
+    window = JobMatchingApp(start_time, imports_time)
     window.show()
+    # Runs once the event loop has painted the window for the first time.
+    QTimer.singleShot(0, window.record_first_paint)
     sys.exit(app.exec())
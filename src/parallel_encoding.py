@@ -0,0 +1,120 @@
+import os
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+_worker_model = None
+
+
+def available_cores():
+    """
+    Return the number of cores this process may run on.
+
+    Returns:
+    - int: The number of usable cores.
+    """
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+
+def encoding_settings():
+    """
+    Read the encoding settings from the environment.
+
+    Returns:
+    - dict: The number of encoding "workers" (EMBEDDINGS_WORKERS, 1 by default) and the torch
+      "threads" per worker (EMBEDDINGS_THREADS_PER_WORKER, the cores divided among the workers by default).
+    """
+    workers = os.getenv("EMBEDDINGS_WORKERS")
+    threads = os.getenv("EMBEDDINGS_THREADS_PER_WORKER")
+    return {
+        "workers": int(workers) if workers else 1,
+        "threads": int(threads) if threads else None,
+    }
+
+
+def _init_worker(model_name, threads, backend):
+    """
+    Load the embedding model once in a worker process, limiting torch (or ONNX Runtime) to `threads`
+    threads so that the workers do not compete for the same cores.
+    """
+    global _worker_model
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    import torch
+    from encoders import create_embedding_model
+    torch.set_num_threads(threads)
+    _worker_model = create_embedding_model(model_name, backend, threads)
+
+
+def _encode_shard(texts, batch_size):
+    return _worker_model.encode(texts, batch_size=batch_size)
+
+
+class EncoderPool:
+    """
+    Pool of worker processes that encode texts with the same SentenceTransformer model. Each call is
+    split into contiguous shards, one per worker, and the results are merged back in row order.
+    The processes are started on the first call, so a pool that is never used costs nothing.
+    """
+
+    def __init__(self, model_name, workers, threads_per_worker=None, batch_size=32, backend=None):
+        """
+        Prepare the pool.
+
+        Parameters:
+        - model_name (str): Name of the embedding model.
+        - workers (int): Number of worker processes.
+        - threads_per_worker (int or None): Torch threads per worker; the cores divided among the workers by default.
+        - batch_size (int): Number of texts each worker encodes at once.
+        - backend (str or None): The encoder backend, see encoders.get_encoder_backend.
+        """
+        self.model_name = model_name
+        self.workers = max(1, workers)
+        self.threads_per_worker = threads_per_worker or max(1, available_cores() // self.workers)
+        self.batch_size = batch_size
+        self.backend = backend
+        self.executor = None
+
+    def start(self):
+        """
+        Start the worker processes and load the model in each of them.
+        """
+        if self.executor is None:
+            # Workers are spawned rather than forked: forking a process that already runs torch threads can deadlock.
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_name, self.threads_per_worker, self.backend)
+            )
+            list(self.executor.map(_encode_shard, [["warm-up"]] * self.workers, [1] * self.workers))
+
+    def encode(self, texts):
+        """
+        Encode texts across the worker processes.
+
+        Parameters:
+        - texts (list): The texts to encode.
+
+        Returns:
+        - numpy array: One embedding per text, in the order of the texts.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        self.start()
+        shard_size = -(-len(texts) // self.workers)
+        shards = [texts[start:start + shard_size] for start in range(0, len(texts), shard_size)]
+        return np.concatenate(list(self.executor.map(_encode_shard, shards, [self.batch_size] * len(shards))))
+
+    def close(self):
+        """
+        Stop the worker processes.
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,10 +1,10 @@
-import PyPDF2
 from utils import send_request_to_api
+from extraction import extract_text, extraction_settings
 
 
 def extract_text_from_pdf(pdf_path):
     """
-    Extracts text from a PDF file.
+    Extracts text from a PDF file, reading at most PDF_MAX_PAGES pages.
 
     Parameters:
     pdf_path (str): The path to the PDF file.
@@ -12,12 +12,7 @@ def extract_text_from_pdf(pdf_path):
     Returns:
     str: The extracted text from the PDF.
     """
-    with open(pdf_path, "rb") as file:
-        reader = PyPDF2.PdfReader(file)
-        text = ""
-        for page in range(len(reader.pages)):
-            text += reader.pages[page].extract_text()
-    return text
+    return extract_text(pdf_path, max_pages=extraction_settings()["max_pages"])
 
 
 def summarize_text(text):
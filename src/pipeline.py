@@ -0,0 +1,439 @@
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from openpyxl import Workbook
+from openpyxl.styles import PatternFill, Alignment
+from openpyxl.utils import get_column_letter
+from openpyxl.cell import WriteOnlyCell
+
+from extraction import extract_texts, extraction_settings
+from job_matcher import (
+    analyze_cv, calculate_and_save_embeddings, get_job_matcher, get_match_mode, similarity_level
+)
+from cache import get_response_cache
+from batch_journal import BatchJournal, file_fingerprint
+from job_filters import describe_filters
+from skill_scanner import get_skill_scanner
+
+RED_FILL = PatternFill(start_color="FF9999", end_color="FF9999", fill_type="solid")
+ORANGE_FILL = PatternFill(start_color="FFD580", end_color="FFD580", fill_type="solid")
+GREEN_FILL = PatternFill(start_color="99FF99", end_color="99FF99", fill_type="solid")
+
+
+def load_job_matcher():
+    """
+    Load (or update) the job embeddings configured in the environment and return the shared job matcher.
+
+    Returns:
+    - JobMatcher: The matching engine for PATH_EXCEL_DATASET and PATH_EMBEDDINGS.
+    """
+    jobs_excel = os.getenv("PATH_EXCEL_DATASET")
+    embeddings_file = os.getenv("PATH_EMBEDDINGS")
+    embeddings = calculate_and_save_embeddings(jobs_excel, embeddings_file)
+    return get_job_matcher(jobs_excel, embeddings, embeddings_file)
+
+
+def sort_key(file_name):
+    """
+    Generate a sorting key for a given file name.
+
+    This function parses the file name to extract an alphabetical prefix and a numerical suffix.
+    The prefix is converted to lowercase for consistent sorting, and the numerical suffix is
+    converted to an integer for numerical sorting. If no numerical suffix is present, infinity is
+    used to ensure the prefix is sorted before any numbered variants.
+
+    Parameters:
+    - file_name (str): The name of the file to generate a sorting key for.
+
+    Returns:
+    - tuple: A tuple consisting of the lowercase prefix and the numerical suffix, or infinity if
+      no numerical suffix is found.
+    """
+    match = re.match(r'([a-zA-Z_]*)(\d*)', file_name)
+    if match:
+        prefix = match.group(1)
+        number = match.group(2)
+        number = int(number) if number else float('inf')
+        return prefix.lower(), number
+    else:
+        return file_name.lower(), float('inf')
+
+
+def list_pdf_files(input_directory):
+    """
+    List the PDF files of a folder in natural order.
+
+    Parameters:
+    - input_directory (str): The folder containing the CVs.
+
+    Returns:
+    - list: The PDF file names.
+    """
+    return sorted([f for f in os.listdir(input_directory) if f.endswith(".pdf")], key=sort_key)
+
+
+def journal_path(output_excel):
+    """
+    Return the path of the journal of a batch run.
+
+    Parameters:
+    - output_excel (str): Path of the Excel report.
+
+    Returns:
+    - str: Path of the JSONL journal, next to the report.
+    """
+    return output_excel + ".journal.jsonl"
+
+
+def done_fingerprint(fingerprint, mode, opinion, filters_description):
+    """
+    Identify the result of a CV: the version of the file and every setting the result depends on.
+
+    Parameters:
+    - fingerprint (str): The fingerprint of the file, see file_fingerprint.
+    - mode (str): The matching mode.
+    - opinion (bool): Whether the result includes the opinion of Gemini.
+    - filters_description (str): The metadata filters, see describe_filters.
+
+    Returns:
+    - str: The fingerprint recorded with the result in the journal.
+    """
+    parts = [fingerprint, mode, "opinion" if opinion else "no-opinion"]
+    if filters_description:
+        parts.append(filters_description)
+    return "|".join(parts)
+
+
+def report_column_widths(results):
+    """
+    Compute the width of each report column from the longest value it will hold.
+
+    Parameters:
+    - results (iterable): Tuples of (file name, similarity percentage, matching result text).
+
+    Returns:
+    - list: The width of each column.
+    """
+    widths = [len("File Name"), len("Similarity"), len("Details")]
+    for file_name, similarity_percentage, similarity_result in results:
+        values = (file_name, f"{similarity_percentage}%", similarity_result)
+        widths = [max(width, len(str(value))) for width, value in zip(widths, values)]
+    return [width + 2 for width in widths]
+
+
+def write_report(results, output_excel, column_widths):
+    """
+    Write the batch results to an Excel file in write-only (streaming) mode, coloring each file name
+    by similarity level. Rows are written as they are read, so memory stays flat whatever the batch size.
+
+    Parameters:
+    - results (iterable): Tuples of (file name, similarity percentage, matching result text), in report order.
+    - output_excel (str): Path of the Excel file to write.
+    - column_widths (list): The width of each column, see report_column_widths.
+
+    Returns:
+    - dict: The number of results per similarity level ("low", "medium", "high").
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Job Matches")
+    for index, width in enumerate(column_widths, start=1):
+        ws.column_dimensions[get_column_letter(index)].width = width
+    ws.append(["File Name", "Similarity", "Details"])
+
+    fills = {"low": RED_FILL, "medium": ORANGE_FILL, "high": GREEN_FILL}
+    centered = Alignment(horizontal="center", vertical="center")
+    counts = {"low": 0, "medium": 0, "high": 0}
+    for file_name, similarity_percentage, similarity_result in results:
+        file_cell = WriteOnlyCell(ws, value=file_name)
+        file_cell.alignment = centered
+        similarity_cell = WriteOnlyCell(ws, value=f"{similarity_percentage}%")
+        similarity_cell.alignment = centered
+        details_cell = WriteOnlyCell(ws, value=similarity_result)
+        details_cell.alignment = Alignment(wrap_text=True)
+
+        level = similarity_level(similarity_percentage)
+        if level is not None:
+            counts[level] += 1
+            file_cell.fill = fills[level]
+
+        ws.append([file_cell, similarity_cell, details_cell])
+
+    temporary_file = output_excel + ".tmp.xlsx"
+    wb.save(temporary_file)
+    os.replace(temporary_file, output_excel)
+    return counts
+
+
+def cancel_pending(futures):
+    """
+    Cancel the futures that have not started yet.
+
+    Parameters:
+    - futures (iterable): The futures.
+    """
+    for future in futures:
+        future.cancel()
+
+
+def run_batch(job_matcher, input_directory, output_excel, workers=None, progress=None, resume=True, mode=None,
+              opinion=True, on_result=None, cancel=None, filters=None, min_skills=None):
+    """
+    Run the batch pipeline (extract -> summarize -> predict -> match -> opine) over a folder of CVs and
+    save the results to an Excel file.
+
+    This function:
+
+    1. Extracts the text from the PDF files in a process pool (PDF_WORKERS, PDF_TIMEOUT, PDF_MAX_PAGES),
+       then summarizes each CV and predicts the job with one JSON-mode API call, with `workers` CVs in
+       flight. In "embedding" mode the CVs are neither summarized nor sent to the API: the extracted text
+       is matched directly. With `min_skills`, CVs mentioning fewer skills of the skill vocabulary are
+       skipped before any API call.
+    2. Encodes all the predicted jobs (or CVs) in one batch and matches them with the job offers.
+    3. Generates the opinions, again with `workers` CVs in flight, unless `opinion` is False. Matches
+       with a cosine similarity below OPINION_MIN_SIMILARITY percent (0, the default, keeps them all) get no opinion.
+    4. Saves the results in the output Excel file, classified by the cosine similarity of the search.
+
+    Every CV is recorded in a journal next to the report as soon as each stage finishes. With `resume`,
+    CVs already done in a previous run (not modified since, and with the same mode, opinion setting and
+    filters) are skipped and the ones prepared in the same mode go straight to matching, so a crash or quota exhaustion only loses the CVs in flight. Setting `cancel` stops the
+    API calls: the CVs in flight are finished and journaled, and every CV prepared so far is still matched,
+    since matching is local, and reported (without an opinion if it had not been asked for yet).
+
+    Parameters:
+    - job_matcher (JobMatcher): The matching engine.
+    - input_directory (str): The folder containing the CVs.
+    - output_excel (str): Path of the Excel file to write.
+    - workers (int or None): Number of CVs processed concurrently; BATCH_WORKERS by default.
+    - progress (callable or None): Called as progress(steps_done, total_steps) after each step.
+    - resume (bool): Whether to resume from the journal of a previous run instead of starting over.
+    - mode (str or None): "llm" or "embedding", see JobMatcher.match (MATCH_MODE by default).
+    - opinion (bool): Whether to ask Gemini for an opinion on each match.
+    - on_result (callable or None): Called as on_result(file_name, result) when a CV is done, with the
+      match result of JobMatcher.describe_match.
+    - cancel (threading.Event or None): Set it to stop the run early.
+    - filters (dict or None): Metadata filters the matched jobs must satisfy, see JobFilters.select. CVs done
+      in a previous run with other filters are matched again.
+    - min_skills (int or None): Minimum number of distinct skills (see skill_scanner) a CV must mention to be
+      processed; BATCH_MIN_SKILLS by default, 0 to process every CV.
+
+    Returns:
+    - dict: The report, with the number of files per similarity level, the total, the output path,
+      the number of opinions skipped for a low similarity, the number of CVs skipped by the skill
+      pre-screen, whether the run was cancelled, the number of CVs matched without an opinion because of
+      the cancel, the filters,
+      the elapsed time in seconds and the API cache counters.
+    """
+    if not os.path.isdir(input_directory):
+        raise FileNotFoundError(f"Invalid input folder: {input_directory}")
+    if workers is None:
+        workers = int(os.getenv("BATCH_WORKERS", 4))
+    workers = max(1, workers)
+    mode = get_match_mode(mode)
+    if min_skills is None:
+        min_skills = int(os.getenv("BATCH_MIN_SKILLS") or 0)
+    # The journal is written next to the report from the start of the run.
+    os.makedirs(os.path.dirname(os.path.abspath(output_excel)), exist_ok=True)
+
+    journal = BatchJournal(journal_path(output_excel))
+    if not resume:
+        journal.reset()
+
+    files = list_pdf_files(input_directory)
+    fingerprints = {file_name: file_fingerprint(os.path.join(input_directory, file_name)) for file_name in files}
+    # A result depends on the mode, the opinion setting and the filters; it is only reused when they all match.
+    # The summary and predicted job only depend on the mode, which is recorded with them.
+    filters_description = describe_filters(filters)
+    done_fingerprints = {
+        file_name: done_fingerprint(fingerprint, mode, opinion, filters_description)
+        for file_name, fingerprint in fingerprints.items()
+    }
+    total_steps = 2 * len(files)
+    start_time = time.time()
+    steps_done = 0
+
+    def step(count=1):
+        nonlocal steps_done
+        steps_done += count
+        if progress is not None:
+            progress(steps_done, total_steps)
+
+    def cancelled():
+        return cancel is not None and cancel.is_set()
+
+    def prepare_cv(extracted_text):
+        if mode == "embedding":
+            return extracted_text, None
+        profile = analyze_cv(extracted_text)
+        return profile["summary"], profile["predicted_job"]
+
+    done = {file_name for file_name in files if journal.is_done(file_name, done_fingerprints[file_name])}
+    predictions = []
+    to_extract = []
+    for file_name in files:
+        if file_name in done:
+            continue
+        prepared = journal.get_prepared(file_name, fingerprints[file_name], mode)
+        if prepared is not None:
+            predictions.append((file_name, *prepared))
+        else:
+            to_extract.append(file_name)
+    step(2 * len(done) + len(predictions))
+    opinions_skipped = 0
+    opinion_min_similarity = float(os.getenv("OPINION_MIN_SIMILARITY") or 0)
+    screened_out = 0
+
+    # PDFs are parsed in a process pool; each extracted CV is handed to the API threads as soon as it is ready.
+    settings = extraction_settings()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for pdf_path, extracted_text, error in extract_texts(
+                [os.path.join(input_directory, file_name) for file_name in to_extract],
+                workers=settings["workers"], timeout=settings["timeout"], max_pages=settings["max_pages"]):
+            if cancelled():
+                break
+            file_name = os.path.basename(pdf_path)
+            if error is not None:
+                print(f"Error processing {file_name}: {error}")
+                step()
+                continue
+            if min_skills:
+                skills = get_skill_scanner().find(extracted_text)
+                if len(skills) < min_skills:
+                    print(f"Skipped {file_name}: {len(skills)} skills found, {min_skills} required")
+                    screened_out += 1
+                    step(2)
+                    continue
+            futures[executor.submit(prepare_cv, extracted_text)] = file_name
+        for future in as_completed(futures):
+            if cancelled():
+                cancel_pending(futures)
+            if future.cancelled():
+                continue
+            file_name = futures[future]
+            try:
+                cv_text, predicted_job = future.result()
+                journal.record_prepared(file_name, fingerprints[file_name], cv_text, predicted_job, mode)
+                predictions.append((file_name, cv_text, predicted_job))
+            except Exception as e:
+                print(f"Error processing {file_name}: {e}")
+            step()
+
+    # Matching makes no API call, so the CVs prepared before a cancel are still matched and reported.
+    try:
+        if mode == "embedding":
+            all_matches = job_matcher.top_k_cvs([cv_text for _, cv_text, _ in predictions], 1, filters=filters)
+        else:
+            all_matches = job_matcher.top_k_batch(
+                [predicted_job for _, _, predicted_job in predictions], 1, filters=filters
+            )
+    except Exception as e:
+        print(f"Error matching the CVs: {e}")
+        predictions, all_matches = [], []
+
+    # CVs whose opinion was not asked for before the cancel are described without one.
+    without_opinion = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for (file_name, cv_text, _), matches in zip(predictions, all_matches):
+            if cancelled():
+                without_opinion.append((file_name, cv_text, matches))
+            else:
+                futures[executor.submit(
+                    job_matcher.describe_match, cv_text, matches, opinion, opinion_min_similarity
+                )] = (file_name, cv_text, matches)
+        for future in as_completed(futures):
+            if cancelled():
+                cancel_pending(futures)
+            if future.cancelled():
+                without_opinion.append(futures[future])
+                continue
+            file_name = futures[future][0]
+            try:
+                result = future.result()
+                journal.record_done(file_name, done_fingerprints[file_name], result["similarity"], result["text"])
+                if opinion and result["opinion"] is None:
+                    opinions_skipped += 1
+                if on_result is not None:
+                    on_result(file_name, result)
+            except Exception as e:
+                print(f"Error processing {file_name}: {e}")
+            step()
+    matched_without_opinion = set()
+    for file_name, cv_text, matches in without_opinion:
+        try:
+            result = job_matcher.describe_match(cv_text, matches, False)
+            # Recorded as a result without opinion, so that a resumed run asks for the opinion.
+            journal.record_done(
+                file_name, done_fingerprint(fingerprints[file_name], mode, False, filters_description),
+                result["similarity"], result["text"]
+            )
+            matched_without_opinion.add(file_name)
+            if on_result is not None:
+                on_result(file_name, result)
+        except Exception as e:
+            print(f"Error processing {file_name}: {e}")
+        step()
+    if progress is not None and not cancelled():
+        progress(total_steps, total_steps)
+
+    report_files = [
+        file_name for file_name in files
+        if journal.is_done(file_name, done_fingerprints[file_name]) or file_name in matched_without_opinion
+    ]
+    counts = write_report(
+        journal.iter_done(report_files),
+        output_excel,
+        report_column_widths(journal.iter_done(report_files))
+    )
+    response_cache = get_response_cache()
+    return {
+        **counts,
+        "total": sum(counts.values()),
+        "output": output_excel,
+        "opinions_skipped": opinions_skipped,
+        "screened_out": screened_out,
+        "cancelled": cancelled(),
+        "without_opinion": len(matched_without_opinion) if opinion else 0,
+        "filters": filters_description,
+        "elapsed": time.time() - start_time,
+        "cache": response_cache.stats() if response_cache is not None else None,
+    }
+
+
+def format_report(report):
+    """
+    Format a batch report as the text shown at the end of the processing.
+
+    Parameters:
+    - report (dict): The report returned by run_batch.
+
+    Returns:
+    - str: The report text.
+    """
+    opinions_report = ""
+    if report.get("opinions_skipped"):
+        opinions_report = f"Opinions skipped (low similarity): {report['opinions_skipped']}\n"
+    cancelled_report = "Processing cancelled: only the CVs done so far are listed.\n" if report.get("cancelled") else ""
+    if report.get("without_opinion"):
+        cancelled_report += f"Matched without opinion (cancelled): {report['without_opinion']}\n"
+    screened_report = ""
+    if report.get("screened_out"):
+        screened_report = f"Skipped by the skill pre-screen: {report['screened_out']}\n"
+    filters_report = f"Filters: {report['filters']}\n" if report.get("filters") else ""
+    cache_report = ""
+    if report["cache"] is not None:
+        cache_report = f"API cache: {report['cache']['hits']} hits, {report['cache']['misses']} misses\n"
+    return (
+        f"--- Processing Report ---\n"
+        f"{cancelled_report}"
+        f"{filters_report}"
+        f"Total files processed: {report['total']}\n"
+        f"Low similarity (< 50%): {report['low']}\n"
+        f"Medium similarity (50%-60%): {report['medium']}\n"
+        f"High similarity (>= 60%): {report['high']}\n"
+        f"{opinions_report}"
+        f"{screened_report}"
+        f"{cache_report}"
+        f"\nResults saved to\n{report['output']}"
+    )
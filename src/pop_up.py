@@ -1,23 +1,22 @@
 import os
-from openpyxl import Workbook
-from openpyxl.styles import PatternFill, Alignment
-from openpyxl.utils import get_column_letter
-import re
 from PyQt6.QtWidgets import (
-    QVBoxLayout, QLabel, QApplication,
-    QPushButton, QHBoxLayout, QFileDialog, QMessageBox, QProgressBar, QDialog, QLineEdit
+    QVBoxLayout, QLabel,
+    QPushButton, QHBoxLayout, QFileDialog, QMessageBox, QProgressBar, QDialog, QLineEdit, QCheckBox,
+    QComboBox, QListWidget, QSpinBox
 )
 from PyQt6.QtCore import Qt
 import platform
 import subprocess
 import time
 
-from pdf import (extract_text_from_pdf, summarize_text)
-from job_matcher import check_predicted_job_similarity
+from pipeline import format_report
+from job_matcher import MATCH_MODES, get_match_mode
+from workers import BatchWorker
+from filter_panel import JobFilterPanel
 
 
 class BatchProcessingDialog(QDialog):
-    def __init__(self, embeddings, jobs_excel):
+    def __init__(self, job_matcher, parent=None):
         """
         Initialize the BatchProcessingDialog.
 
@@ -26,14 +25,15 @@ class BatchProcessingDialog(QDialog):
         of the PDFs.
 
         Parameters:
-        - embeddings (list): precomputed embeddings for the job offers
-        - jobs_excel (str): path to the Excel file containing job offers
+        - job_matcher (JobMatcher): matching engine shared with the main window
+        - parent (QWidget or None): The main window.
         """
-        super().__init__()
+        super().__init__(parent)
         self.setWindowTitle("Process Multiple PDFs")
         self.setGeometry(100, 100, 400, 250)
-        self.embeddings = embeddings
-        self.jobs_excel = jobs_excel
+        self.job_matcher = job_matcher
+        self.worker = None
+        self.start_time = None
 
         self.layout = QVBoxLayout(self)
 
@@ -66,6 +66,38 @@ class BatchProcessingDialog(QDialog):
         self.output_path_label = QLabel(f"Output Directory: {self.output_directory}", self)
         self.layout.addWidget(self.output_path_label)
 
+        # Resume option
+        self.resume_checkbox = QCheckBox("Resume previous run (skip CVs already processed)", self)
+        self.resume_checkbox.setChecked(True)
+        self.layout.addWidget(self.resume_checkbox)
+
+        # Matching options
+        mode_layout = QHBoxLayout()
+        mode_layout.addWidget(QLabel("Matching mode:", self))
+        self.mode_combo = QComboBox(self)
+        self.mode_combo.addItems(MATCH_MODES)
+        self.mode_combo.setCurrentText(get_match_mode())
+        mode_layout.addWidget(self.mode_combo)
+        self.layout.addLayout(mode_layout)
+
+        self.opinion_checkbox = QCheckBox("Ask Gemini for an opinion on each match", self)
+        self.opinion_checkbox.setChecked(True)
+        self.layout.addWidget(self.opinion_checkbox)
+
+        # Skill pre-screen: CVs with fewer IT skills are skipped before any API call
+        skills_layout = QHBoxLayout()
+        skills_layout.addWidget(QLabel("Minimum IT skills per CV (0 = process all):", self))
+        self.min_skills_input = QSpinBox(self)
+        self.min_skills_input.setRange(0, 100)
+        self.min_skills_input.setValue(int(os.getenv("BATCH_MIN_SKILLS") or 0))
+        skills_layout.addWidget(self.min_skills_input)
+        self.layout.addLayout(skills_layout)
+
+        # Job filters
+        self.filter_panel = JobFilterPanel(self)
+        self.filter_panel.set_job_filters(job_matcher.job_filters)
+        self.layout.addWidget(self.filter_panel)
+
         # Progress bar
         self.progress_bar = QProgressBar(self)
         self.progress_bar.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -74,10 +106,21 @@ class BatchProcessingDialog(QDialog):
         self.remaining_time_label = QLabel("")
         self.layout.addWidget(self.remaining_time_label)
 
-        # Start button
+        # Results of the CVs done so far
+        self.results_list = QListWidget(self)
+        self.layout.addWidget(self.results_list)
+
+        # Start and cancel buttons
+        buttons_layout = QHBoxLayout()
         self.start_button = QPushButton("Start Processing", self)
         self.start_button.clicked.connect(self.start_processing)
-        self.layout.addWidget(self.start_button)
+        buttons_layout.addWidget(self.start_button)
+
+        self.cancel_button = QPushButton("Cancel", self)
+        self.cancel_button.clicked.connect(self.cancel_processing)
+        self.cancel_button.setEnabled(False)
+        buttons_layout.addWidget(self.cancel_button)
+        self.layout.addLayout(buttons_layout)
 
     def select_input_folder(self):
         """
@@ -97,16 +140,15 @@ class BatchProcessingDialog(QDialog):
 
         This function:
 
-        1. Checks if the input folder is valid and if the output file already exists.
-        2. Opens the input folder and iterates over the PDF files.
-        3. Extracts the text from each PDF file, summarizes it, and checks the similarity with the job offers.
-        4. Saves the results in the specified output Excel file.
-        5. Reports the summary of the processing.
+        1. Checks if the input folder is valid.
+        2. Starts the batch pipeline on a background thread, so the dialog stays responsive; the progress
+           bar and the list of results are updated as each CV is done and, if requested, the run resumes
+           from the journal of a previous run.
+
+        The output file is opened and the summary reported by `processing_finished`.
 
         :return: None
         """
-        self.remaining_time_label.setText("Estimated time remaining: calculating...")
-
         input_directory = self.folder_input.strip()
         output_excel = os.path.join(self.output_directory, self.file_input.text())
 
@@ -114,159 +156,75 @@ class BatchProcessingDialog(QDialog):
             QMessageBox.critical(self, "Error", "Invalid input folder selected.")
             return
 
-        if os.path.exists(output_excel):
-            os.remove(output_excel)
-
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Job Matches"
-        ws.append(["File Name","Similarity", "Details"])
-
-        red_fill = PatternFill(start_color="FF9999", end_color="FF9999", fill_type="solid")
-        orange_fill = PatternFill(start_color="FFD580", end_color="FFD580", fill_type="solid")
-        green_fill = PatternFill(start_color="99FF99", end_color="99FF99", fill_type="solid")
-
-        def extract_similarity(result_text):
-            """
-            Extract the similarity percentage from a job matching result text.
-
-            Given a text containing a job matching result, extract the similarity percentage from it.
-            The percentage is either extracted from a substring like "XX%" or from a substring
-            like "similarity near zero percent". If no percentage is found, None is returned.
-
-            Parameters:
-            - result_text (str): The text containing the job matching result.
-
-            Returns:
-            - int or None: The extracted similarity percentage or None if no percentage was found.
-            """
-            match = re.search(r"(\d+)%", result_text)
-            if match:
-                return int(match.group(1))
-            if re.search(r"similarity.*?near zero percent", result_text, re.IGNORECASE):
-                return 0
-            return None
-
-        def sort_key(file_name):
-            """
-            Generate a sorting key for a given file name.
-
-            This function parses the file name to extract an alphabetical prefix and a numerical suffix.
-            The prefix is converted to lowercase for consistent sorting, and the numerical suffix is
-            converted to an integer for numerical sorting. If no numerical suffix is present, infinity is
-            used to ensure the prefix is sorted before any numbered variants.
-
-            Parameters:
-            - file_name (str): The name of the file to generate a sorting key for.
-
-            Returns:
-            - tuple: A tuple consisting of the lowercase prefix and the numerical suffix, or infinity if
-              no numerical suffix is found.
-            """
-            match = re.match(r'([a-zA-Z_]*)(\d*)', file_name)
-            if match:
-                prefix = match.group(1)
-                number = match.group(2)
-                number = int(number) if number else float('inf')
-                return prefix.lower(), number
-            else:
-                return file_name.lower(), float('inf')
-
-        files = sorted(
-            [f for f in os.listdir(input_directory) if f.endswith(".pdf")],
-            key=sort_key
+        self.remaining_time_label.setText("Estimated time remaining: calculating...")
+        self.results_list.clear()
+        self.progress_bar.setValue(0)
+        self.start_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+
+        self.start_time = time.time()
+        self.worker = BatchWorker(
+            self.job_matcher,
+            input_directory,
+            output_excel,
+            resume=self.resume_checkbox.isChecked(),
+            mode=self.mode_combo.currentText(),
+            opinion=self.opinion_checkbox.isChecked(),
+            filters=self.filter_panel.filters(),
+            min_skills=self.min_skills_input.value()
         )
+        self.worker.progress.connect(
+            lambda steps_done, total_steps: self.update_progress(self.start_time, steps_done, total_steps)
+        )
+        self.worker.item_done.connect(self.add_result)
+        self.worker.finished_batch.connect(self.processing_finished)
+        self.worker.failed.connect(self.processing_failed)
+        self.worker.start()
 
-        self.progress_bar.setMaximum(len(files))
-
-        low_similarity = 0
-        medium_similarity = 0
-        high_similarity = 0
-
-        start_time = time.time()
-
-        for i, file_name in enumerate(files):
-            pdf_path = os.path.join(input_directory, file_name)
-            try:
-                extracted_text = extract_text_from_pdf(pdf_path)
-                cv_text = summarize_text(extracted_text)
-                similarity_result = check_predicted_job_similarity(cv_text, self.jobs_excel, self.embeddings)
-                similarity_percentage = extract_similarity(similarity_result)
-
-                row = [file_name, f"{similarity_percentage}%", similarity_result]
-                ws.append(row)
-
-                file_cell = ws.cell(row=ws.max_row, column=1)
-                file_cell.alignment = Alignment(horizontal="center", vertical="center")
-
-                file_cell = ws.cell(row=ws.max_row, column=2)
-                file_cell.alignment = Alignment(horizontal="center", vertical="center")
-
-                if similarity_percentage is not None:
-                    color = None
-                    if similarity_percentage < 50:
-                        color = red_fill
-                        low_similarity += 1
-                    elif 50 <= similarity_percentage < 60:
-                        color = orange_fill
-                        medium_similarity += 1
-                    elif similarity_percentage >= 60:
-                        color = green_fill
-                        high_similarity += 1
-
-                    ws[f"A{ws.max_row}"].fill = color
-
-                details_cell = ws.cell(row=ws.max_row, column=3)
-                details_cell.alignment = Alignment(wrap_text=True)
-            except Exception as e:
-                print(f"Error processing {file_name}: {e}")
-
-            elapsed_time = time.time() - start_time
-            files_processed = i + 1
-            avg_time_per_file = elapsed_time / files_processed
-            remaining_files = len(files) - files_processed
-            estimated_remaining_time = avg_time_per_file * remaining_files
-
-            if estimated_remaining_time >= 60:
-                remaining_minutes = int(estimated_remaining_time // 60)
-                remaining_seconds = int(estimated_remaining_time % 60)
-                self.remaining_time_label.setText(
-                    f"Estimated time remaining: {remaining_minutes} minutes {remaining_seconds} seconds"
-                )
-            else:
-                self.remaining_time_label.setText(
-                    f"Estimated time remaining: {int(estimated_remaining_time)} seconds"
-                )
+    def cancel_processing(self):
+        """
+        Stops the batch after the CVs in flight; the CVs already prepared are still matched and kept in the report.
+        """
+        if self.worker is not None:
+            self.worker.cancel()
+            self.cancel_button.setEnabled(False)
+            self.remaining_time_label.setText("Cancelling: matching the CVs already prepared...")
 
-            self.progress_bar.setValue(i + 1)
+    def add_result(self, file_name, result):
+        """
+        Lists the result of a CV as soon as it is done.
 
-            QApplication.processEvents()
+        Parameters:
+        - file_name (str): The CV file name.
+        - result (dict): The match result.
+        """
+        self.results_list.addItem(f"{file_name}: {result['similarity']}% ({result['level']})")
+        self.results_list.scrollToBottom()
 
-        elapsed_time = time.time() - start_time
+    def processing_finished(self, report):
+        """
+        Opens the output Excel file and reports the summary of the processing.
+
+        Parameters:
+        - report (dict): The report returned by run_batch.
+        """
+        self.start_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+
+        elapsed_time = report["elapsed"]
         elapsed_minutes = int(elapsed_time // 60)
         elapsed_seconds = int(elapsed_time % 60)
+        status = "Processing cancelled!" if report["cancelled"] else "Processing complete!"
         if elapsed_minutes == 0:
             self.remaining_time_label.setText(
-                f"Processing complete! Time taken: {elapsed_seconds} seconds."
+                f"{status} Time taken: {elapsed_seconds} seconds."
             )
         else:
             self.remaining_time_label.setText(
-                f"Processing complete! Time taken: {elapsed_minutes} minutes {elapsed_seconds} seconds."
+                f"{status} Time taken: {elapsed_minutes} minutes {elapsed_seconds} seconds."
             )
 
-        for col in ws.columns:
-            max_length = 0
-            col_letter = get_column_letter(col[0].column)
-            for cell in col:
-                try:
-                    if cell.value:
-                        max_length = max(max_length, len(str(cell.value)))
-                except:
-                    pass
-            ws.column_dimensions[col_letter].width = max_length + 2 # max(min(max_length + 2, 50), 10)
-
-        wb.save(output_excel)
-
+        output_excel = report["output"]
         try:
             if platform.system() == "Darwin":  # macOS
                 subprocess.run(["open", output_excel], check=True)
@@ -280,16 +238,59 @@ class BatchProcessingDialog(QDialog):
             QMessageBox.warning(self, "Warning", f"Unable to open the file automatically: {e}")
 
         # Report Summary
-        total_files = low_similarity + medium_similarity + high_similarity
-        report = (
-            f"--- Processing Report ---\n"
-            f"Total files processed: {total_files}\n"
-            f"Low similarity (< 50%): {low_similarity}\n"
-            f"Medium similarity (50%-60%): {medium_similarity}\n"
-            f"High similarity (>= 60%): {high_similarity}\n"
-            f"\nResults saved to\n{output_excel}"
-        )
-        QMessageBox.information(self, "Success", report)
+        QMessageBox.information(self, "Success", format_report(report))
+
+    def processing_failed(self, message):
+        """
+        Reports an error that stopped the batch.
+
+        Parameters:
+        - message (str): The error message.
+        """
+        self.start_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self.remaining_time_label.setText("")
+        QMessageBox.critical(self, "Error", f"Error during batch processing: {message}")
+
+    def done(self, result):
+        """
+        Closes the dialog (Esc, the close button or the window manager) without waiting for a running batch:
+        the batch is cancelled, finishes the CVs in flight in the background and is no longer reported here.
+        """
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.cancel()
+            for signal in (self.worker.progress, self.worker.item_done, self.worker.finished_batch, self.worker.failed):
+                signal.disconnect()
+        super().done(result)
+
+    def update_progress(self, start_time, steps_done, total_steps):
+        """
+        Updates the progress bar and the estimated remaining time.
+
+        Parameters:
+        - start_time (float): Time at which the processing started.
+        - steps_done (int): Number of processing steps completed.
+        - total_steps (int): Total number of processing steps.
+        """
+        if total_steps == 0 or steps_done == 0:
+            return
+        elapsed_time = time.time() - start_time
+        avg_time_per_step = elapsed_time / steps_done
+        estimated_remaining_time = avg_time_per_step * (total_steps - steps_done)
+
+        if estimated_remaining_time >= 60:
+            remaining_minutes = int(estimated_remaining_time // 60)
+            remaining_seconds = int(estimated_remaining_time % 60)
+            self.remaining_time_label.setText(
+                f"Estimated time remaining: {remaining_minutes} minutes {remaining_seconds} seconds"
+            )
+        else:
+            self.remaining_time_label.setText(
+                f"Estimated time remaining: {int(estimated_remaining_time)} seconds"
+            )
+
+        self.progress_bar.setMaximum(total_steps)
+        self.progress_bar.setValue(steps_done)
 
     def select_folder(self):
         """
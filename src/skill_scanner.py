@@ -0,0 +1,146 @@
+import os
+import re
+from extraction import extract_texts
+
+IT_SKILLS = [
+    "Python", "Java", "C++", "JavaScript", "SQL", "HTML", "CSS", "PHP", "Ruby",
+    "Go", "Linux", "Docker", "Kubernetes", "AWS", "Azure", "Machine Learning", "Data Science",
+    "Artificial Intelligence", "TensorFlow", "PyTorch", "Git", "MongoDB", "Node.js",
+    "React", "Vue.js", "Hadoop", "Spark", "NoSQL", "GitHub", "MySQL", "PostgreSQL", "Django",
+    "Flask", "DevOps", "Cloud Computing", "Developer", "Web Developer", "Frontend Developer", "Backend Developer",
+    "Full Stack Developer", "Software Engineer", "DevOps Engineer", "Mobile Developer", "Game Developer",
+    "UI/UX Designer", "App Developer", "Web Designer", "Systems Engineer", "IT Specialist",
+    "Network Engineer", "Database Administrator", "Cloud Engineer", "Embedded Systems Developer",
+    "Automation Engineer", "IT Consultant", "Security Engineer", "Data Analyst", "Data Engineer",
+    "Blockchain Developer", "AI Engineer", "Machine Learning Engineer", "Digital Transformation"
+]
+
+_scanners = {}
+
+
+def load_vocabulary(path):
+    """
+    Load a skill vocabulary from a text file with one skill per line. Blank lines and lines starting
+    with "#" are ignored.
+
+    Parameters:
+    - path (str): Path of the vocabulary file.
+
+    Returns:
+    - list: The skills, in file order.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        return [line.strip() for line in file if line.strip() and not line.strip().startswith("#")]
+
+
+class SkillScanner:
+    """
+    Finds the skills of a vocabulary in a text with a single regular expression pass.
+
+    The vocabulary is compiled once into one case-insensitive alternation, longest skills first, inside a
+    lookahead so that matches can overlap: "Web Developer" and "Developer" are both found in "Web Developer".
+    Skills that start the same way ("Machine Learning" in "Machine Learning Engineer") are resolved from a
+    table built with the vocabulary. Skills must not touch a letter or digit on either side, so "Git" is not
+    found in "GitHub", while "C++" and "Node.js" are found before punctuation.
+    """
+
+    def __init__(self, vocabulary=None):
+        """
+        Compile the vocabulary.
+
+        Parameters:
+        - vocabulary (list or None): The skills to look for; IT_SKILLS by default.
+        """
+        self.vocabulary = list(dict.fromkeys(vocabulary or IT_SKILLS))
+        self.skills = {skill.casefold(): skill for skill in self.vocabulary}
+        alternation = "|".join(re.escape(skill) for skill in sorted(self.skills, key=len, reverse=True))
+        self.pattern = re.compile(rf"(?<!\w)(?=({alternation})(?!\w))", re.IGNORECASE)
+        # Skills found at the same position as a longer skill they start, e.g. "Data" in "Data Engineer".
+        self.prefixes = {
+            skill: [other for other in self.skills
+                    if other != skill and skill.startswith(other) and not re.match(r"\w", skill[len(other)])]
+            for skill in self.skills
+        }
+
+    def hits(self, text):
+        """
+        Find every occurrence of the skills in a text.
+
+        Parameters:
+        - text (str): The text to scan.
+
+        Returns:
+        - list: Tuples of (skill, position in the text), in text order.
+        """
+        found = []
+        for match in self.pattern.finditer(text):
+            skill = match.group(1).casefold()
+            found.append((self.skills[skill], match.start()))
+            found.extend((self.skills[prefix], match.start()) for prefix in self.prefixes[skill])
+        return found
+
+    def scan(self, text):
+        """
+        Count the occurrences of each skill in a text.
+
+        Parameters:
+        - text (str): The text to scan.
+
+        Returns:
+        - dict: The number of occurrences of each skill found, in vocabulary order.
+        """
+        counts = dict.fromkeys(self.vocabulary, 0)
+        for skill, _ in self.hits(text):
+            counts[skill] += 1
+        return {skill: count for skill, count in counts.items() if count}
+
+    def find(self, text):
+        """
+        List the skills found in a text.
+
+        Parameters:
+        - text (str): The text to scan.
+
+        Returns:
+        - list: The skills found at least once, in vocabulary order.
+        """
+        return list(self.scan(text))
+
+
+def get_skill_scanner(vocabulary_file=None):
+    """
+    Return the shared scanner for a vocabulary file, compiling it on first use.
+
+    Parameters:
+    - vocabulary_file (str or None): Path of the vocabulary; SKILLS_VOCABULARY_FILE, or IT_SKILLS if unset.
+
+    Returns:
+    - SkillScanner: The scanner.
+    """
+    vocabulary_file = vocabulary_file or os.getenv("SKILLS_VOCABULARY_FILE") or None
+    if vocabulary_file not in _scanners:
+        vocabulary = load_vocabulary(vocabulary_file) if vocabulary_file else None
+        _scanners[vocabulary_file] = SkillScanner(vocabulary)
+    return _scanners[vocabulary_file]
+
+
+def scan_pdfs(pdf_paths, scanner=None, progress=None, **extraction_options):
+    """
+    Scan the skills of many PDF files. The PDFs are parsed in a pool of worker processes (see
+    extraction.extract_texts) and each text is scanned as soon as it arrives.
+
+    Parameters:
+    - pdf_paths (list): The paths of the PDF files.
+    - scanner (SkillScanner or None): The scanner; the shared one by default.
+    - progress (callable or None): Called as progress(files_done, total_files) after each file.
+    - extraction_options: Other arguments of extract_texts (extractor, workers, timeout, max_pages, ...).
+
+    Returns:
+    - generator: Tuples (pdf_path, skill counts, error) in completion order, where either the counts or
+      the error is None.
+    """
+    scanner = scanner or get_skill_scanner()
+    for files_done, (pdf_path, text, error) in enumerate(extract_texts(pdf_paths, **extraction_options), start=1):
+        yield pdf_path, (scanner.scan(text) if error is None else None), error
+        if progress is not None:
+            progress(files_done, len(pdf_paths))
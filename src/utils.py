@@ -1,19 +1,157 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import os
 import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from cache import get_response_cache, make_key
 
+REQUEST_TIMEOUT = (10, 120)
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
 
-def send_request_to_api(prompt, max_retries=10):
+_session = None
+_rate_limiter = None
+_lock = threading.Lock()
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket that limits the number of requests sent per minute.
+    """
+
+    def __init__(self, requests_per_minute):
+        """
+        Initialize the token bucket with a full burst of tokens.
+
+        Parameters:
+        - requests_per_minute (float): Maximum sustained number of requests per minute.
+        """
+        self.capacity = max(1.0, requests_per_minute)
+        self.rate = requests_per_minute / 60
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Block until a token is available, then consume it.
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def get_session():
+    """
+    Return the HTTP session shared by all requests, so that connections are pooled and reused across threads.
+
+    Returns:
+    - requests.Session: The shared session.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            pool_size = max(10, int(os.getenv("BATCH_WORKERS", 4)) * 2)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            _session = requests.Session()
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def get_rate_limiter():
+    """
+    Return the rate limiter shared by all requests, configured with API_REQUESTS_PER_MINUTE.
+
+    Returns:
+    - RateLimiter or None: The shared rate limiter, or None if the limit is disabled (0).
+    """
+    global _rate_limiter
+    with _lock:
+        requests_per_minute = float(os.getenv("API_REQUESTS_PER_MINUTE", 15))
+        if requests_per_minute <= 0:
+            return None
+        if _rate_limiter is None or _rate_limiter.rate != requests_per_minute / 60:
+            _rate_limiter = RateLimiter(requests_per_minute)
+        return _rate_limiter
+
+
+def retry_after_seconds(response):
     """
-    Send a request to the Gemini API with a given prompt, retrying if the request fails due to a 429 error.
+    Read the delay requested by the server in the Retry-After header of a response.
+
+    Parameters:
+    - response (requests.Response): The response to inspect.
+
+    Returns:
+    - float or None: The number of seconds to wait, or None if the header is missing or invalid.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_date.tzinfo is None:
+        retry_date = retry_date.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_date - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(retries):
+    """
+    Compute an exponential backoff delay with random jitter.
+
+    Parameters:
+    - retries (int): Number of retries already made.
+
+    Returns:
+    - float: The number of seconds to wait before the next attempt.
+    """
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** retries)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def send_request_to_api(prompt, max_retries=10, timeout=REQUEST_TIMEOUT, use_cache=True, response_schema=None,
+                        validate=None):
+    """
+    Send a request to the Gemini API with a given prompt, retrying if the request fails due to a 429 error,
+    a server error or a network error.
+
+    Requests go through a pooled session and a shared token bucket (API_REQUESTS_PER_MINUTE), so the
+    function can be called from several threads at once. Successful responses are stored in the on-disk
+    response cache, keyed by the model URL, the generation config and the prompt.
+
+    With a `response_schema`, the model is asked for JSON output following the schema (JSON mode) and the
+    raw JSON text is returned. With `validate`, a response is only cached once it passes validation, so a
+    malformed answer is asked again on the next call instead of being served from the cache until it expires.
 
     Parameters:
     - prompt (str): The specific prompt to include in the request.
     - max_retries (int): Maximum number of retries for the request.
+    - timeout (float or tuple): Connect and read timeout of each request, in seconds.
+    - use_cache (bool): Whether to read and write the response cache (also disabled by API_CACHE_DISABLED).
+    - response_schema (dict or None): OpenAPI schema of the expected JSON response.
+    - validate (callable or None): Called with the response text; it raises if the response is not valid,
+      and what it returns is returned instead of the text.
 
     Returns:
-    - str: The response text or an error message.
+    - str: The response text or an error message, or the result of `validate`.
     """
     url = os.getenv("GOOGLE_MODEL")
     api_key = os.getenv("API_KEY")
@@ -21,6 +159,9 @@ def send_request_to_api(prompt, max_retries=10):
     model_config = {
         "temperature": 0,
     }
+    if response_schema is not None:
+        model_config["response_mime_type"] = "application/json"
+        model_config["response_schema"] = response_schema
 
     headers = {
         "Content-Type": "application/json"
@@ -37,21 +178,48 @@ def send_request_to_api(prompt, max_retries=10):
         ]
     }
 
+    cache = get_response_cache() if use_cache else None
+    if cache is not None:
+        cache_key = make_key(url, model_config, prompt)
+        cached_response = cache.get(cache_key)
+        if cached_response is not None:
+            if validate is None:
+                return cached_response
+            try:
+                return validate(cached_response)
+            except Exception:
+                # Left by a version that cached responses without validating them: ask again.
+                pass
+
+    session = get_session()
+    rate_limiter = get_rate_limiter()
+
     retries = 0
     while retries <= max_retries:
+        if rate_limiter is not None:
+            rate_limiter.acquire()
         try:
-            response = requests.post(f"{url}?key={api_key}", headers=headers, data=json.dumps(data))
-            if response.status_code == 200:
-                result = response.json()
-                try:
-                    return result['candidates'][0]['content']['parts'][0]['text'].replace("*", "")
-                except (KeyError, IndexError):
-                    raise Exception("Error: Unexpected response structure.")
-            elif response.status_code == 429:
-                retries += 1
-                time.sleep(1)
-            else:
-                raise Exception(f"Error {response.status_code}: {response.text}")
-        except Exception as e:
-            raise Exception(e)
+            response = session.post(f"{url}?key={api_key}", headers=headers, data=json.dumps(data), timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            time.sleep(backoff_delay(retries))
+            retries += 1
+            continue
+        if response.status_code == 200:
+            result = response.json()
+            try:
+                text = result['candidates'][0]['content']['parts'][0]['text']
+            except (KeyError, IndexError):
+                raise Exception("Error: Unexpected response structure.")
+            if response_schema is None:
+                text = text.replace("*", "")
+            result = text if validate is None else validate(text)
+            if cache is not None:
+                cache.set(cache_key, text)
+            return result
+        elif response.status_code == 429 or response.status_code >= 500:
+            delay = retry_after_seconds(response)
+            time.sleep(delay if delay is not None else backoff_delay(retries))
+            retries += 1
+        else:
+            raise Exception(f"Error {response.status_code}: {response.text}")
     raise Exception("Error: Maximum retries exceeded. Could not complete the request.")
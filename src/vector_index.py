@@ -0,0 +1,265 @@
+import numpy as np
+import os
+
+SCORE_CHUNK_ROWS = 65536
+INDEX_BACKENDS = ("exact", "ivf")
+
+
+def score_embeddings(embeddings, queries, chunk_rows=SCORE_CHUNK_ROWS):
+    """
+    Compute the dot products between normalized job embeddings and normalized queries.
+
+    float32 embeddings are scored with a single matrix product. float16 embeddings are converted to
+    float32 in blocks of rows, so that a memory-mapped matrix is never copied whole.
+
+    Parameters:
+    - embeddings (numpy array): The normalized job embeddings, one row per job.
+    - queries (numpy array): One normalized query embedding, or a matrix with one query per row.
+    - chunk_rows (int): Number of job rows converted at once for float16 embeddings.
+
+    Returns:
+    - numpy array: The scores, with one column per job (a vector for a single query).
+    """
+    if embeddings.dtype == np.float32:
+        return queries @ embeddings.T
+    scores = np.empty(queries.shape[:-1] + (len(embeddings),), dtype=np.float32)
+    for start in range(0, len(embeddings), chunk_rows):
+        block = np.asarray(embeddings[start:start + chunk_rows], dtype=np.float32)
+        scores[..., start:start + len(block)] = queries @ block.T
+    return scores
+
+
+def top_k_indices(scores, k):
+    """
+    Select the indices of the k highest scores, ordered from best to worst, without sorting all of them.
+
+    Parameters:
+    - scores (numpy array): One similarity score per job.
+    - k (int): Number of indices to return.
+
+    Returns:
+    - numpy array: The indices of the k best scores.
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    indices = np.argpartition(-scores, k - 1)[:k]
+    return indices[np.argsort(-scores[indices], kind="stable")]
+
+
+def top_k_indices_batch(scores, k):
+    """
+    Select, for every row of a score matrix, the indices of the k highest scores ordered from best to worst.
+
+    Parameters:
+    - scores (numpy array): Matrix with one row of job scores per query.
+    - k (int): Number of indices to return per query.
+
+    Returns:
+    - numpy array: Matrix with the indices of the k best scores for each query.
+    """
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    indices = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, indices, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(indices, order, axis=1)
+
+
+class ExactIndex:
+    """
+    Brute-force index that scores every job embedding for each query.
+    """
+
+    name = "exact"
+
+    def __init__(self, embeddings):
+        """
+        Parameters:
+        - embeddings (numpy array): The normalized job embeddings, one row per job.
+        """
+        self.embeddings = embeddings
+
+    def search(self, queries, k):
+        """
+        Return the k jobs with the highest cosine similarity for each query.
+
+        Parameters:
+        - queries (numpy array): Matrix with one normalized query embedding per row.
+        - k (int): Number of jobs to return per query.
+
+        Returns:
+        - list: For each query, a list of tuples (row index, cosine similarity), best first.
+        """
+        scores = score_embeddings(self.embeddings, queries)
+        indices = top_k_indices_batch(scores, k)
+        return [
+            [(int(i), float(row_scores[i])) for i in row_indices]
+            for row_scores, row_indices in zip(scores, indices)
+        ]
+
+
+class IVFIndex:
+    """
+    Approximate index that partitions the job embeddings with spherical k-means (inverted file).
+
+    Each query is compared with the partition centroids and only the jobs of the n_probe closest partitions
+    are scored, so the cost per query is about n_lists + N * n_probe / n_lists dot products instead of N.
+    Raising n_probe improves recall at the cost of latency.
+    """
+
+    name = "ivf"
+
+    def __init__(self, embeddings, n_lists=None, n_probe=8):
+        """
+        Parameters:
+        - embeddings (numpy array): The normalized job embeddings, one row per job.
+        - n_lists (int or None): Number of partitions; the square root of the number of jobs by default.
+        - n_probe (int): Number of partitions scored per query.
+        """
+        self.embeddings = embeddings
+        self.n_lists = n_lists or max(1, int(np.sqrt(len(embeddings))))
+        self.n_probe = n_probe
+        self.centroids = None
+        self.order = None
+        self.offsets = None
+
+    def build(self, iterations=20, sample_size=None, seed=0):
+        """
+        Train the centroids on a sample of the embeddings and assign every job to its closest partition.
+
+        Parameters:
+        - iterations (int): Number of k-means iterations.
+        - sample_size (int or None): Number of embeddings used for training; 256 per partition by default.
+        - seed (int): Seed of the random generator, for reproducible builds.
+
+        Returns:
+        - IVFIndex: The index itself.
+        """
+        rng = np.random.default_rng(seed)
+        n_rows = len(self.embeddings)
+        self.n_lists = min(self.n_lists, n_rows)
+        sample_size = min(n_rows, sample_size or 256 * self.n_lists)
+        sample_rows = np.sort(rng.choice(n_rows, sample_size, replace=False))
+        sample = np.asarray(self.embeddings[sample_rows], dtype=np.float32)
+
+        centroids = sample[rng.choice(sample_size, self.n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            counts = np.bincount(assignments, minlength=self.n_lists)
+            empty = counts == 0
+            sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1
+            centroids = sums / norms
+        self.centroids = centroids.astype(np.float32)
+
+        assignments = np.empty(n_rows, dtype=np.int64)
+        for start in range(0, n_rows, SCORE_CHUNK_ROWS):
+            block = np.asarray(self.embeddings[start:start + SCORE_CHUNK_ROWS], dtype=np.float32)
+            assignments[start:start + len(block)] = np.argmax(block @ self.centroids.T, axis=1)
+        self.order = np.argsort(assignments, kind="stable")
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(assignments, minlength=self.n_lists))))
+        return self
+
+    def search(self, queries, k):
+        """
+        Return the approximate k jobs with the highest cosine similarity for each query.
+
+        Parameters:
+        - queries (numpy array): Matrix with one normalized query embedding per row.
+        - k (int): Number of jobs to return per query.
+
+        Returns:
+        - list: For each query, a list of tuples (row index, cosine similarity), best first.
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        probes = top_k_indices_batch(queries @ self.centroids.T, self.n_probe)
+        results = []
+        for query, lists in zip(queries, probes):
+            rows = np.sort(np.concatenate([self.order[self.offsets[l]:self.offsets[l + 1]] for l in lists]))
+            scores = np.asarray(self.embeddings[rows], dtype=np.float32) @ query
+            results.append([(int(rows[i]), float(scores[i])) for i in top_k_indices(scores, k)])
+        return results
+
+    def save(self, path, signature=""):
+        """
+        Save the trained index.
+
+        Parameters:
+        - path (str): Path of the .npz file.
+        - signature (str): Identifier of the embeddings the index was built from, checked when loading.
+        """
+        temporary_file = path + ".tmp.npz"
+        np.savez(temporary_file, centroids=self.centroids, order=self.order, offsets=self.offsets,
+                 signature=np.array(signature))
+        os.replace(temporary_file, path)
+
+    @classmethod
+    def load(cls, path, embeddings, n_probe=8, signature=""):
+        """
+        Load a trained index for the given embeddings.
+
+        Parameters:
+        - path (str): Path of the .npz file.
+        - embeddings (numpy array): The normalized job embeddings the index was built from.
+        - n_probe (int): Number of partitions scored per query.
+        - signature (str): Expected identifier of the embeddings.
+
+        Returns:
+        - IVFIndex or None: The index, or None if the file is missing or was built from other embeddings.
+        """
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if str(data["signature"]) != signature or data["order"].shape[0] != len(embeddings):
+                return None
+            index = cls(embeddings, len(data["centroids"]), n_probe)
+            index.centroids = data["centroids"]
+            index.order = data["order"]
+            index.offsets = data["offsets"]
+        return index
+
+
+def index_path(embeddings_file, backend):
+    """
+    Return the path where the index of an embedding store is saved.
+
+    Parameters:
+    - embeddings_file (str): Path of the embeddings file.
+    - backend (str): Name of the index backend.
+
+    Returns:
+    - str: Path of the index file.
+    """
+    return f"{os.path.splitext(embeddings_file)[0]}.{backend}.npz"
+
+
+def load_or_build_index(embeddings, backend="exact", embeddings_file=None, signature="", n_lists=None, n_probe=8):
+    """
+    Return the search index for the job embeddings, loading a saved one when it matches the embeddings.
+
+    Parameters:
+    - embeddings (numpy array): The normalized job embeddings.
+    - backend (str): "exact" for brute force or "ivf" for the approximate inverted-file index.
+    - embeddings_file (str or None): Path of the embedding store; the IVF index is saved next to it.
+    - signature (str): Identifier of the embeddings, used to detect a stale saved index.
+    - n_lists (int or None): Number of IVF partitions.
+    - n_probe (int): Number of IVF partitions scored per query.
+
+    Returns:
+    - ExactIndex or IVFIndex: The index.
+    """
+    if backend == "exact":
+        return ExactIndex(embeddings)
+    if backend != "ivf":
+        raise ValueError(f"Unsupported index backend: {backend}. Expected one of {INDEX_BACKENDS}.")
+    path = index_path(embeddings_file, backend) if embeddings_file else None
+    index = IVFIndex.load(path, embeddings, n_probe, signature) if path else None
+    if index is None or (n_lists is not None and index.n_lists != n_lists):
+        index = IVFIndex(embeddings, n_lists, n_probe).build()
+        if path:
+            index.save(path, signature)
+    return index
@@ -0,0 +1,131 @@
+import threading
+from PyQt6.QtCore import QObject, QRunnable, QThread, QThreadPool, pyqtSignal
+
+from pipeline import run_batch
+
+
+class TaskSignals(QObject):
+    """
+    Signals of a Task, delivered on the GUI thread.
+    """
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class Task(QRunnable):
+    """
+    Run a function on the global thread pool and report its result (or its error) through signals,
+    so that slow work (model loading, PDF parsing, API calls) does not block the Qt event loop.
+    """
+
+    # Tasks still running, so that Python does not collect them (and their signals) before they finish.
+    running = set()
+
+    def __init__(self, function, *args, **kwargs):
+        """
+        Prepare the task.
+
+        Parameters:
+        - function (callable): The function to run.
+        - args, kwargs: The arguments of the function.
+        """
+        super().__init__()
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+
+    def start(self, on_finished=None, on_failed=None):
+        """
+        Connect the callbacks and start the task on the global thread pool.
+
+        Parameters:
+        - on_finished (callable or None): Called with the return value of the function.
+        - on_failed (callable or None): Called with the error message if the function raised.
+
+        Returns:
+        - Task: The task itself.
+        """
+        if on_finished is not None:
+            self.signals.finished.connect(on_finished)
+        if on_failed is not None:
+            self.signals.failed.connect(on_failed)
+        self.signals.finished.connect(lambda result: Task.running.discard(self))
+        self.signals.failed.connect(lambda message: Task.running.discard(self))
+        Task.running.add(self)
+        QThreadPool.globalInstance().start(self)
+        return self
+
+    def run(self):
+        try:
+            result = self.function(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+
+class BatchWorker(QThread):
+    """
+    Run the batch pipeline on a background thread, reporting the progress and the result of each CV
+    as they happen. A cancelled batch stops after the CVs in flight and still writes the report of the
+    CVs already done.
+    """
+    progress = pyqtSignal(int, int)
+    item_done = pyqtSignal(str, object)
+    finished_batch = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    # Batches still running, so that closing their dialog does not destroy the thread before it finishes.
+    running = set()
+
+    def __init__(self, job_matcher, input_directory, output_excel, **options):
+        """
+        Prepare the batch run.
+
+        Parameters:
+        - job_matcher (JobMatcher): The matching engine.
+        - input_directory (str): The folder containing the CVs.
+        - output_excel (str): Path of the Excel file to write.
+        - options: The other arguments of run_batch (resume, mode, opinion, filters, min_skills, workers).
+        """
+        super().__init__()
+        self.job_matcher = job_matcher
+        self.input_directory = input_directory
+        self.output_excel = output_excel
+        self.options = options
+        self.cancel_event = threading.Event()
+
+    def start(self):
+        """
+        Start the batch on its thread. The worker is kept alive until the thread finishes, then deleted.
+        """
+        BatchWorker.running.add(self)
+        self.finished.connect(self.release)
+        super().start()
+
+    def release(self):
+        BatchWorker.running.discard(self)
+        self.deleteLater()
+
+    def cancel(self):
+        """
+        Ask the batch to stop; the CVs in flight are finished and journaled first.
+        """
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            report = run_batch(
+                self.job_matcher,
+                self.input_directory,
+                self.output_excel,
+                progress=self.progress.emit,
+                on_result=self.item_done.emit,
+                cancel=self.cancel_event,
+                **self.options
+            )
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.finished_batch.emit(report)